@@ -0,0 +1,57 @@
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.database import QueryStats, query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """
+    Count SQL statements and DB time per request.
+
+    Reports them as ``X-DB-Queries`` and ``Server-Timing`` response headers
+    and logs a warning when a request exceeds DB_QUERY_WARN_THRESHOLD, which
+    is usually an N+1 query pattern.
+    """
+
+    def __init__(self, app: ASGIApp, warn_threshold: int | None = None):
+        self.app = app
+        self.warn_threshold = (
+            settings.DB_QUERY_WARN_THRESHOLD if warn_threshold is None else warn_threshold
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Queries"] = str(stats.count)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            query_stats.reset(token)
+            if stats.count > self.warn_threshold:
+                logger.warning(
+                    "%s %s ran %d SQL queries (%.1f ms); threshold is %d",
+                    scope["method"],
+                    scope["path"],
+                    stats.count,
+                    stats.duration * 1000,
+                    self.warn_threshold,
+                )
@@ -1,7 +1,12 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from sqlmodel import Session, select
-from app.core.database import engine
+from copy import deepcopy
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.database import async_engine
+from app.core.cache import MISSING
+from app.core.tenant_cache import TenantConfig, tenant_config_cache
 from app.models.system_config import SystemConfig
 
 DEFAULT_TENANT_CONFIG = {
@@ -14,29 +19,66 @@ DEFAULT_TENANT_CONFIG = {
 }
 
 
-class TenantMiddleware(BaseHTTPMiddleware):
-    """Middleware to inject tenant configuration into request state."""
-
-    async def dispatch(self, request: Request, call_next):
-        tenant_id = request.headers.get("X-Tenant-ID")
-
-        tenant_config = DEFAULT_TENANT_CONFIG.copy()
-
-        if tenant_id:
-            try:
-                with Session(engine) as session:
-                    db_config = session.exec(
-                        select(SystemConfig).where(SystemConfig.tenant_name == tenant_id)
-                    ).first()
-                    if db_config:
-                        tenant_config = {
-                            "tenant_name": db_config.tenant_name,
-                            "tenant_type": db_config.tenant_type,
-                            **db_config.config,
-                        }
-            except Exception:
-                pass
-
-        request.state.tenant_config = tenant_config
-        response = await call_next(request)
-        return response
+async def load_tenant_config(tenant_id: str) -> TenantConfig:
+    """Fetch a tenant config from the database, or None if unknown."""
+    async with AsyncSession(async_engine) as session:
+        db_config = (
+            await session.exec(
+                select(SystemConfig).where(SystemConfig.tenant_name == tenant_id)
+            )
+        ).first()
+    if db_config is None:
+        return None
+    return {
+        "tenant_name": db_config.tenant_name,
+        "tenant_type": db_config.tenant_type,
+        **db_config.config,
+    }
+
+
+async def resolve_tenant_config(tenant_id: str | None) -> dict:
+    """
+    Resolve the config for a tenant header, going to the DB on cache miss.
+
+    Returns a deep copy, so a handler mutating nested values (e.g. the
+    allowed_customer_types list) cannot change the cached or default config.
+    """
+    if not tenant_id:
+        return deepcopy(DEFAULT_TENANT_CONFIG)
+
+    config = tenant_config_cache.get(tenant_id)
+    if config is MISSING:
+        try:
+            config = await load_tenant_config(tenant_id)
+        except Exception:
+            # Don't cache lookup failures; retry on the next request
+            return deepcopy(DEFAULT_TENANT_CONFIG)
+        tenant_config_cache.set(tenant_id, config)
+
+    if config is None:
+        return deepcopy(DEFAULT_TENANT_CONFIG)
+    return deepcopy(config)
+
+
+class TenantMiddleware:
+    """
+    Middleware to inject tenant configuration into request state.
+
+    Written as plain ASGI rather than BaseHTTPMiddleware so request and
+    response bodies (uploads, file downloads) pass through untouched.
+    The config lands in scope["state"], which backs ``request.state``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        tenant_id = Headers(scope=scope).get("X-Tenant-ID")
+        scope.setdefault("state", {})["tenant_config"] = await resolve_tenant_config(
+            tenant_id
+        )
+        await self.app(scope, receive, send)
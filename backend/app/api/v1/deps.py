@@ -5,21 +5,27 @@ from typing import Annotated
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.database import get_session
+from app.core.auth_cache import snapshot_user, user_cache, user_from_snapshot
+from app.core.cache import MISSING
+from app.core.database import get_async_session
 from app.core.security import decode_token
 from app.models.user import User
 
 security = HTTPBearer()
 
 
-def get_current_user(
+async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> User:
     """
     Dependency to get the current authenticated user from JWT token.
+
+    Approved users are served from ``user_cache`` when possible, so parallel
+    requests with the same token don't each hit the users table.
     """
     token = credentials.credentials
     payload = decode_token(token)
@@ -37,8 +43,12 @@ def get_current_user(
             detail="Invalid token payload",
         )
 
+    snapshot = user_cache.get(user_id)
+    if snapshot is not MISSING:
+        return user_from_snapshot(snapshot)
+
     statement = select(User).where(User.id == int(user_id))
-    user = session.exec(statement).first()
+    user = (await session.exec(statement)).first()
 
     if user is None:
         raise HTTPException(
@@ -52,13 +62,14 @@ def get_current_user(
             detail="User not approved",
         )
 
+    user_cache.set(user_id, snapshot_user(user))
     return user
 
 
 # Type alias for dependency injection
 CurrentUser = Annotated[User, Depends(get_current_user)]
-DatabaseSession = Annotated[Session, Depends(get_session)]
+DatabaseSession = Annotated[AsyncSession, Depends(get_async_session)]
 
 # Aliases for compatibility
-get_db = get_session
+get_db = get_async_session
 get_current_active_user = get_current_user
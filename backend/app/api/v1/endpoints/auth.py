@@ -6,7 +6,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlmodel import Session, select
+from sqlmodel import select
 
 from app.api.v1.deps import CurrentUser, DatabaseSession
 from app.core.config import settings
@@ -29,14 +29,14 @@ class TokenResponse(BaseModel):
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(user_login: UserLogin, session: DatabaseSession) -> TokenResponse:
+async def login(user_login: UserLogin, session: DatabaseSession) -> TokenResponse:
     """
     User login endpoint.
     Returns access and refresh tokens.
     """
     # Find user by email
     statement = select(User).where(User.email == user_login.email)
-    user = session.exec(statement).first()
+    user = (await session.exec(statement)).first()
 
     if user is None:
         raise HTTPException(
@@ -25,7 +25,7 @@ async def list_credit_risk_categories(
     Returns the full catalog of credit risk categories.
     Use GET /credit-risks/{id} to get risks within a category.
     """
-    categories = session.exec(select(CreditRiskCategory).order_by(CreditRiskCategory.created_at.desc())).all()
+    categories = (await session.exec(select(CreditRiskCategory).order_by(CreditRiskCategory.created_at.desc()))).all()
     return [CreditRiskCategoryRead.model_validate(c) for c in categories]
 
 
@@ -41,10 +41,10 @@ async def list_credit_risks(
     before associating one with a loan application via
     PATCH /loan-applications/{id}/credit-risk.
     """
-    risks = session.exec(select(CreditRisk).order_by(CreditRisk.created_at.desc())).all()
+    risks = (await session.exec(select(CreditRisk).order_by(CreditRisk.created_at.desc()))).all()
     result = []
     for risk in risks:
-        category = session.get(
+        category = await session.get(
             CreditRiskCategory, risk.category_id) if risk.category_id else None
         result.append(
             CreditRiskRead(
@@ -66,13 +66,13 @@ async def get_credit_risk(
     session: DatabaseSession,
 ) -> CreditRiskRead:
     """Get a specific credit risk by ID."""
-    risk = session.get(CreditRisk, risk_id)
+    risk = await session.get(CreditRisk, risk_id)
     if not risk:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Credit risk with ID {risk_id} not found.",
         )
-    category = session.get(
+    category = await session.get(
         CreditRiskCategory, risk.category_id) if risk.category_id else None
     return CreditRiskRead(
         id=risk.id,
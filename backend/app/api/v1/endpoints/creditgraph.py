@@ -29,7 +29,7 @@ async def get_loan_analysis_endpoint(
     """
     Get existing CreditGraph analysis for a loan application.
     """
-    analysis = get_existing_analysis(session, loan_id)
+    analysis = await get_existing_analysis(session, loan_id)
     if not analysis:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -56,7 +56,7 @@ async def trigger_loan_analysis_endpoint(
     If an analysis already exists, it returns the cached result unless 'force=true' is passed.
     """
     try:
-        return trigger_analysis(session, loan_id, force_reanalyze=force)
+        return await trigger_analysis(session, loan_id, force_reanalyze=force)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,30 +1,56 @@
 """
 Customer API endpoints - Complete CRUD operations.
 """
-from typing import Annotated
+from typing import Annotated, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
 from app.api.v1.deps import CurrentUser, DatabaseSession
+from app.models.customer_duplicate import DuplicateStatus
 from app.schemas.customer import (
+    CustomerBulkAssignResponse,
+    CustomerBulkAssignSchema,
+    CustomerBulkCreateResponse,
+    CustomerBulkCreateSchema,
     CustomerCreateSchema,
     CustomerSimpleCreateSchema,
     CustomerUpdateSchema,
     CustomerReadSchema,
+    CustomerUpdateResponse,
     CustomerListItem,
+    CustomerDuplicateRead,
+    CustomerDuplicateReviewSchema,
+    CustomerReferralNode,
+    CustomerReferralStatsRead,
     CustomerFilterSchema,
     PaginationParams,
     PaginatedResponse,
     NIDValidationResponse,
+    NIDBatchValidationRequest,
+    NIDBatchValidationResponse,
 )
+from app.services.customer_bulk_service import bulk_create_customers
 from app.services.customer_service import (
     create_customer_with_nested_data,
     create_customer_simple,
-    get_customer_with_relations,
+    get_customer_cached,
     update_customer,
     search_customers,
+    stream_customer_export,
     assign_customer_to_portfolio,
-    validate_nid,
+    bulk_assign_customers,
+    validate_nid_public,
+    validate_nids_batch,
+)
+from app.services.duplicate_service import (
+    list_duplicate_candidates,
+    review_duplicate_candidate,
+)
+from app.services.referral_service import (
+    MAX_DEPTH,
+    get_referral_stats,
+    list_referral_tree,
 )
 
 router = APIRouter()
@@ -84,6 +110,42 @@ async def create_customer_simple_endpoint(
     return customer
 
 
+@router.post("/bulk", response_model=CustomerBulkCreateResponse)
+async def bulk_create_customers_endpoint(
+    batch: CustomerBulkCreateSchema,
+    current_user: CurrentUser,
+    session: DatabaseSession,
+) -> CustomerBulkCreateResponse:
+    """
+    Create up to 5,000 customers in one request (e.g. a payroll agreement).
+
+    Each item has the same shape as POST /customers/. Items are validated
+    individually: invalid ones (schema errors, bad NID check digit, NID
+    repeated in the batch or already registered) are listed in ``errors``
+    by index, and all valid ones are created together in one transaction.
+    """
+    return await bulk_create_customers(session, batch.customers)
+
+
+@router.post("/assign/bulk", response_model=CustomerBulkAssignResponse)
+async def bulk_assign_customers_endpoint(
+    data: CustomerBulkAssignSchema,
+    current_user: CurrentUser,
+    session: DatabaseSession,
+) -> CustomerBulkAssignResponse:
+    """
+    Assign many customers to a portfolio and/or promoter (e.g. when a broker leaves).
+
+    Select customers with ``customer_ids`` (up to 10,000) or with
+    ``filters`` (same criteria as the customer list, e.g.
+    ``{"promoter_id": 7}``). All of them are updated in a single statement
+    and only the counts are returned.
+
+    Note: This endpoint should be restricted to admin users in production.
+    """
+    return await bulk_assign_customers(session, data)
+
+
 @router.get("/", response_model=PaginatedResponse[CustomerListItem])
 async def list_customers(
     current_user: CurrentUser,
@@ -91,9 +153,15 @@ async def list_customers(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(
         20, ge=1, le=100, description="Items per page (max 100)"),
+    cursor: str | None = Query(
+        None, description="Keyset cursor from a previous next_cursor; overrides page"),
+    include_total: bool = Query(
+        True, description="Count matching rows (total/pages); disable for faster pages"),
+    count: Literal["exact", "estimate"] = Query(
+        "exact", description="exact, or estimate to accept a planner estimate on large lists"),
     nid: str | None = Query(None, description="Filter by NID (partial match)"),
     name: str | None = Query(
-        None, description="Filter by name (partial match)"),
+        None, description="Filter by first name, last name or nickname (fuzzy, accent-insensitive)"),
     email: str | None = Query(
         None, description="Filter by email (partial match)"),
     portfolio_id: int | None = Query(
@@ -107,13 +175,19 @@ async def list_customers(
 
     Supports filtering by:
     - NID (partial match)
-    - Name (partial match on first or last name)
+    - Name (fuzzy, accent-insensitive match on first name, last name or
+      nickname; closest matches first)
     - Email (partial match)
     - Portfolio ID
     - Promoter ID
     - Active status
 
     Results are sorted by created_at DESC by default.
+
+    Pass ``next_cursor`` back as ``cursor`` to page with keyset seeks
+    instead of OFFSET. Name searches are ranked and page by ``page`` only
+    (their ``next_cursor`` is always null). ``count=estimate`` returns a planner estimate as
+    ``total`` (flagged by ``total_is_estimate``) instead of counting.
     """
     filters = CustomerFilterSchema(
         nid=nid,
@@ -124,11 +198,101 @@ async def list_customers(
         is_active=is_active,
     )
 
-    pagination = PaginationParams(page=page, per_page=per_page)
+    pagination = PaginationParams(
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        include_total=include_total,
+        count=count,
+    )
 
     return await search_customers(session, filters, pagination)
 
 
+@router.get("/duplicates", response_model=PaginatedResponse[CustomerDuplicateRead])
+async def list_customer_duplicates(
+    current_user: CurrentUser,
+    session: DatabaseSession,
+    review_status: DuplicateStatus = Query(
+        DuplicateStatus.PENDING, alias="status", description="Review status"),
+    page: int = Query(1, ge=1, description="Page number"),
+    per_page: int = Query(
+        20, ge=1, le=100, description="Items per page (max 100)"),
+) -> PaginatedResponse[CustomerDuplicateRead]:
+    """
+    List possible duplicate customers found by the duplicate detection job.
+
+    Pairs are sorted by score, most likely duplicates first. The job runs
+    from scripts/find_duplicate_customers.py.
+    """
+    return await list_duplicate_candidates(session, review_status, page, per_page)
+
+
+@router.patch("/duplicates/{candidate_id}", response_model=CustomerDuplicateRead)
+async def review_customer_duplicate(
+    candidate_id: int,
+    review: CustomerDuplicateReviewSchema,
+    current_user: CurrentUser,
+    session: DatabaseSession,
+) -> CustomerDuplicateRead:
+    """
+    Confirm or dismiss a possible duplicate pair.
+
+    Reviewed pairs are kept as decided by later scans. Merging confirmed
+    duplicates is a separate, manual step.
+    """
+    candidate = await review_duplicate_candidate(
+        session, candidate_id, DuplicateStatus(review.status), current_user.id
+    )
+    if not candidate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Duplicate candidate {candidate_id} not found"
+        )
+    return candidate
+
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+@router.get("/export")
+async def export_customers(
+    current_user: CurrentUser,
+    session: DatabaseSession,
+    format: Literal["csv", "ndjson"] = Query("csv", description="csv or ndjson"),
+    nid: str | None = Query(None, description="Filter by NID (partial match)"),
+    name: str | None = Query(
+        None, description="Filter by first name, last name or nickname (fuzzy, accent-insensitive)"),
+    email: str | None = Query(
+        None, description="Filter by email (partial match)"),
+    portfolio_id: int | None = Query(
+        None, description="Filter by portfolio ID"),
+    promoter_id: int | None = Query(None, description="Filter by promoter ID"),
+    is_active: bool | None = Query(
+        None, description="Filter by active status"),
+) -> StreamingResponse:
+    """
+    Export every matching customer as a streamed CSV or NDJSON file.
+
+    Accepts the same filters as the customer list. Rows are read through a
+    server-side cursor and sent as they are fetched, so exporting the whole
+    customer book does not grow the worker's memory.
+    """
+    filters = CustomerFilterSchema(
+        nid=nid,
+        name=name,
+        email=email,
+        portfolio_id=portfolio_id,
+        promoter_id=promoter_id,
+        is_active=is_active,
+    )
+    return StreamingResponse(
+        stream_customer_export(session, filters, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="customers.{format}"'},
+    )
+
+
 @router.get("/{customer_id}", response_model=CustomerReadSchema)
 async def get_customer(
     customer_id: int,
@@ -148,7 +312,7 @@ async def get_customer(
     - Vehicle information
     - Company information
     """
-    customer = await get_customer_with_relations(session, customer_id)
+    customer = await get_customer_cached(session, customer_id)
 
     if not customer:
         raise HTTPException(
@@ -159,13 +323,13 @@ async def get_customer(
     return customer
 
 
-@router.put("/{customer_id}", response_model=CustomerReadSchema)
+@router.put("/{customer_id}", response_model=CustomerUpdateResponse)
 async def update_customer_endpoint(
     customer_id: int,
     customer_data: CustomerUpdateSchema,
     current_user: CurrentUser,
     session: DatabaseSession,
-) -> CustomerReadSchema:
+) -> CustomerUpdateResponse:
     """
     Update customer data (partial updates supported).
 
@@ -175,6 +339,10 @@ async def update_customer_endpoint(
     - Updated if the nested entity already exists
     - Created if it doesn't exist
 
+    Phones, addresses and references, when sent, replace the stored list.
+    Rows matching a submitted item are kept or updated in place; ``changes``
+    lists the inserted/updated/deleted/unchanged IDs per collection.
+
     Note: NID cannot be changed once set.
     """
     customer = await update_customer(session, customer_id, customer_data)
@@ -230,6 +398,52 @@ async def assign_customer(
     return customer
 
 
+@router.get("/{customer_id}/referrals", response_model=PaginatedResponse[CustomerReferralNode])
+async def list_customer_referrals(
+    customer_id: int,
+    current_user: CurrentUser,
+    session: DatabaseSession,
+    max_depth: int = Query(
+        MAX_DEPTH, ge=1, le=MAX_DEPTH, description="Deepest referral level (1 = direct only)"),
+    page: int = Query(1, ge=1, description="Page number"),
+    per_page: int = Query(
+        20, ge=1, le=100, description="Items per page (max 100)"),
+) -> PaginatedResponse[CustomerReferralNode]:
+    """
+    List everyone the customer referred, directly or down the referral tree.
+
+    Customers are sorted by depth (1 = referred directly), then by ID.
+    """
+    referrals = await list_referral_tree(session, customer_id, page, per_page, max_depth)
+    if referrals is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Customer with ID {customer_id} not found"
+        )
+    return referrals
+
+
+@router.get("/{customer_id}/referral-stats", response_model=CustomerReferralStatsRead)
+async def get_customer_referral_stats(
+    customer_id: int,
+    current_user: CurrentUser,
+    session: DatabaseSession,
+) -> CustomerReferralStatsRead:
+    """
+    Get the referral rollup of a customer.
+
+    Counts direct and indirect referrals and their loan applications, from
+    the rollup kept up to date as customers and loans are written.
+    """
+    stats = await get_referral_stats(session, customer_id)
+    if stats is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Customer with ID {customer_id} not found"
+        )
+    return stats
+
+
 @router.post("/validate-nid", response_model=NIDValidationResponse)
 async def validate_nid_endpoint(
     session: DatabaseSession,
@@ -252,4 +466,19 @@ async def validate_nid_endpoint(
     Use this endpoint in the frontend to provide real-time validation
     feedback when users enter their NID.
     """
-    return await validate_nid(session, nid)
+    return await validate_nid_public(session, nid)
+
+
+@router.post("/validate-nid/batch", response_model=NIDBatchValidationResponse)
+async def validate_nid_batch_endpoint(
+    payload: NIDBatchValidationRequest,
+    current_user: CurrentUser,
+    session: DatabaseSession,
+) -> NIDBatchValidationResponse:
+    """
+    Validate up to 10,000 NIDs at once (CSV imports, back-office reconciliations).
+
+    Returns, in submission order, whether each NID passes the JCE checksum and
+    the ID of the customer already registered with it. Requires authentication.
+    """
+    return await validate_nids_batch(session, payload.nids)
@@ -47,7 +47,7 @@ async def upload_customer_document(
             CustomerDocument.is_latest == True
         )
     )
-    results = session.exec(query)
+    results = await session.exec(query)
     for doc in results:
         doc.is_latest = False
         session.add(doc)
@@ -67,8 +67,8 @@ async def upload_customer_document(
         is_latest=True
     )
     session.add(db_doc)
-    session.commit()
-    session.refresh(db_doc)
+    await session.commit()
+    await session.refresh(db_doc)
 
     # 6. Generate download URL
     download_url = await storage.get_url(file_key)
@@ -95,7 +95,7 @@ async def upload_loan_document(
     """Upload a document for a loan application."""
     # 0. Get loan to find customer_id
     from app.models.loan_application import LoanApplication
-    loan = session.get(LoanApplication, loan_id)
+    loan = await session.get(LoanApplication, loan_id)
     if not loan:
         raise HTTPException(
             status_code=404, detail="Loan application not found")
@@ -121,7 +121,7 @@ async def upload_loan_document(
             CustomerDocument.is_latest == True
         )
     )
-    results = session.exec(query)
+    results = await session.exec(query)
     for doc in results:
         doc.is_latest = False
         session.add(doc)
@@ -142,8 +142,8 @@ async def upload_loan_document(
         is_latest=True
     )
     session.add(db_doc)
-    session.commit()
-    session.refresh(db_doc)
+    await session.commit()
+    await session.refresh(db_doc)
 
     # 6. Generate download URL
     download_url = await storage.get_url(file_key)
@@ -169,7 +169,7 @@ async def list_customer_documents(
         query = query.where(CustomerDocument.is_latest == True)
 
     query = query.order_by(CustomerDocument.id.desc())
-    results = session.exec(query)
+    results = await session.exec(query)
     documents = results.all()
 
     storage = get_storage_service()
@@ -190,7 +190,7 @@ async def delete_document(
     session: DatabaseSession,
 ):
     """Delete a document."""
-    db_doc = session.get(CustomerDocument, document_id)
+    db_doc = await session.get(CustomerDocument, document_id)
     if not db_doc:
         raise HTTPException(status_code=404, detail="Document not found")
 
@@ -199,8 +199,8 @@ async def delete_document(
     await storage.delete(db_doc.file_key)
 
     # 2. Delete from DB
-    session.delete(db_doc)
-    session.commit()
+    await session.delete(db_doc)
+    await session.commit()
 
     return None
 
@@ -212,7 +212,7 @@ async def get_document_download_url(
     session: DatabaseSession,
 ):
     """Get a temporary download URL for a specific document."""
-    db_doc = session.get(CustomerDocument, document_id)
+    db_doc = await session.get(CustomerDocument, document_id)
     if not db_doc:
         raise HTTPException(status_code=404, detail="Document not found")
 
@@ -3,11 +3,12 @@ Import CSV Endpoints - FastAPI endpoint for importing SoliPres CSV files into La
 """
 from typing import Any, Dict
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from sqlmodel import Session
 
 from app.api.v1.deps import CurrentUser, DatabaseSession
 from app.models.user import User
+from app.services.customer_cache import invalidate_customers
 from app.services.import_service import SoliPresCSVImporter
+from app.services.referral_service import sync_referrals
 
 router = APIRouter()
 
@@ -43,8 +44,23 @@ async def import_solipres_csv(
         )
 
     try:
-        importer = SoliPresCSVImporter(session)
-        result = importer.import_csv_content(content_str)
+        # The importer is written against the sync ORM API; run_sync executes it
+        # on the async session's connection without blocking the event loop.
+        def run_import(sync_session):
+            importer = SoliPresCSVImporter(sync_session)
+            return (
+                importer.import_csv_content(content_str),
+                importer.updated_customer_ids,
+                importer.created_customer_ids,
+            )
+
+        result, updated_customer_ids, created_customer_ids = await session.run_sync(run_import)
+        await sync_referrals(
+            session, updated_customer_ids,
+            written_ids=updated_customer_ids | created_customer_ids,
+        )
+        await session.commit()
+        await invalidate_customers(*updated_customer_ids)
         return result
     except Exception as exc:
         raise HTTPException(
@@ -8,11 +8,13 @@ Implements:
 - PUT    /loan-applications/{id}          - Update detail
 - DELETE /loan-applications/{id}          - Soft delete
 - PATCH  /loan-applications/{id}/status   - Status workflow transition
+- POST   /loan-applications/status/bulk   - Status transition for many loans
 - PATCH  /loan-applications/{id}/credit-risk - Associate credit risk
 - POST   /loan-applications/{id}/notes    - Add note
 - POST   /loan-applications/{id}/evaluate - AI evaluation placeholder
 """
 import logging
+from typing import Literal
 
 from app.schemas.creditgraph import CreditGraphAnalysisRead
 from fastapi import APIRouter, HTTPException, Query, status
@@ -20,6 +22,8 @@ from fastapi import APIRouter, HTTPException, Query, status
 from app.api.v1.deps import CurrentUser, DatabaseSession
 from app.schemas.loan_application import (
     CreditRiskAssociation,
+    LoanApplicationBulkStatusResponse,
+    LoanApplicationBulkStatusUpdate,
     LoanApplicationCreate,
     LoanApplicationFilterSchema,
     LoanApplicationNoteCreate,
@@ -33,6 +37,7 @@ from app.schemas.customer import PaginatedResponse, PaginationParams
 from app.services.loan_application_service import (
     add_loan_note,
     associate_credit_risk,
+    bulk_transition_loan_status,
     create_loan_application,
     get_loan_application_with_relations,
     list_loan_applications,
@@ -41,8 +46,10 @@ from app.services.loan_application_service import (
     update_loan_application,
 )
 from app.services.creditgraph_service import trigger_analysis
+from app.services.customer_cache import invalidate_customers
 
 from app.services.loan_submission_service import LoanSubmissionService
+from app.services.referral_service import sync_referrals
 
 logger = logging.getLogger(__name__)
 
@@ -70,8 +77,14 @@ async def submit_public_loan_application_endpoint(
         )
 
     try:
-        service = LoanSubmissionService(session)
-        result = service.submit_loan(payload)
+        result = await session.run_sync(
+            lambda sync_session: LoanSubmissionService(sync_session).submit_loan(payload)
+        )
+        await sync_referrals(
+            session, [result["customer"].id], written_ids=[result["customer"].id])
+        await session.commit()
+        # Submissions update an existing customer's profile in place
+        await invalidate_customers(result["customer"].id)
 
         return {
             "status": "success",
@@ -81,14 +94,14 @@ async def submit_public_loan_application_endpoint(
             "core_task_id": result["core_task"].id,
         }
     except ValueError as e:
-        session.rollback()
+        await session.rollback()
         logger.warning(f"Validation error submitting public loan: {e}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         logger.error(f"Error submitting public loan application: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -126,6 +139,12 @@ async def list_loan_applications_endpoint(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(
         20, ge=1, le=100, description="Items per page (max 100)"),
+    cursor: str | None = Query(
+        None, description="Keyset cursor from a previous next_cursor; overrides page"),
+    include_total: bool = Query(
+        True, description="Count matching rows (total/pages); disable for faster pages"),
+    count: Literal["exact", "estimate"] = Query(
+        "exact", description="exact, or estimate to accept a planner estimate on large lists"),
     customer_id: int | None = Query(None, description="Filter by customer ID"),
     status_filter: LoanStatus | None = Query(
         None, alias="status", description="Filter by loan status"
@@ -146,6 +165,10 @@ async def list_loan_applications_endpoint(
     - is_active, is_approved, is_rejected
 
     Results are sorted by created_at DESC.
+
+    Pass ``next_cursor`` back as ``cursor`` to page with keyset seeks
+    instead of OFFSET. ``count=estimate`` returns a planner estimate as
+    ``total`` (flagged by ``total_is_estimate``) instead of counting.
     """
     filters = LoanApplicationFilterSchema(
         customer_id=customer_id,
@@ -154,7 +177,13 @@ async def list_loan_applications_endpoint(
         is_approved=is_approved,
         is_rejected=is_rejected,
     )
-    pagination = PaginationParams(page=page, per_page=per_page)
+    pagination = PaginationParams(
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        include_total=include_total,
+        count=count,
+    )
     return await list_loan_applications(session, filters, pagination)
 
 
@@ -252,6 +281,25 @@ async def transition_loan_status_endpoint(
     return loan
 
 
+@router.post("/status/bulk", response_model=LoanApplicationBulkStatusResponse)
+async def bulk_transition_loan_status_endpoint(
+    data: LoanApplicationBulkStatusUpdate,
+    current_user: CurrentUser,
+    session: DatabaseSession,
+) -> LoanApplicationBulkStatusResponse:
+    """
+    Transition up to 5,000 loan applications in one request.
+
+    Each item names a loan, its target status and an optional note. Items
+    follow the same state machine and flag rules as
+    PATCH /{loan_id}/status, but a rejected item does not fail the
+    request: ``results`` reports, per loan and in request order, whether
+    it was ``updated``, ``not_found`` or an ``invalid_transition`` (with
+    the reason in ``detail``).
+    """
+    return await bulk_transition_loan_status(session, data, user_id=current_user.id)
+
+
 @router.patch("/{loan_id}/credit-risk", response_model=LoanApplicationReadSchema)
 async def associate_credit_risk_endpoint(
     loan_id: int,
@@ -316,7 +364,7 @@ async def evaluate_loan_application_endpoint(
     - Return decision: APPROVED, REJECTED, or MANUAL_REVIEW
     """
     try:
-        return trigger_analysis(session, loan_id)
+        return await trigger_analysis(session, loan_id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -37,7 +37,7 @@ async def list_tasks_endpoint(
         statement = statement.where(CoreTaskQueue.customer_id == customer_id)
 
     statement = statement.order_by(CoreTaskQueue.id.desc())
-    tasks = session.exec(statement).all()
+    tasks = (await session.exec(statement)).all()
     return tasks
 
 
@@ -53,7 +53,7 @@ async def resolve_task_endpoint(
     session: DatabaseSession,
 ):
     """Resolve/update a HITL core task queue item."""
-    task = session.get(CoreTaskQueue, task_id)
+    task = await session.get(CoreTaskQueue, task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -69,6 +69,6 @@ async def resolve_task_endpoint(
         task.completed_at = datetime.utcnow()
 
     session.add(task)
-    session.commit()
-    session.refresh(task)
+    await session.commit()
+    await session.refresh(task)
     return task
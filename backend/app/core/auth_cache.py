@@ -0,0 +1,41 @@
+"""
+In-process cache of authenticated users.
+
+Dashboards fire many requests in parallel with the same bearer token, and
+each one used to load the user from the database. ``user_cache`` maps a JWT
+subject to a snapshot of an approved user. ORM writes to ``users`` evict the
+entry, so a revoked approval or a password change is seen on the next
+request in this process; the TTL bounds staleness for writes made elsewhere.
+"""
+from typing import Any
+
+from sqlalchemy import event
+
+from app.core.cache import LRUTTLCache
+from app.core.config import settings
+from app.models.user import User
+
+user_cache = LRUTTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+
+def snapshot_user(user: User) -> dict[str, Any]:
+    """Copy a user's column values so the cached entry is session-free."""
+    return user.model_dump()
+
+
+def user_from_snapshot(snapshot: dict[str, Any]) -> User:
+    """Build a fresh, detached User from a cached snapshot."""
+    return User(**snapshot)
+
+
+def _invalidate_user(mapper, connection, target: User) -> None:
+    """Evict a user whose row was updated or deleted."""
+    if target.id is not None:
+        user_cache.invalidate(str(target.id))
+
+
+for _event_name in ("after_update", "after_delete"):
+    event.listen(User, _event_name, _invalidate_user)
@@ -0,0 +1,218 @@
+"""
+Cache backends for caches that may be shared between workers.
+
+``MemoryCacheBackend`` keeps entries in this process (an ``LRUTTLCache``) and
+is the default. ``RedisCacheBackend`` speaks the Redis protocol (RESP) to any
+compatible server (Redis, Valkey, KeyDB, ...) so every worker sees the same
+entries; it implements only the handful of commands the caches use.
+
+Pick one with a URL: ``memory://`` or ``redis://[:password@]host[:port][/db]``.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+from urllib.parse import unquote, urlsplit
+
+from app.core.cache import MISSING, LRUTTLCache
+
+
+class CacheBackendError(Exception):
+    """The cache backend is unreachable or answered with an error."""
+
+
+class CacheBackend:
+    """
+    Byte values with a TTL, plus integer counters.
+
+    A counter is dropped once it has been neither read (``get_counter``) nor
+    incremented for twice the value TTL, which keeps the counters to the keys
+    in recent use. Values are cached after reading the counter, so by then
+    every value cached under any of its versions has expired and restarting
+    it from 0 cannot reach a stale entry.
+    """
+
+    async def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        raise NotImplementedError
+
+    async def get_counter(self, key: str) -> int:
+        """Current counter value (0 if absent), keeping it alive."""
+        raise NotImplementedError
+
+    async def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process backend; counters live apart from values so LRU eviction never resets them."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl_seconds: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._values = LRUTTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds, clock=clock)
+        self._counter_ttl = 2 * ttl_seconds
+        self._clock = clock
+        # key -> (last used, value), least recently used first
+        self._counters: OrderedDict[str, tuple[float, int]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        counter = self._use_counter(key)
+        if counter is not None:
+            return str(counter).encode()
+        value = self._values.get(key)
+        return None if value is MISSING else value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        self._values.set(key, value, ttl_seconds)
+
+    async def get_counter(self, key: str) -> int:
+        return self._use_counter(key) or 0
+
+    async def incr(self, key: str) -> int:
+        counter = (self._use_counter(key) or 0) + 1
+        self._counters[key] = (self._clock(), counter)
+        self._counters.move_to_end(key)
+        return counter
+
+    def _use_counter(self, key: str) -> int | None:
+        """Current counter value (None if absent), marking it used; drops idle counters."""
+        now = self._clock()
+        while self._counters:
+            oldest, (used_at, _) = next(iter(self._counters.items()))
+            if now - used_at < self._counter_ttl:
+                break
+            del self._counters[oldest]
+        entry = self._counters.get(key)
+        if entry is None:
+            return None
+        self._counters[key] = (now, entry[1])
+        self._counters.move_to_end(key)
+        return entry[1]
+
+    def clear(self) -> None:
+        """Drop every value and counter."""
+        self._values.clear()
+        self._counters.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Minimal RESP client over one persistent connection.
+
+    Commands are serialized by a lock; a broken connection is dropped and
+    reopened on the next command. Counters get an EXPIRE of twice the value
+    TTL in the same pipeline as every read and increment.
+    """
+
+    def __init__(self, url: str, ttl_seconds: int, timeout: float = 1.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = unquote(parts.password) if parts.password else None
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._counter_ttl = 2 * ttl_seconds
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._command("GET", key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        await self._command("SET", key, value, "EX", str(ttl_seconds))
+
+    async def get_counter(self, key: str) -> int:
+        value, _ = await self._pipeline(("GET", key), ("EXPIRE", key, str(self._counter_ttl)))
+        return int(value or 0)
+
+    async def incr(self, key: str) -> int:
+        counter, _ = await self._pipeline(("INCR", key), ("EXPIRE", key, str(self._counter_ttl)))
+        return counter
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def _command(self, *args: str | bytes) -> Any:
+        (reply,) = await self._pipeline(args)
+        return reply
+
+    async def _pipeline(self, *commands) -> list[Any]:
+        """Send several commands in one write and read their replies in order."""
+        async with self._lock:
+            try:
+                return await asyncio.wait_for(self._roundtrip(commands), self.timeout)
+            except CacheBackendError:
+                raise
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as exc:
+                await self.close()
+                raise CacheBackendError(f"Redis {self.host}:{self.port}: {exc!r}") from exc
+
+    async def _roundtrip(self, commands) -> list[Any]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+            if self.password:
+                await self._send(("AUTH", self.password))
+            if self.db:
+                await self._send(("SELECT", str(self.db)))
+        return await self._send(*commands)
+
+    async def _send(self, *commands) -> list[Any]:
+        self._writer.write(b"".join(_encode_command(args) for args in commands))
+        await self._writer.drain()
+        # Read every reply before raising so the connection stays in sync
+        replies, error = [], None
+        for _ in commands:
+            try:
+                replies.append(await self._read_reply())
+            except CacheBackendError as exc:
+                error = error or exc
+                replies.append(None)
+        if error is not None:
+            raise error
+        return replies
+
+    async def _read_reply(self) -> Any:
+        line = (await self._reader.readuntil(b"\r\n"))[:-2]
+        kind, payload = line[:1], line[1:]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise CacheBackendError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            return (await self._reader.readexactly(length + 2))[:-2]
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [await self._read_reply() for _ in range(length)]
+        raise CacheBackendError(f"Unexpected Redis reply: {line!r}")
+
+
+def _encode_command(args) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+def create_cache_backend(url: str, maxsize: int, ttl_seconds: int) -> CacheBackend:
+    """Build the backend a cache URL names. ``maxsize``/``ttl_seconds`` size the memory backend."""
+    scheme = urlsplit(url).scheme
+    if scheme in ("", "memory"):
+        return MemoryCacheBackend(maxsize=maxsize, ttl_seconds=ttl_seconds)
+    if scheme == "redis":
+        return RedisCacheBackend(url, ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unsupported cache backend URL: {url}")
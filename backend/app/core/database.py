@@ -1,10 +1,99 @@
 """
 Database configuration using SQLModel.
+
+The API runs on an async engine (asyncpg) so queries never block the event
+loop. The sync engine is kept for the maintenance scripts in ``scripts/``.
+
+Both engines are instrumented with cursor-level event hooks that feed the
+per-request ``QueryStats`` (see ``QueryStatsMiddleware``).
 """
-from sqlmodel import SQLModel, Session, create_engine
+import asyncio
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
 
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import metrics
 from app.core.config import settings
+from app.utils.text_search import register_sqlite_functions
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Schema that existed before migrations were introduced
+BASELINE_REVISION = "0001"
+
+# pg_advisory_lock key serializing schema upgrades across workers
+MIGRATION_LOCK_KEY = 7_264_001
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """Rewrite a sync SQLAlchemy URL to its async driver equivalent."""
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+@dataclass
+class QueryStats:
+    """SQL statements executed and time spent in the database for one request."""
+
+    count: int = 0
+    duration: float = 0.0  # seconds
+
+
+# Set by QueryStatsMiddleware for the duration of a request. The async
+# engine's greenlets and run_in_threadpool share the request's context, so
+# the same QueryStats object is updated from all of them.
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
 
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info["query_start_time"].pop()
+    stats = query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += time.perf_counter() - started_at
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def instrument_engine(sync_engine: Engine) -> None:
+    """Attach the query counting hooks to an engine (idempotent)."""
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(sync_engine, "handle_error", _handle_error)
+
+
+@event.listens_for(Engine, "connect")
+def _register_sqlite_search_functions(dbapi_connection, connection_record):
+    # Only SQLite connections (sqlite3, aiosqlite) expose create_function;
+    # PostgreSQL gets these functions from migration 0003.
+    if hasattr(dbapi_connection, "create_function"):
+        register_sqlite_functions(dbapi_connection)
+
+
+# Sync engine - used by scripts only
 engine = create_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
@@ -13,22 +102,122 @@ engine = create_engine(
     max_overflow=20,
 )
 
+# Async engine - used by the API
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    echo=settings.DEBUG,
+    pool_pre_ping=True,
+    pool_size=10,
+    max_overflow=20,
+)
+
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+metrics.gauge(
+    "lamas_db_pool_checked_out",
+    "Connections currently checked out of the API engine's pool.",
+    callback=lambda: async_engine.pool.checkedout(),
+)
+metrics.gauge(
+    "lamas_db_pool_overflow",
+    "Connections open beyond the API engine's pool_size.",
+    callback=lambda: max(async_engine.pool.overflow(), 0),
+)
+
 
 def get_session():
     """
-    Dependency that provides a database session.
+    Provide a sync database session (scripts and offline jobs).
     Yields a session and ensures it's closed after use.
     """
     with Session(engine) as session:
         yield session
 
 
-def init_db():
+async def get_async_session():
+    """
+    Dependency that provides an async database session.
+
+    expire_on_commit is disabled because attribute access after commit
+    cannot lazily refresh under asyncio.
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+def run_migrations(connection: Connection) -> None:
+    """
+    Upgrade the schema to the latest Alembic revision.
+
+    Pass a connection from ``engine.connect()``, not ``engine.begin()``:
+    each revision commits on its own, and revisions that build indexes
+    ``CONCURRENTLY`` on PostgreSQL run outside any transaction.
+
+    On PostgreSQL the upgrade holds a session-level advisory lock, so workers
+    booting together run it one at a time; the later ones find the schema at
+    head and do nothing.
+
+    Databases created before migrations existed (by ``create_all`` or the
+    Laravel app) have tables but no ``alembic_version``; they are stamped at
+    the baseline first so only the newer revisions run.
+    """
+    # Imported here so workers that skip startup migrations never load Alembic
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["connection"] = connection
+    config.attributes["configure_logger"] = False
+
+    locked = connection.dialect.name == "postgresql"
+    if locked:
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        connection.commit()
+    try:
+        inspector = inspect(connection)
+        legacy = not inspector.has_table("alembic_version") and inspector.has_table("users")
+        # Leave no transaction open: Alembic begins one per revision
+        connection.commit()
+        if legacy:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
+    finally:
+        if locked:
+            connection.rollback()
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            connection.commit()
+
+
+async def warm_up_pool(connections: int) -> None:
     """
-    Initialize database tables.
-    Note: We're using an existing PostgreSQL database from Laravel,
-    so this only creates missing tables if needed.
+    Open ``connections`` pooled connections up front.
+
+    The first requests after a deploy then skip TCP/TLS/auth handshakes.
+    Capped at the pool size so warm-up never creates overflow connections.
     """
-    import app.models  # noqa: F401 - Register models in metadata
-    SQLModel.metadata.create_all(engine)
+    connections = min(connections, async_engine.pool.size())
+    if connections <= 0:
+        return
+
+    results = await asyncio.gather(
+        *(async_engine.connect() for _ in range(connections)), return_exceptions=True
+    )
+    opened = [conn for conn in results if not isinstance(conn, BaseException)]
+    try:
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in opened))
+    finally:
+        for conn in opened:
+            await conn.close()
+
+    errors = [error for error in results if isinstance(error, BaseException)]
+    if errors:
+        raise errors[0]
 
+
+async def init_db():
+    """
+    Bring the database schema up to date by running pending migrations.
+    """
+    async with async_engine.connect() as conn:
+        await conn.run_sync(run_migrations)
@@ -1,16 +1,25 @@
 """
 Security utilities for JWT token handling and password hashing.
 """
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.core.cache import MISSING, LRUTTLCache
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
+# Verified token payloads, so repeated bearer tokens skip signature checks.
+# Entries never outlive the token's own exp claim.
+token_cache = LRUTTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
@@ -48,10 +57,18 @@ def create_refresh_token(subject: str | int) -> str:
 
 def decode_token(token: str) -> dict | None:
     """Decode and validate a JWT token."""
+    payload = token_cache.get(token)
+    if payload is not MISSING:
+        return dict(payload)
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        return payload
     except JWTError:
         return None
+
+    exp = payload.get("exp")
+    ttl = exp - time.time() if isinstance(exp, (int, float)) else None
+    token_cache.set(token, payload, ttl_seconds=ttl)
+    return dict(payload)
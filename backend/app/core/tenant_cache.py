@@ -0,0 +1,39 @@
+"""
+In-process cache for tenant configuration.
+
+TenantMiddleware resolves the X-Tenant-ID header on every request. Tenant
+configs change rarely, so they are cached per process with a TTL. Unknown
+tenants are cached too (negative caching) so a bad header cannot turn into
+a query per request; a cached ``None`` means the tenant does not exist.
+The header is client-supplied, so the cache is an LRU bounded by
+TENANT_CONFIG_CACHE_MAX_SIZE. Writes to ``system_configs`` made through the
+ORM invalidate the affected entry immediately; the TTL bounds staleness for
+changes made by other processes or raw SQL.
+"""
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, inspect
+
+from app.core.cache import LRUTTLCache
+from app.core.config import settings
+from app.models.system_config import SystemConfig
+
+TenantConfig = Optional[Dict[str, Any]]
+
+tenant_config_cache = LRUTTLCache(
+    maxsize=settings.TENANT_CONFIG_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TENANT_CONFIG_CACHE_TTL_SECONDS,
+)
+
+
+def _invalidate_system_config(mapper, connection, target: SystemConfig) -> None:
+    """Invalidate the cache entry for a SystemConfig row that was written."""
+    tenant_config_cache.invalidate(target.tenant_name)
+
+    # A rename must also evict the old name
+    for old_name in inspect(target).attrs.tenant_name.history.deleted or ():
+        tenant_config_cache.invalidate(old_name)
+
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(SystemConfig, _event_name, _invalidate_system_config)
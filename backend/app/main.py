@@ -1,20 +1,32 @@
 """
 LAMaS Backend API - Main Application Entry Point
 """
+import time
+
+_import_started_at = time.perf_counter()
+
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.api.v1.router import api_router
 from app.core.config import settings
 from app.core.logging_config import setup_logging
+from app.core.metrics import registry
 
 # Initialize logging
 setup_logging()
 
 
-from app.core.database import init_db
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import async_engine, init_db, warm_up_pool
+from app.services.nid_index import nid_index
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
@@ -22,7 +34,25 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     print("🚀 LAMaS API Starting...")
-    init_db()
+    startup_started_at = time.perf_counter()
+    if settings.DB_MIGRATE_ON_STARTUP:
+        await init_db()
+    try:
+        await warm_up_pool(settings.DB_POOL_WARMUP_SIZE)
+    except Exception:
+        logger.warning("Database pool warm-up failed", exc_info=True)
+    if settings.NID_INDEX_WARMUP_ON_STARTUP:
+        try:
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                await nid_index.load(session)
+        except Exception:
+            # The first public validate-nid request loads it instead
+            logger.warning("NID index warm-up failed", exc_info=True)
+    logger.info(
+        "Startup complete: %.0f ms since app import, lifespan %.0f ms",
+        (startup_started_at - _import_started_at) * 1000,
+        (time.perf_counter() - startup_started_at) * 1000,
+    )
     yield
     # Shutdown
     print("👋 LAMaS API Shutting down...")
@@ -38,6 +68,8 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+from app.api.middlewares.metrics_middleware import MetricsMiddleware
+from app.api.middlewares.query_stats_middleware import QueryStatsMiddleware
 from app.api.middlewares.tenant_middleware import TenantMiddleware
 
 # CORS configuration
@@ -50,6 +82,8 @@ app.add_middleware(
 )
 
 app.add_middleware(TenantMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
 # Include API routes
@@ -64,3 +98,11 @@ async def health_check() -> dict:
         "version": settings.VERSION,
         "service": "lamas-api",
     }
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -31,6 +31,14 @@ from app.models.customer_shadow_risk import CustomerShadowRisk, ShadowRiskLevel
 from app.models.conversational_log import ConversationalLog
 from app.models.core_task_queue import CoreTaskQueue, TaskType, TaskStatus
 from app.models.system_config import SystemConfig
+from app.models.customer_duplicate import (
+    CustomerBlockingKey,
+    CustomerDuplicateCandidate,
+    CustomerDuplicateScan,
+    DuplicateStatus,
+)
+from app.models.customer_referral_stats import CustomerReferralStats
+from app.models.loan_list_view import LoanListView
 
 __all__ = [
     "User",
@@ -68,4 +76,10 @@ __all__ = [
     "TaskType",
     "TaskStatus",
     "SystemConfig",
+    "CustomerBlockingKey",
+    "CustomerDuplicateCandidate",
+    "CustomerDuplicateScan",
+    "DuplicateStatus",
+    "CustomerReferralStats",
+    "LoanListView",
 ]
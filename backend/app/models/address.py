@@ -3,6 +3,7 @@ Address model with many-to-many relationship.
 """
 from datetime import datetime
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -28,6 +29,9 @@ class Addressable(SQLModel, table=True):
     """Pivot table for many-to-many Address relationships."""
 
     __tablename__ = "addressables"
+    __table_args__ = (
+        Index("ix_addressables_addressable", "addressable_type", "addressable_id"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     address_id: int = Field(foreign_key="addresses.id")
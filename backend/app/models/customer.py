@@ -5,6 +5,7 @@ from datetime import date, datetime
 from typing import TYPE_CHECKING
 
 from pydantic import ConfigDict
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -19,6 +20,22 @@ class Customer(SQLModel, table=True):
     """Customer database model."""
 
     __tablename__ = "customers"
+    __table_args__ = (
+        # Customer listing filters on is_active and orders by id
+        Index(
+            "ix_customers_id_active",
+            "id",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active"),
+        ),
+        # Referral linking only looks at referrals not resolved yet
+        Index(
+            "ix_customers_unresolved_referral",
+            "referred_by",
+            postgresql_where=text("referrer_id IS NULL AND referred_by IS NOT NULL"),
+            sqlite_where=text("referrer_id IS NULL AND referred_by IS NOT NULL"),
+        ),
+    )
 
     model_config = ConfigDict(extra="allow")
 
@@ -28,6 +45,8 @@ class Customer(SQLModel, table=True):
     lead_channel: str | None = Field(default=None, max_length=255)
     is_referred: bool = Field(default=False)
     referred_by: str | None = Field(default=None, max_length=11)
+    # referred_by resolved to the referrer's customer ID (referral_service)
+    referrer_id: int | None = Field(default=None, foreign_key="customers.id", index=True)
     is_active: bool = Field(default=True)
     is_assigned: bool = Field(default=False)
     portfolio_id: int | None = Field(default=None, foreign_key="portfolios.id")
@@ -59,7 +78,7 @@ class CustomerDetail(SQLModel, table=True):
     __tablename__ = "customer_details"
 
     id: int | None = Field(default=None, primary_key=True)
-    customer_id: int = Field(foreign_key="customers.id")
+    customer_id: int = Field(foreign_key="customers.id", index=True)
     first_name: str = Field(max_length=255)
     last_name: str | None = Field(default=None, max_length=255)
     email: str | None = Field(default=None, max_length=255)
@@ -110,7 +129,7 @@ class CustomerJobInfo(SQLModel, table=True):
     __tablename__ = "customer_job_info"
 
     id: int | None = Field(default=None, primary_key=True)
-    customer_id: int = Field(foreign_key="customers.id")
+    customer_id: int = Field(foreign_key="customers.id", index=True)
     is_self_employed: bool = Field(default=False)
     # Richer occupation classification; is_self_employed derived automatically in services
     occupation_type: str | None = Field(default=None, max_length=50)
@@ -205,7 +224,7 @@ class Company(SQLModel, table=True):
     __tablename__ = "companies"
 
     id: int | None = Field(default=None, primary_key=True)
-    customer_id: int = Field(foreign_key="customers.id")
+    customer_id: int = Field(foreign_key="customers.id", index=True)
     name: str = Field(max_length=255)
     email: str | None = Field(default=None, max_length=255)
     type: str | None = Field(default=None, max_length=100)
@@ -0,0 +1,63 @@
+"""
+Duplicate customer candidates found by the entity-resolution job.
+"""
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy import UniqueConstraint
+from sqlmodel import JSON, Column, Field, SQLModel
+
+
+class DuplicateStatus(str, Enum):
+    PENDING = "PENDING"
+    CONFIRMED = "CONFIRMED"
+    DISMISSED = "DISMISSED"
+
+
+class CustomerDuplicateCandidate(SQLModel, table=True):
+    """A scored pair of customers that may be the same person, awaiting review."""
+
+    __tablename__ = "customer_duplicate_candidates"
+    __table_args__ = (
+        # Pairs are stored once, lower customer ID first
+        UniqueConstraint("customer_id", "duplicate_customer_id"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    customer_id: int = Field(foreign_key="customers.id", index=True, nullable=False)
+    duplicate_customer_id: int = Field(foreign_key="customers.id", index=True, nullable=False)
+
+    score: float = Field(nullable=False)
+    # Signals that matched, e.g. ["phone", "name", "nid"]
+    matched_on: list[str] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    status: DuplicateStatus = Field(default=DuplicateStatus.PENDING, index=True, nullable=False)
+
+    reviewed_by: Optional[int] = Field(default=None, foreign_key="users.id", nullable=True)
+    reviewed_at: Optional[datetime] = Field(default=None, nullable=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class CustomerDuplicateScan(SQLModel, table=True):
+    """One run of the duplicate detection job; the last finished one is the incremental watermark."""
+
+    __tablename__ = "customer_duplicate_scans"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    is_full: bool = Field(default=False, nullable=False)
+    started_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    finished_at: Optional[datetime] = Field(default=None, nullable=True)
+    customers_changed: int = Field(default=0, nullable=False)
+    pairs_compared: int = Field(default=0, nullable=False)
+    candidates_written: int = Field(default=0, nullable=False)
+
+
+class CustomerBlockingKey(SQLModel, table=True):
+    """A blocking key of a customer, as of the last scan that examined it (see duplicate_service)."""
+
+    __tablename__ = "customer_blocking_keys"
+
+    customer_id: int = Field(foreign_key="customers.id", primary_key=True)
+    # e.g. "phone:8095550000", "email:ana@example.com", "name:A500G520"
+    key: str = Field(primary_key=True, max_length=300, index=True)
@@ -0,0 +1,21 @@
+"""
+Per-referrer rollups of the customer referral graph (see referral_service).
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class CustomerReferralStats(SQLModel, table=True):
+    """Rollup of everyone a customer brought in, directly or down the referral tree."""
+
+    __tablename__ = "customer_referral_stats"
+
+    customer_id: int = Field(foreign_key="customers.id", primary_key=True)
+    direct_count: int = Field(default=0, nullable=False)
+    indirect_count: int = Field(default=0, nullable=False)
+    applications_count: int = Field(default=0, nullable=False)
+    approved_count: int = Field(default=0, nullable=False)
+    approved_amount: float = Field(default=0, nullable=False)
+    refreshed_at: Optional[datetime] = Field(default_factory=datetime.utcnow, nullable=True)
@@ -4,6 +4,7 @@ Customer document model for file management and versioning.
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -35,6 +36,16 @@ class CustomerDocument(SQLModel, table=True):
     - other_support: Comprobante o documento de soporte adicional
     """
     __tablename__ = "customer_documents"
+    __table_args__ = (
+        # Current version of each document type for a customer
+        Index(
+            "ix_customer_documents_latest",
+            "customer_id",
+            "document_type",
+            postgresql_where=text("is_latest"),
+            sqlite_where=text("is_latest"),
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     customer_id: int = Field(foreign_key="customers.id", index=True)
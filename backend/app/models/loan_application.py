@@ -5,6 +5,7 @@ from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -33,9 +34,18 @@ class LoanApplication(SQLModel, table=True):
     """Loan application database model."""
 
     __tablename__ = "loan_applications"
+    __table_args__ = (
+        # Active loans of a customer (soft-deleted rows are excluded)
+        Index(
+            "ix_loan_applications_customer_id_active",
+            "customer_id",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active"),
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
-    customer_id: int | None = Field(default=None, foreign_key="customers.id")
+    customer_id: int | None = Field(default=None, foreign_key="customers.id", index=True)
     user_id: int | None = Field(default=None, foreign_key="users.id")
     # Stored as string in DB
     status: str = Field(default="received", max_length=50)
@@ -72,7 +82,8 @@ class LoanApplicationDetail(SQLModel, table=True):
     __tablename__ = "loan_application_details"
 
     id: int | None = Field(default=None, primary_key=True)
-    loan_application_id: int = Field(foreign_key="loan_applications.id")
+    loan_application_id: int = Field(
+        foreign_key="loan_applications.id", index=True)
     amount: float = Field(default=0)
     term: int = Field(default=0)  # In months
     rate: float = Field(default=0)  # Interest rate
@@ -91,6 +102,13 @@ class LoanApplicationNote(SQLModel, table=True):
     """Notes on loan applications."""
 
     __tablename__ = "loan_application_notes"
+    __table_args__ = (
+        Index(
+            "ix_loan_application_notes_loan_application_id_created_at",
+            "loan_application_id",
+            "created_at",
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     loan_application_id: int = Field(foreign_key="loan_applications.id")
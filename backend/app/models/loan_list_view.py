@@ -0,0 +1,42 @@
+"""
+Loan list read model - one denormalized row per loan application.
+
+Maintained on write by app.services.loan_list_view; never edit it directly.
+"""
+from datetime import datetime
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+class LoanListView(SQLModel, table=True):
+    """Everything the loans table shows, so a page is read from one table."""
+
+    __tablename__ = "loan_list_view"
+    __table_args__ = (
+        # Default listing is newest first, usually narrowed by status
+        Index("ix_loan_list_view_status_loan_application_id", "status", "loan_application_id"),
+    )
+
+    loan_application_id: int = Field(foreign_key="loan_applications.id", primary_key=True)
+    customer_id: int | None = Field(default=None, index=True)
+    user_id: int | None = Field(default=None)
+    status: str = Field(max_length=50)
+    is_active: bool
+    is_approved: bool
+    is_rejected: bool
+    is_archived: bool
+    is_new: bool
+
+    amount: float | None = Field(default=None)
+    term: int | None = Field(default=None)
+    purpose: str | None = Field(default=None)
+    customer_name: str | None = Field(default=None)
+    customer_nid: str | None = Field(default=None, max_length=11)
+    company_name: str | None = Field(default=None)
+    bank_name: str | None = Field(default=None)
+    advisor_name: str | None = Field(default=None)
+    latest_note: str | None = Field(default=None)
+
+    created_at: datetime | None = Field(default=None)
+    updated_at: datetime | None = Field(default=None)
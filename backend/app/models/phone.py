@@ -3,6 +3,7 @@ Phone model - Polymorphic relationship.
 """
 from datetime import datetime
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -10,6 +11,9 @@ class Phone(SQLModel, table=True):
     """Phone model with polymorphic relationship."""
 
     __tablename__ = "phones"
+    __table_args__ = (
+        Index("ix_phones_phoneable", "phoneable_type", "phoneable_id"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     country_area: str | None = Field(default=None, max_length=10)
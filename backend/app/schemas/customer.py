@@ -6,11 +6,13 @@ This module defines all schemas for customer CRUD operations including:
 - Output schemas for API responses
 - Validation schemas with Dominican Republic standards
 """
+import base64
+import json
 from datetime import date, datetime
 from decimal import Decimal
 from typing import Any, Generic, Literal, TypeVar
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator, model_validator
 
 
 # ============================================================================
@@ -370,6 +372,21 @@ class CustomerCreateSchema(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
 
+BULK_CREATE_MAX_ITEMS = 5000
+
+
+class CustomerBulkCreateSchema(BaseModel):
+    """
+    Batch of customers for POST /customers/bulk.
+
+    Items are plain objects validated one by one against CustomerCreateSchema,
+    so an invalid item is reported instead of rejecting the whole batch.
+    """
+
+    customers: list[dict[str, Any]] = Field(
+        min_length=1, max_length=BULK_CREATE_MAX_ITEMS)
+
+
 class CustomerSimpleCreateSchema(BaseModel):
     """
     Simple customer creation schema.
@@ -595,6 +612,15 @@ class CustomerVehicleRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ChildChanges(BaseModel):
+    """Row IDs of a nested collection, by what an update did to them."""
+
+    inserted: list[int] = []
+    updated: list[int] = []
+    deleted: list[int] = []
+    unchanged: list[int] = []
+
+
 class CustomerListItem(BaseModel):
     """Customer list item schema for pagination responses."""
 
@@ -645,6 +671,91 @@ class CustomerReadSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CustomerUpdateResponse(CustomerReadSchema):
+    """
+    PUT /customers/{id} response: the updated customer plus ``changes`` for
+    each submitted collection (phones, addresses, references).
+    """
+
+    changes: dict[str, ChildChanges] = {}
+
+
+class CustomerBulkCreated(BaseModel):
+    """A batch item that was created."""
+
+    index: int
+    id: int
+    nid: str
+
+
+class CustomerBulkError(BaseModel):
+    """A batch item that was rejected, with the reasons."""
+
+    index: int
+    nid: str | None = None
+    errors: list[str]
+
+
+class CustomerBulkCreateResponse(BaseModel):
+    """Outcome of a bulk create; ``index`` refers to the position in the request."""
+
+    created: list[CustomerBulkCreated] = []
+    errors: list[CustomerBulkError] = []
+    created_count: int = 0
+    failed_count: int = 0
+
+
+class CustomerDuplicateRead(BaseModel):
+    """A possible duplicate pair from the duplicate detection job."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    customer_id: int
+    duplicate_customer_id: int
+    customer_nid: str
+    duplicate_customer_nid: str
+    customer_name: str
+    duplicate_customer_name: str
+    score: float
+    matched_on: list[str]
+    status: Literal["PENDING", "CONFIRMED", "DISMISSED"]
+    reviewed_by: int | None = None
+    reviewed_at: datetime | None = None
+    created_at: datetime
+
+
+class CustomerDuplicateReviewSchema(BaseModel):
+    """Reviewer decision on a duplicate pair."""
+
+    status: Literal["CONFIRMED", "DISMISSED"]
+
+
+class CustomerReferralNode(BaseModel):
+    """A customer in someone's referral tree."""
+
+    id: int
+    nid: str
+    name: str
+    referrer_id: int
+    depth: int  # 1 = referred directly
+    created_at: datetime | None = None
+
+
+class CustomerReferralStatsRead(BaseModel):
+    """Rollup of a customer's referral tree (direct and indirect referrals)."""
+
+    customer_id: int
+    direct_count: int = 0
+    indirect_count: int = 0
+    total_count: int = 0
+    applications_count: int = 0
+    approved_count: int = 0
+    approval_rate: float | None = None  # approved / applications, None without applications
+    approved_amount: float = 0
+    refreshed_at: datetime | None = None
+
+
 # ============================================================================
 # Utility Schemas
 # ============================================================================
@@ -661,41 +772,122 @@ class CustomerFilterSchema(BaseModel):
     is_active: bool | None = None
 
 
+BULK_ASSIGN_MAX_IDS = 10000
+
+
+class CustomerBulkAssignSchema(BaseModel):
+    """
+    Request for POST /customers/assign/bulk.
+
+    Selects customers either by ``customer_ids`` or by ``filters`` (the
+    customer list filters, at least one set) and assigns them all to the
+    given portfolio and/or promoter.
+    """
+
+    customer_ids: list[int] | None = Field(
+        None, min_length=1, max_length=BULK_ASSIGN_MAX_IDS)
+    filters: CustomerFilterSchema | None = None
+    portfolio_id: int | None = None
+    promoter_id: int | None = None
+
+    @model_validator(mode="after")
+    def validate_selection(self) -> "CustomerBulkAssignSchema":
+        if (self.customer_ids is None) == (self.filters is None):
+            raise ValueError("Provide exactly one of customer_ids or filters")
+        if self.filters is not None and not self.filters.model_dump(exclude_none=True):
+            raise ValueError("filters must set at least one criterion")
+        if self.portfolio_id is None and self.promoter_id is None:
+            raise ValueError("At least one of portfolio_id or promoter_id must be provided")
+        return self
+
+
+class CustomerBulkAssignResponse(BaseModel):
+    """Outcome of a bulk assignment; ``not_found`` only applies to ID lists."""
+
+    updated_count: int
+    not_found_count: int = 0
+
+
 class PaginationParams(BaseModel):
-    """Pagination parameters."""
+    """
+    Pagination parameters.
+
+    Without ``cursor`` pages are addressed by ``page`` (OFFSET). With a
+    ``cursor`` taken from a previous response's ``next_cursor`` the list
+    seeks past the last returned id instead, which stays fast on deep pages.
+    ``include_total=False`` skips counting the matching rows, and
+    ``count="estimate"`` accepts a planner estimate instead of an exact count.
+    """
 
     page: int = Field(default=1, ge=1)
     per_page: int = Field(default=20, ge=1, le=100)
+    cursor: str | None = None
+    include_total: bool = True
+    count: Literal["exact", "estimate"] = "exact"
 
 
 T = TypeVar("T")
 
 
+def encode_cursor(last_id: int) -> str:
+    """Build the opaque keyset cursor pointing after ``last_id``."""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Return the id encoded in a keyset cursor. Raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except Exception as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValueError("Invalid pagination cursor")
+    return last_id
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
-    """Generic paginated response wrapper."""
+    """
+    Generic paginated response wrapper.
+
+    ``total`` and ``pages`` are None when the count was skipped
+    (``include_total=false``). ``total_is_estimate`` is True when ``total``
+    is a planner estimate rather than an exact count. ``next_cursor`` is None
+    on the last page.
+    """
 
     items: list[T]
-    total: int
+    total: int | None
     page: int
     per_page: int
-    pages: int
+    pages: int | None
+    next_cursor: str | None = None
+    total_is_estimate: bool = False
 
     @classmethod
     def create(
         cls,
         items: list[T],
-        total: int,
+        total: int | None,
         page: int,
         per_page: int,
+        next_cursor: str | None = None,
+        total_is_estimate: bool = False,
     ) -> "PaginatedResponse[T]":
         """Create a paginated response with calculated pages."""
-        pages = (total + per_page - 1) // per_page if total > 0 else 0
+        if total is None:
+            pages = None
+        else:
+            pages = (total + per_page - 1) // per_page if total > 0 else 0
         return cls(
             items=items,
             total=total,
             page=page,
             per_page=per_page,
             pages=pages,
+            next_cursor=next_cursor,
+            total_is_estimate=total_is_estimate,
         )
 
 
@@ -707,3 +899,28 @@ class NIDValidationResponse(BaseModel):
     is_unique: bool
     message: str | None = None
     existing_customer: dict | None = None
+
+
+NID_BATCH_MAX_ITEMS = 10000
+
+
+class NIDBatchValidationRequest(BaseModel):
+    """NIDs for POST /customers/validate-nid/batch (with or without dashes)."""
+
+    nids: list[str] = Field(min_length=1, max_length=NID_BATCH_MAX_ITEMS)
+
+
+class NIDBatchValidationItem(BaseModel):
+    """Result for one submitted NID, in submission order."""
+
+    nid: str
+    is_valid: bool
+    customer_id: int | None = None
+
+
+class NIDBatchValidationResponse(BaseModel):
+    """Response schema for batch NID validation."""
+
+    results: list[NIDBatchValidationItem]
+    valid_count: int
+    existing_count: int
@@ -8,9 +8,9 @@ This module defines all schemas for loan application CRUD operations including:
 - Credit risk association schemas
 """
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from app.models.loan_application import LoanStatus
 from app.schemas.customer import PaginatedResponse, PaginationParams  # noqa: F401 - re-exported
@@ -64,6 +64,36 @@ class LoanApplicationStatusUpdate(BaseModel):
     )
 
 
+BULK_STATUS_MAX_ITEMS = 5000
+
+
+class LoanApplicationBulkStatusItem(BaseModel):
+    """One transition of a bulk status update."""
+
+    loan_id: int
+    status: LoanStatus = Field(
+        description="Target status for the loan application")
+    note: str | None = Field(
+        None, description="Optional note explaining the status change"
+    )
+
+
+class LoanApplicationBulkStatusUpdate(BaseModel):
+    """Schema for POST /loan-applications/status/bulk (each loan at most once)."""
+
+    transitions: list[LoanApplicationBulkStatusItem] = Field(
+        min_length=1, max_length=BULK_STATUS_MAX_ITEMS)
+
+    @model_validator(mode="after")
+    def validate_unique_loans(self) -> "LoanApplicationBulkStatusUpdate":
+        seen: set[int] = set()
+        for item in self.transitions:
+            if item.loan_id in seen:
+                raise ValueError(f"Loan {item.loan_id} appears more than once")
+            seen.add(item.loan_id)
+        return self
+
+
 class LoanApplicationNoteCreate(BaseModel):
     """Schema for adding a note to a loan application."""
 
@@ -169,6 +199,23 @@ class LoanApplicationReadSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class LoanApplicationBulkStatusResult(BaseModel):
+    """Outcome of one requested transition."""
+
+    loan_id: int
+    result: Literal["updated", "not_found", "invalid_transition"]
+    previous_status: str | None = None
+    status: str | None = None
+    detail: str | None = None
+
+
+class LoanApplicationBulkStatusResponse(BaseModel):
+    """Bulk status update outcome, one result per requested loan in request order."""
+
+    updated_count: int
+    results: list[LoanApplicationBulkStatusResult]
+
+
 # ============================================================================
 # Credit Risk Schemas
 # ============================================================================
@@ -0,0 +1,110 @@
+"""
+Count service - Totals for paginated lists.
+
+An exact ``COUNT(*)`` over a mostly-matching filter costs more than the page
+itself on large tables. Two cheaper options are offered:
+
+- Exact counts are cached for a few seconds per (list, normalized filters),
+  so paging through the same result set counts once.
+- Estimated counts come from the PostgreSQL planner: ``pg_class.reltuples``
+  for an unfiltered list, or the row estimate of ``EXPLAIN`` when filters are
+  applied. Other databases (SQLite in tests) fall back to the exact count.
+"""
+import json
+from typing import Any, Hashable, Literal
+
+from sqlalchemy import Select, text
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import MISSING, LRUTTLCache
+from app.core.config import settings
+
+CountMode = Literal["exact", "estimate"]
+
+count_cache = LRUTTLCache(maxsize=1024, ttl_seconds=settings.COUNT_CACHE_TTL_SECONDS)
+
+
+def count_cache_key(list_name: str, filters: dict[str, Any]) -> Hashable:
+    """Normalize a filter set so equivalent requests share a cache entry."""
+    return (list_name, tuple(sorted((k, str(v)) for k, v in filters.items() if v is not None)))
+
+
+def get_cached_count(key: Hashable) -> int | None:
+    """Return a cached exact count, or None."""
+    total = count_cache.get(key)
+    return None if total is MISSING else total
+
+
+def cache_count(key: Hashable, total: int) -> None:
+    """Remember an exact count computed elsewhere (e.g. a window count)."""
+    count_cache.set(key, total)
+
+
+async def exact_count(session: AsyncSession, rows_statement: Select, key: Hashable) -> int:
+    """Exact number of rows ``rows_statement`` returns, cached briefly."""
+    total = get_cached_count(key)
+    if total is None:
+        count_statement = select(func.count()).select_from(
+            rows_statement.order_by(None).subquery()
+        )
+        total = (await session.exec(count_statement)).one()
+        cache_count(key, total)
+    return total
+
+
+async def estimate_count(
+    session: AsyncSession, rows_statement: Select, table_name: str, filtered: bool
+) -> int | None:
+    """
+    Planner estimate of the rows ``rows_statement`` returns.
+
+    Returns None when no estimate is available (not PostgreSQL, or the table
+    has never been analyzed).
+    """
+    connection = await session.connection()
+    if connection.dialect.name != "postgresql":
+        return None
+
+    if not filtered:
+        reltuples = (await connection.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": table_name},
+        )).scalar()
+        # reltuples is -1 until the table is first vacuumed/analyzed
+        return int(reltuples) if reltuples is not None and reltuples >= 0 else None
+
+    # Bound values are inlined because EXPLAIN cannot take parameters; the
+    # dialect quotes them. exec_driver_sql avoids re-parsing ':' as binds.
+    compiled = rows_statement.order_by(None).compile(
+        dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(
+    session: AsyncSession,
+    rows_statement: Select,
+    *,
+    key: Hashable,
+    table_name: str,
+    filtered: bool,
+    mode: CountMode,
+) -> tuple[int, bool]:
+    """
+    Total for a paginated list as ``(total, is_estimate)``.
+
+    ``rows_statement`` selects the list's rows with filters applied but
+    without ordering, offset or limit.
+    """
+    if mode == "estimate":
+        cached = get_cached_count(key)
+        if cached is not None:
+            return cached, False
+        estimate = await estimate_count(session, rows_statement, table_name, filtered)
+        if estimate is not None:
+            return estimate, True
+    return await exact_count(session, rows_statement, key), False
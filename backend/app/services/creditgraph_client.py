@@ -1,11 +1,13 @@
 """
 Client for CreditGraph AI API.
 """
+import time
 from typing import Optional
 
 import httpx
 
 from app.core.config import settings
+from app.core.metrics import CREDITGRAPH_ERRORS, CREDITGRAPH_REQUEST_DURATION
 
 
 class CreditGraphClient:
@@ -33,17 +35,26 @@ class CreditGraphClient:
             "config": config or {"narrative_language": "es"},
         }
 
-        with httpx.Client(timeout=self.timeout) as client:
-            response = client.post(
-                f"{self.base_url}/api/v1/analyze",
-                json=payload,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-            )
-            response.raise_for_status()
-            return response.json()
+        start = time.perf_counter()
+        try:
+            with httpx.Client(timeout=self.timeout) as client:
+                response = client.post(
+                    f"{self.base_url}/api/v1/analyze",
+                    json=payload,
+                    headers={
+                        "Authorization": f"Bearer {self.api_key}",
+                        "Content-Type": "application/json",
+                    },
+                )
+                response.raise_for_status()
+                result = response.json()
+        except Exception as exc:
+            CREDITGRAPH_REQUEST_DURATION.observe(time.perf_counter() - start, outcome="error")
+            CREDITGRAPH_ERRORS.inc(error=type(exc).__name__)
+            raise
+
+        CREDITGRAPH_REQUEST_DURATION.observe(time.perf_counter() - start, outcome="success")
+        return result
 
     def health_check(self) -> bool:
         """Check if CreditGraph API is healthy (Sync)."""
@@ -1,24 +1,30 @@
 """
-Service for CreditGraph AI analysis orchestration (Sync).
+Service for CreditGraph AI analysis orchestration.
 """
 from datetime import datetime
 from typing import Any, Optional
 
-from sqlmodel import Session, select
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from app.models.creditgraph import CreditGraphAnalysis
+from app.models.customer import Customer
 from app.models.loan_application import LoanApplication, LoanStatus
 from app.services.creditgraph_client import CreditGraphClient
+from app.services.loan_list_view import refresh_loan_list_view
+from app.services.referral_service import refresh_referrer_stats
 
 
-def get_existing_analysis(
-    session: Session, loan_id: int
+async def get_existing_analysis(
+    session: AsyncSession, loan_id: int
 ) -> Optional[CreditGraphAnalysis]:
-    """Get existing analysis for a loan application (Sync)."""
+    """Get existing analysis for a loan application."""
     statement = select(CreditGraphAnalysis).where(
         CreditGraphAnalysis.loan_application_id == loan_id
     )
-    return session.exec(statement).first()
+    return (await session.exec(statement)).first()
 
 
 def map_decision_to_loan_status(decision: str) -> str:
@@ -32,20 +38,31 @@ def map_decision_to_loan_status(decision: str) -> str:
     return status_map.get(decision, LoanStatus.ANALYZED.value)
 
 
-def trigger_analysis(
-    session: Session, loan_id: int, *, force_reanalyze: bool = False
+async def trigger_analysis(
+    session: AsyncSession, loan_id: int, *, force_reanalyze: bool = False
 ) -> CreditGraphAnalysis:
     """
-    Trigger or fetch CreditGraph analysis for a loan application (Sync).
+    Trigger or fetch CreditGraph analysis for a loan application.
+
+    The HTTP call to CreditGraph is blocking, so it runs in the threadpool.
     """
-    # 1. Fetch loan application
-    loan_app = session.get(LoanApplication, loan_id)
+    # 1. Fetch loan application (relations used by the payload are eager-loaded)
+    loan_app = await session.get(
+        LoanApplication,
+        loan_id,
+        options=[
+            selectinload(LoanApplication.details),
+            selectinload(LoanApplication.customer).selectinload(Customer.detail),
+            selectinload(LoanApplication.customer).selectinload(Customer.job_info),
+            selectinload(LoanApplication.customer).selectinload(Customer.financial_info),
+        ],
+    )
 
     if not loan_app:
         raise ValueError(f"Loan application {loan_id} not found")
 
     # 2. Check existing analysis
-    existing = get_existing_analysis(session, loan_id)
+    existing = await get_existing_analysis(session, loan_id)
     if existing and not force_reanalyze:
         return existing
 
@@ -85,11 +102,12 @@ def trigger_analysis(
         "purpose": loan_app.details.purpose if loan_app.details else "Unspecified",
     }
 
-    # 4. Call CreditGraph API (Sync)
+    # 4. Call CreditGraph API
     client = CreditGraphClient()
     start_time = datetime.utcnow()
 
-    result_json = client.analyze_loan_application(
+    result_json = await run_in_threadpool(
+        client.analyze_loan_application,
         applicant=applicant_data,
         loan=loan_data,
         documents=[],
@@ -148,8 +166,11 @@ def trigger_analysis(
     # 6. Update loan status
     loan_app.status = map_decision_to_loan_status(result_json["decision"])
     loan_app.changed_status_at = datetime.utcnow()
+    session.add(loan_app)
+    await refresh_referrer_stats(session, [loan_app.customer_id])
+    await refresh_loan_list_view(session, [loan_app.id])
 
-    session.commit()
-    session.refresh(analysis)
+    await session.commit()
+    await session.refresh(analysis)
 
     return analysis
@@ -0,0 +1,220 @@
+"""
+Customer bulk service - Create many customers in one transaction.
+
+Used to onboard payroll agreements (thousands of employees at once). Items
+are validated one by one; valid items are written with one multi-row INSERT
+per table, whatever the batch size:
+
+- customers use INSERT ... RETURNING id, NID, so their IDs come back in the
+  same round trip instead of a flush per row
+- addresses use INSERT ... RETURNING ordered by parameter (PostgreSQL batches
+  it; SQLite, used by the tests, falls back to one statement per row)
+- details, one-to-one sections, references, accounts, phones and address
+  pivots are executemany INSERTs keyed by those IDs
+
+Invalid items (schema errors, bad NID check digit, NID repeated in the batch
+or already registered) are reported with their index and skipped.
+"""
+from typing import Any
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlmodel import SQLModel, insert, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.address import Address, Addressable
+from app.models.customer import (
+    Company,
+    Customer,
+    CustomerDetail,
+    CustomerFinancialInfo,
+    CustomerJobInfo,
+    CustomerReference,
+    CustomersAccount,
+    CustomerVehicle,
+)
+from app.models.phone import Phone
+from app.schemas.customer import (
+    CustomerBulkCreateResponse,
+    CustomerBulkCreated,
+    CustomerBulkError,
+    CustomerCreateSchema,
+)
+from app.services.nid_index import nid_index
+from app.services.referral_service import sync_referrals
+from app.utils.validators import validate_dominican_nid
+
+ONE_TO_ONE_SECTIONS = (
+    ("financial_info", CustomerFinancialInfo),
+    ("job_info", CustomerJobInfo),
+    ("company", Company),
+    ("vehicle", CustomerVehicle),
+)
+LIST_SECTIONS = (
+    ("references", CustomerReference),
+    ("accounts", CustomersAccount),
+)
+
+
+def _column_values(model: type[SQLModel], data: BaseModel, **extra: Any) -> dict[str, Any]:
+    """Schema values restricted to the model's columns (schemas carry a few extras)."""
+    columns = model.__table__.columns.keys()
+    values = {k: v for k, v in data.model_dump().items() if k in columns}
+    return {**values, **extra}
+
+
+def _validation_messages(error: ValidationError) -> list[str]:
+    return [
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+        for err in error.errors()
+    ]
+
+
+async def _insert_many(session: AsyncSession, model: type[SQLModel], rows: list[dict]) -> None:
+    if rows:
+        await session.exec(insert(model), params=rows)
+
+
+async def _insert_returning_ids(
+    session: AsyncSession, model: type[SQLModel], rows: list[dict]
+) -> list[int]:
+    if not rows:
+        return []
+    statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+    return list((await session.exec(statement, params=rows)).scalars())
+
+
+async def _insert_customers(
+    session: AsyncSession, customers: list[CustomerCreateSchema]
+) -> list[int]:
+    """Insert validated customers and all their nested rows. Returns customer IDs."""
+    returned = await session.exec(insert(Customer).returning(Customer.id, Customer.nid), params=[
+        {
+            "nid": data.nid,
+            "lead_channel": data.lead_channel,
+            "is_referred": data.is_referred,
+            "referred_by": data.referred_by,
+            "is_active": True,
+            "is_assigned": False,
+        }
+        for data in customers
+    ])
+    # NIDs are unique, so rows are matched back without relying on RETURNING order
+    id_by_nid = {nid: customer_id for customer_id, nid in returned.all()}
+    customer_ids = [id_by_nid[data.nid] for data in customers]
+    owned = list(zip(customer_ids, customers))
+
+    await _insert_many(session, CustomerDetail, [
+        _column_values(CustomerDetail, data.detail, customer_id=customer_id)
+        for customer_id, data in owned
+    ])
+    for attribute, model in ONE_TO_ONE_SECTIONS:
+        await _insert_many(session, model, [
+            _column_values(model, getattr(data, attribute), customer_id=customer_id)
+            for customer_id, data in owned
+            if getattr(data, attribute) is not None
+        ])
+    for attribute, model in LIST_SECTIONS:
+        await _insert_many(session, model, [
+            _column_values(model, item, customer_id=customer_id)
+            for customer_id, data in owned
+            for item in getattr(data, attribute)
+        ])
+
+    await _insert_many(session, Phone, [
+        _column_values(Phone, phone, phoneable_type="Customer", phoneable_id=customer_id)
+        for customer_id, data in owned
+        for phone in data.phones
+    ])
+
+    address_owners = [
+        (customer_id, address) for customer_id, data in owned for address in data.addresses
+    ]
+    address_ids = await _insert_returning_ids(session, Address, [
+        _column_values(Address, address) for _, address in address_owners
+    ])
+    await _insert_many(session, Addressable, [
+        {"address_id": address_id, "addressable_type": "Customer", "addressable_id": customer_id}
+        for address_id, (customer_id, _) in zip(address_ids, address_owners)
+    ])
+
+    return customer_ids
+
+
+async def bulk_create_customers(
+    session: AsyncSession,
+    items: list[dict[str, Any]]
+) -> CustomerBulkCreateResponse:
+    """
+    Validate a batch of customers and create the valid ones in one transaction.
+
+    Args:
+        session: Database session
+        items: Raw customer payloads (CustomerCreateSchema shape)
+
+    Returns:
+        CustomerBulkCreateResponse with the created IDs and per-item errors
+
+    Raises:
+        HTTPException: 400 if writing the valid items fails (nothing is created)
+    """
+    errors: list[CustomerBulkError] = []
+    valid: dict[str, tuple[int, CustomerCreateSchema]] = {}
+
+    for index, raw in enumerate(items):
+        try:
+            data = CustomerCreateSchema.model_validate(raw)
+        except ValidationError as e:
+            nid = raw.get("nid", raw.get("NID")) if isinstance(raw, dict) else None
+            errors.append(CustomerBulkError(
+                index=index,
+                nid=nid if isinstance(nid, str) else None,
+                errors=_validation_messages(e),
+            ))
+            continue
+
+        if not validate_dominican_nid(data.nid):
+            message = "nid: Cédula no válida (dígito verificador incorrecto)"
+        elif data.nid in valid:
+            message = f"nid: duplicated in this batch (item {valid[data.nid][0]})"
+        else:
+            valid[data.nid] = (index, data)
+            continue
+        errors.append(CustomerBulkError(index=index, nid=data.nid, errors=[message]))
+
+    if valid:
+        existing = (await session.exec(
+            select(Customer.nid).where(Customer.nid.in_(list(valid)))
+        )).all()
+        for nid in existing:
+            index, _ = valid.pop(nid)
+            errors.append(CustomerBulkError(
+                index=index, nid=nid, errors=[f"nid: Customer with NID {nid} already exists"]
+            ))
+
+    created: list[CustomerBulkCreated] = []
+    if valid:
+        batch = sorted(valid.values(), key=lambda item: item[0])
+        try:
+            customer_ids = await _insert_customers(session, [data for _, data in batch])
+            nid_index.add(*(data.nid for _, data in batch))
+            await sync_referrals(session, written_ids=customer_ids)
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail=f"Failed to create customers: {str(e)}"
+            )
+        created = [
+            CustomerBulkCreated(index=index, id=customer_id, nid=data.nid)
+            for customer_id, (index, data) in zip(customer_ids, batch)
+        ]
+
+    errors.sort(key=lambda error: error.index)
+    return CustomerBulkCreateResponse(
+        created=created,
+        errors=errors,
+        created_count=len(created),
+        failed_count=len(errors),
+    )
@@ -0,0 +1,75 @@
+"""
+Customer cache - Read-through cache of the serialized customer aggregate.
+
+Entries are keyed by ``(customer_id, version)``. Every write path that
+changes a customer bumps its version after committing, so the next read
+misses and rebuilds; old versions are never read again and simply expire.
+The version is read before the database, so a write racing a rebuild can
+only leave an unreachable entry behind, never a stale one.
+
+A cache outage degrades to reading from the database.
+"""
+import logging
+from typing import Awaitable, Callable
+
+from app.core.cache_backend import CacheBackendError, create_cache_backend
+from app.core.config import settings
+from app.core.metrics import CUSTOMER_CACHE_REQUESTS
+from app.schemas.customer import CustomerReadSchema
+
+logger = logging.getLogger(__name__)
+
+customer_cache_backend = create_cache_backend(
+    settings.CUSTOMER_CACHE_URL,
+    maxsize=settings.CUSTOMER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.CUSTOMER_CACHE_TTL_SECONDS,
+)
+
+
+def _version_key(customer_id: int) -> str:
+    return f"customer:{customer_id}:version"
+
+
+def _aggregate_key(customer_id: int, version: int) -> str:
+    return f"customer:{customer_id}:v{version}"
+
+
+async def read_through_customer(
+    customer_id: int,
+    load: Callable[[], Awaitable[CustomerReadSchema | None]],
+) -> CustomerReadSchema | None:
+    """Return the cached aggregate, or ``load()`` it and cache the result."""
+    try:
+        version = await customer_cache_backend.get_counter(_version_key(customer_id))
+        cached = await customer_cache_backend.get(_aggregate_key(customer_id, version))
+    except CacheBackendError as exc:
+        logger.warning(f"Customer cache unavailable, reading from database: {exc}")
+        CUSTOMER_CACHE_REQUESTS.inc(result="error")
+        return await load()
+
+    if cached is not None:
+        CUSTOMER_CACHE_REQUESTS.inc(result="hit")
+        return CustomerReadSchema.model_validate_json(cached)
+
+    CUSTOMER_CACHE_REQUESTS.inc(result="miss")
+    customer = await load()
+    if customer is not None:
+        try:
+            await customer_cache_backend.set(
+                _aggregate_key(customer_id, version),
+                customer.model_dump_json().encode(),
+                settings.CUSTOMER_CACHE_TTL_SECONDS,
+            )
+        except CacheBackendError as exc:
+            logger.warning(f"Could not cache customer {customer_id}: {exc}")
+    return customer
+
+
+async def invalidate_customers(*customer_ids: int) -> None:
+    """Bump the version of customers changed by a committed write."""
+    for customer_id in customer_ids:
+        try:
+            await customer_cache_backend.incr(_version_key(customer_id))
+        except CacheBackendError as exc:
+            # Readers keep the old version until its entry expires (TTL)
+            logger.error(f"Could not invalidate cached customer {customer_id}: {exc}")
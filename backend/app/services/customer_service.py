@@ -10,11 +10,21 @@ This module handles all customer-related business operations including:
 - NID validation
 All database operations are wrapped in transactions for data integrity.
 """
-from typing import Sequence
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import AsyncIterator, Literal, Sequence
 
 from fastapi import HTTPException
-from sqlmodel import Session, select, func, or_
-
+from sqlalchemy import String, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import joinedload
+from sqlmodel import case, select, func, or_, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import MISSING, LRUTTLCache
+from app.core.config import settings
 from app.models.customer import (
     Customer,
     CustomerDetail,
@@ -29,20 +39,123 @@ from app.models.phone import Phone
 from app.models.address import Address, Addressable
 from app.models.portfolio import Portfolio, Promoter
 from app.schemas.customer import (
+    CustomerBulkAssignResponse,
+    CustomerBulkAssignSchema,
     CustomerCreateSchema,
     CustomerSimpleCreateSchema,
     CustomerUpdateSchema,
     CustomerReadSchema,
+    CustomerUpdateResponse,
     CustomerListItem,
     CustomerFilterSchema,
     PaginationParams,
     PaginatedResponse,
     NIDValidationResponse,
+    NIDBatchValidationItem,
+    NIDBatchValidationResponse,
+    decode_cursor,
+    encode_cursor,
+)
+from app.services.count_service import (
+    cache_count,
+    count_cache_key,
+    count_rows,
+    get_cached_count,
 )
-from app.utils.validators import validate_dominican_nid
+from app.services.customer_cache import invalidate_customers, read_through_customer
+from app.services.nested_update import sync_addresses, sync_phones, sync_references
+from app.services.nid_index import nid_index
+from app.services.loan_list_view import refresh_loan_list_view
+from app.services.referral_service import detach_referrals, sync_referrals
+from app.utils.text_search import SIMILARITY_THRESHOLD, search_key
+from app.utils.validators import validate_dominican_nid, validate_dominican_nids
+
+nid_prefill_cache = LRUTTLCache(
+    maxsize=4096, ttl_seconds=settings.NID_PREFILL_CACHE_TTL_SECONDS
+)
+
+
+def _prefill_statement(nid: str):
+    """One row with everything the public form prefills for an existing NID."""
+    phone_number = (
+        select(Phone.number)
+        .where(Phone.phoneable_type == "Customer", Phone.phoneable_id == Customer.id)
+        .order_by(case((Phone.type == "mobile", 0), else_=1), Phone.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Customer.id,
+            CustomerDetail.first_name,
+            CustomerDetail.last_name,
+            CustomerDetail.email,
+            CustomerDetail.marital_status,
+            CustomerDetail.housing_possession_type,
+            CustomerDetail.housing_type,
+            CustomerDetail.education_level,
+            CustomerFinancialInfo.monthly_housing_payment,
+            CustomerJobInfo.occupation_type,
+            CustomerJobInfo.role,
+            CustomerJobInfo.salary,
+            CustomerJobInfo.payment_bank,
+            CustomerJobInfo.payment_frequency,
+            CustomerJobInfo.start_date,
+            Company.name.label("company_name"),
+            phone_number.label("mobile_phone"),
+        )
+        .outerjoin(CustomerDetail, CustomerDetail.customer_id == Customer.id)
+        .outerjoin(CustomerFinancialInfo, CustomerFinancialInfo.customer_id == Customer.id)
+        .outerjoin(CustomerJobInfo, CustomerJobInfo.customer_id == Customer.id)
+        .outerjoin(Company, Company.customer_id == Customer.id)
+        .where(Customer.nid == nid)
+    )
+
+
+async def _load_prefill(session: AsyncSession, nid: str) -> dict | None:
+    """Prefillable profile of the customer with ``nid``, or None if there is none."""
+    row = (await session.exec(_prefill_statement(nid))).first()
+    if row is None:
+        return None
+    return {
+        "first_name": row.first_name or "",
+        "last_name": row.last_name or "",
+        "email": row.email or "",
+        "mobile_phone": row.mobile_phone or "",
+        "marital_status": row.marital_status,
+        "housing_type": row.housing_possession_type or row.housing_type,
+        "housing_monthly_payment": row.monthly_housing_payment,
+        "education_level": row.education_level,
+        "occupation_type": row.occupation_type,
+        "role": row.role or "",
+        "company_name": row.company_name or "",
+        "salary": row.salary,
+        "payment_bank": row.payment_bank or "",
+        "payment_frequency": row.payment_frequency,
+        "employment_start_date": str(row.start_date) if row.start_date else "",
+    }
+
+
+def _invalid_nid_response(nid: str) -> NIDValidationResponse:
+    return NIDValidationResponse(
+        nid=nid,
+        is_valid=False,
+        is_unique=False,
+        message="Cédula no válida (dígito verificador incorrecto)"
+    )
 
 
-async def validate_nid(session: Session, nid: str) -> NIDValidationResponse:
+def _nid_response(cleaned_nid: str, customer_data: dict | None) -> NIDValidationResponse:
+    return NIDValidationResponse(
+        nid=cleaned_nid,
+        is_valid=True,
+        is_unique=customer_data is None,
+        message=None if customer_data is None else "Cliente ya registrado en el sistema",
+        existing_customer=customer_data,
+    )
+
+
+async def validate_nid(session: AsyncSession, nid: str) -> NIDValidationResponse:
     """
     Validate NID format/checksum and check uniqueness in database.
     If customer exists, returns prefillable profile data for public form.
@@ -55,73 +168,90 @@ async def validate_nid(session: Session, nid: str) -> NIDValidationResponse:
         NIDValidationResponse with validation results and optional customer details
     """
     # Validate format and JCE Modulo 10 checksum
-    is_valid = validate_dominican_nid(nid)
-
-    if not is_valid:
-        return NIDValidationResponse(
-            nid=nid,
-            is_valid=False,
-            is_unique=False,
-            message="Cédula no válida (dígito verificador incorrecto)"
-        )
+    if not validate_dominican_nid(nid):
+        return _invalid_nid_response(nid)
 
     # Clean NID for database lookup
     cleaned_nid = "".join(filter(str.isdigit, nid))
+    return _nid_response(cleaned_nid, await _load_prefill(session, cleaned_nid))
 
-    # Check uniqueness & fetch existing customer data
-    statement = select(Customer).where(Customer.nid == cleaned_nid)
-    existing_customer = session.exec(statement).first()
-
-    customer_data = None
-    if existing_customer:
-        detail = existing_customer.detail
-        job_info = existing_customer.job_info
-        company = existing_customer.company
-
-        # Query mobile phone or primary phone
-        phone_stmt = select(Phone).where(
-            Phone.phoneable_type == "Customer",
-            Phone.phoneable_id == existing_customer.id,
-            Phone.type == "mobile"
-        )
-        mobile_phone_record = session.exec(phone_stmt).first()
-        if not mobile_phone_record:
-            any_phone_stmt = select(Phone).where(
-                Phone.phoneable_type == "Customer",
-                Phone.phoneable_id == existing_customer.id
-            )
-            mobile_phone_record = session.exec(any_phone_stmt).first()
-
-        financial_info = existing_customer.financial_info
-        customer_data = {
-            "first_name": (detail.first_name if detail else "") or "",
-            "last_name": (detail.last_name if detail else "") or "",
-            "email": (detail.email if detail else "") or "",
-            "mobile_phone": mobile_phone_record.number if mobile_phone_record else "",
-            "marital_status": detail.marital_status if detail else None,
-            "housing_type": (detail.housing_possession_type or detail.housing_type) if detail else None,
-            "housing_monthly_payment": financial_info.monthly_housing_payment if (financial_info and financial_info.monthly_housing_payment is not None) else None,
-            "education_level": detail.education_level if detail else None,
-            "occupation_type": job_info.occupation_type if job_info else None,
-            "role": (job_info.role if job_info else "") or "",
-            "company_name": (company.name if company else "") or "",
-            "salary": job_info.salary if job_info else None,
-            "payment_bank": (job_info.payment_bank if job_info else "") or "",
-            "payment_frequency": job_info.payment_frequency if job_info else None,
-            "employment_start_date": str(job_info.start_date) if (job_info and job_info.start_date) else "",
-        }
 
-    return NIDValidationResponse(
-        nid=cleaned_nid,
-        is_valid=True,
-        is_unique=existing_customer is None,
-        message=None if existing_customer is None else "Cliente ya registrado en el sistema",
-        existing_customer=customer_data,
+async def validate_nid_public(session: AsyncSession, nid: str) -> NIDValidationResponse:
+    """
+    Same answer as validate_nid, for the public wizard's per-keystroke checks.
+
+    NIDs missing from the in-process NID index are answered without a query;
+    known ones read their prefill profile through a short-TTL cache. Writers
+    still use validate_nid, which always asks the database.
+
+    Args:
+        session: Database session
+        nid: National ID to validate
+
+    Returns:
+        NIDValidationResponse with validation results and optional customer details
+    """
+    if not validate_dominican_nid(nid):
+        return _invalid_nid_response(nid)
+
+    cleaned_nid = "".join(filter(str.isdigit, nid))
+    await nid_index.ensure_fresh(session)
+    if cleaned_nid not in nid_index:
+        return _nid_response(cleaned_nid, None)
+
+    customer_data = nid_prefill_cache.get(cleaned_nid)
+    if customer_data is MISSING:
+        customer_data = await _load_prefill(session, cleaned_nid)
+        # Misses are not cached: the index may know of a customer not committed yet
+        if customer_data is not None:
+            nid_prefill_cache.set(cleaned_nid, customer_data)
+    return _nid_response(cleaned_nid, customer_data)
+
+
+async def validate_nids_batch(session: AsyncSession, nids: list[str]) -> NIDBatchValidationResponse:
+    """
+    Validate many NIDs and find the customers already registered with them.
+
+    Checksums are computed in one pass; every valid NID is looked up with a
+    single query (``nid = ANY(:nids)`` on PostgreSQL, ``IN`` elsewhere).
+
+    Args:
+        session: Database session
+        nids: National IDs to validate (with or without dashes)
+
+    Returns:
+        NIDBatchValidationResponse with one result per submitted NID, in order
+    """
+    cleaned = validate_dominican_nids(nids)
+    lookup = sorted({nid for nid in cleaned if nid})
+
+    customer_ids: dict[str, int] = {}
+    if lookup:
+        if session.bind.dialect.name == "postgresql":
+            # One array parameter: a single cached plan whatever the batch size
+            condition = Customer.nid == any_(bindparam("nids", lookup, type_=ARRAY(String)))
+        else:
+            condition = Customer.nid.in_(lookup)
+        rows = (await session.exec(select(Customer.nid, Customer.id).where(condition))).all()
+        customer_ids = dict(rows)
+
+    results = [
+        NIDBatchValidationItem(
+            nid=nid,
+            is_valid=valid is not None,
+            customer_id=customer_ids.get(valid) if valid else None,
+        )
+        for nid, valid in zip(nids, cleaned)
+    ]
+    return NIDBatchValidationResponse(
+        results=results,
+        valid_count=sum(result.is_valid for result in results),
+        existing_count=sum(result.customer_id is not None for result in results),
     )
 
 
 async def create_customer_with_nested_data(
-    session: Session,
+    session: AsyncSession,
     customer_data: CustomerCreateSchema
 ) -> CustomerReadSchema:
     """
@@ -169,7 +299,8 @@ async def create_customer_with_nested_data(
             is_assigned=False,
         )
         session.add(customer)
-        session.flush()  # Get customer.id for nested data
+        nid_index.add(nid)
+        await session.flush()  # Get customer.id for nested data
 
         # Create customer detail (REQUIRED)
         detail = CustomerDetail(
@@ -251,7 +382,7 @@ async def create_customer_with_nested_data(
                 references=address_data.references,
             )
             session.add(address)
-            session.flush()  # Get address.id for pivot table
+            await session.flush()  # Get address.id for pivot table
 
             # Create pivot record
             addressable = Addressable(
@@ -261,11 +392,12 @@ async def create_customer_with_nested_data(
             )
             session.add(addressable)
 
-        session.commit()
+        await sync_referrals(session, written_ids=[customer.id])
+        await session.commit()
         return await get_customer_with_relations(session, customer.id)
 
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Failed to create customer: {str(e)}"
@@ -273,7 +405,7 @@ async def create_customer_with_nested_data(
 
 
 async def create_customer_simple(
-    session: Session,
+    session: AsyncSession,
     customer_data: CustomerSimpleCreateSchema
 ) -> CustomerReadSchema:
     """
@@ -318,7 +450,8 @@ async def create_customer_simple(
             is_assigned=False,
         )
         session.add(customer)
-        session.flush()
+        nid_index.add(nid)
+        await session.flush()
 
         # Create customer detail (REQUIRED)
         detail = CustomerDetail(
@@ -360,7 +493,7 @@ async def create_customer_simple(
                 references=address_data.references,
             )
             session.add(address)
-            session.flush()
+            await session.flush()
 
             addressable = Addressable(
                 address_id=address.id,
@@ -369,11 +502,12 @@ async def create_customer_simple(
             )
             session.add(addressable)
 
-        session.commit()
+        await sync_referrals(session, written_ids=[customer.id])
+        await session.commit()
         return await get_customer_with_relations(session, customer.id)
 
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Failed to create customer: {str(e)}"
@@ -381,78 +515,134 @@ async def create_customer_simple(
 
 
 async def get_customer_model_with_relations(
-    session: Session,
+    session: AsyncSession,
     customer_id: int
 ) -> Customer | None:
     """
     Get customer model by ID with all relationships eagerly loaded.
     INTERNAL USE ONLY (returns SQLModel instance).
+
+    Everything comes back in one statement: the one-to-one relations and the
+    two small collections (references, accounts) are LEFT JOINed. A customer
+    has a handful of each, so the joined row product stays small.
+
+    populate_existing refreshes instances already in the identity map, so
+    callers see their own committed changes (sessions don't expire on commit).
     """
-    statement = select(Customer).where(Customer.id == customer_id)
-    customer = session.exec(statement).first()
+    statement = (
+        select(Customer)
+        .where(Customer.id == customer_id)
+        .options(
+            joinedload(Customer.detail),
+            joinedload(Customer.financial_info),
+            joinedload(Customer.job_info),
+            joinedload(Customer.vehicle),
+            joinedload(Customer.company),
+            joinedload(Customer.references),
+            joinedload(Customer.accounts),
+        )
+        .execution_options(populate_existing=True)
+    )
+    return (await session.exec(statement)).unique().first()
+
+
+async def load_phones(
+    session: AsyncSession,
+    phoneable_type: str,
+    phoneable_ids: Sequence[int],
+) -> dict[int, list[Phone]]:
+    """Load polymorphic phones for many owners in one query, grouped by owner ID."""
+    phones: dict[int, list[Phone]] = {owner_id: [] for owner_id in phoneable_ids}
+    if not phoneable_ids:
+        return phones
+    statement = select(Phone).where(
+        Phone.phoneable_type == phoneable_type,
+        Phone.phoneable_id.in_(phoneable_ids)
+    ).order_by(Phone.id).execution_options(populate_existing=True)
+    for phone in (await session.exec(statement)).all():
+        phones[phone.phoneable_id].append(phone)
+    return phones
+
+
+async def load_addresses(
+    session: AsyncSession,
+    addressable_type: str,
+    addressable_ids: Sequence[int],
+) -> dict[int, list[Address]]:
+    """Load polymorphic addresses (via the pivot) for many owners in one query."""
+    addresses: dict[int, list[Address]] = {owner_id: [] for owner_id in addressable_ids}
+    if not addressable_ids:
+        return addresses
+    statement = select(Addressable.addressable_id, Address).join(
+        Address, Address.id == Addressable.address_id
+    ).where(
+        Addressable.addressable_type == addressable_type,
+        Addressable.addressable_id.in_(addressable_ids)
+    ).order_by(Address.id).execution_options(populate_existing=True)
+    for owner_id, address in (await session.exec(statement)).all():
+        addresses[owner_id].append(address)
+    return addresses
+
 
-    if customer:
-        # Load relationships (SQLAlchemy lazy load)
-        _ = customer.detail
-        _ = customer.financial_info
-        _ = customer.job_info
-        _ = customer.references
-        _ = customer.vehicle
-        _ = customer.company
-        _ = customer.accounts
-        return customer
+async def _build_customer_read(
+    session: AsyncSession,
+    customer: Customer
+) -> CustomerReadSchema:
+    """
+    Build the API response for a customer loaded by
+    get_customer_model_with_relations. Adds the polymorphic phones and
+    addresses (one query each).
+    """
+    phones = await load_phones(session, "Customer", [customer.id])
+    addresses = await load_addresses(session, "Customer", [customer.id])
 
-    return None
+    # Return as schema to avoid issues with extra attribute assignment on SQLModel
+    return CustomerReadSchema(
+        **customer.model_dump(),
+        detail=customer.detail,
+        phones=phones[customer.id],
+        addresses=addresses[customer.id],
+        financial_info=customer.financial_info,
+        job_info=customer.job_info,
+        company=customer.company,
+        accounts=customer.accounts,
+        references=customer.references,
+        vehicle=customer.vehicle
+    )
 
 
 async def get_customer_with_relations(
-    session: Session,
+    session: AsyncSession,
     customer_id: int
 ) -> CustomerReadSchema | None:
     """
     Get customer by ID with all relationships eagerly loaded for API response.
+
+    Three round trips: the customer aggregate, its phones, its addresses.
     """
     customer = await get_customer_model_with_relations(session, customer_id)
 
     if not customer:
         return None
 
-    # Manually load polymorphic phones
-    phones_stmt = select(Phone).where(
-        Phone.phoneable_type == "Customer",
-        Phone.phoneable_id == customer.id
-    )
-    phones = session.exec(phones_stmt).all()
+    return await _build_customer_read(session, customer)
 
-    # Manually load polymorphic addresses (via pivot)
-    addresses_stmt = select(Address).join(
-        Addressable, Address.id == Addressable.address_id
-    ).where(
-        Addressable.addressable_type == "Customer",
-        Addressable.addressable_id == customer.id
-    )
-    addresses = session.exec(addresses_stmt).all()
 
-    # Return as schema to avoid issues with extra attribute assignment on SQLModel
-    return CustomerReadSchema(
-        **customer.model_dump(),
-        detail=customer.detail,
-        phones=phones,
-        addresses=addresses,
-        financial_info=customer.financial_info,
-        job_info=customer.job_info,
-        company=customer.company,
-        accounts=customer.accounts,
-        references=customer.references,
-        vehicle=customer.vehicle
+async def get_customer_cached(
+    session: AsyncSession,
+    customer_id: int
+) -> CustomerReadSchema | None:
+    """get_customer_with_relations served through the versioned customer cache."""
+    return await read_through_customer(
+        customer_id, lambda: get_customer_with_relations(session, customer_id)
     )
 
 
 async def update_customer(
-    session: Session,
+    session: AsyncSession,
     customer_id: int,
     customer_data: CustomerUpdateSchema
-) -> CustomerReadSchema | None:
+) -> CustomerUpdateResponse | None:
     """
     Update customer with partial data support.
 
@@ -462,14 +652,15 @@ async def update_customer(
         customer_data: Update data (all fields optional)
 
     Returns:
-        Updated Customer instance or None if not found
+        Updated customer with per-collection changes, or None if not found
 
     Raises:
         HTTPException: 400 for validation errors
 
     Note:
         Only provided fields will be updated.
-        Nested entities will be updated/replaced if provided.
+        Submitted phones, addresses and references replace the stored ones,
+        but are diffed against them so unchanged rows keep their IDs.
     """
     customer = await get_customer_model_with_relations(session, customer_id)
 
@@ -481,10 +672,20 @@ async def update_customer(
         update_data = customer_data.model_dump(
             exclude_unset=True, exclude_none=True)
 
+        # A new NID or referrer re-resolves the referral links around the customer
+        stale_referrers: set[int] = set()
+        if any(
+            field in update_data and update_data[field] != getattr(customer, field)
+            for field in ("nid", "referred_by")
+        ):
+            stale_referrers = await detach_referrals(session, customer.id)
+
         for field, value in update_data.items():
             if field not in ["detail", "phones", "addresses", "financial_info",
                              "job_info", "references", "company", "vehicle", "accounts"]:
                 setattr(customer, field, value)
+        # Incremental jobs (duplicate detection) pick up changed customers by this
+        customer.updated_at = datetime.utcnow()
 
         # Update nested entities if provided
         if customer_data.detail:
@@ -542,138 +743,94 @@ async def update_customer(
                 )
                 session.add(vehicle)
 
-        # Update phones (replace all)
+        # Nested collections: diff against the stored rows (see nested_update)
+        changes = {}
         if customer_data.phones is not None:
-            # Delete existing phones
-            existing_phones_stmt = select(Phone).where(
-                Phone.phoneable_type == "Customer",
-                Phone.phoneable_id == customer.id
+            existing_phones = await load_phones(session, "Customer", [customer.id])
+            changes["phones"] = await sync_phones(
+                session, "Customer", customer.id, existing_phones[customer.id],
+                [phone.model_dump() for phone in customer_data.phones],
             )
-            existing_phones = session.exec(existing_phones_stmt).all()
-            for p in existing_phones:
-                session.delete(p)
-
-            # Add new phones
-            for phone_data in customer_data.phones:
-                new_phone = Phone(
-                    number=phone_data.number,
-                    type=phone_data.type,
-                    country_area=phone_data.country_area,
-                    extension=phone_data.extension,
-                    phoneable_type="Customer",
-                    phoneable_id=customer.id
-                )
-                session.add(new_phone)
 
-        # Update addresses (replace all)
         if customer_data.addresses is not None:
-            # Delete existing addressable pivots first, then delete addresses
-            existing_pivots_stmt = select(Addressable).where(
-                Addressable.addressable_type == "Customer",
-                Addressable.addressable_id == customer.id
+            existing_addresses = await load_addresses(session, "Customer", [customer.id])
+            changes["addresses"] = await sync_addresses(
+                session, "Customer", customer.id, existing_addresses[customer.id],
+                [address.model_dump() for address in customer_data.addresses],
             )
-            existing_pivots = session.exec(existing_pivots_stmt).all()
-
-            address_ids_to_delete = [p.address_id for p in existing_pivots]
-
-            # 1. Delete pivot records first to avoid ForeignKeyViolation
-            for pivot in existing_pivots:
-                session.delete(pivot)
-            session.flush()
-
-            # 2. Delete address records after pivots are removed
-            for addr_id in address_ids_to_delete:
-                addr = session.get(Address, addr_id)
-                if addr:
-                    session.delete(addr)
-            session.flush()
-
-            # Add new addresses
-            for address_data in customer_data.addresses:
-                new_address = Address(
-                    street=address_data.street,
-                    street2=address_data.street2,
-                    city=address_data.city,
-                    state=address_data.state,
-                    type=address_data.type,
-                    postal_code=address_data.postal_code,
-                    country=address_data.country,
-                    references=address_data.references,
-                )
-                session.add(new_address)
-                session.flush()
-
-                new_pivot = Addressable(
-                    address_id=new_address.id,
-                    addressable_type="Customer",
-                    addressable_id=customer.id
-                )
-                session.add(new_pivot)
 
-        # Update references (replace all)
         if customer_data.references is not None:
-            # Delete existing references
-            existing_refs_stmt = select(CustomerReference).where(
-                CustomerReference.customer_id == customer.id
+            changes["references"] = await sync_references(
+                session, customer.id, customer.references,
+                [reference.model_dump() for reference in customer_data.references],
             )
-            existing_refs = session.exec(existing_refs_stmt).all()
-            for r in existing_refs:
-                session.delete(r)
-
-            # Add new references
-            for ref_data in customer_data.references:
-                new_ref = CustomerReference(
-                    customer_id=customer.id,
-                    **ref_data.model_dump()
-                )
-                session.add(new_ref)
 
-        session.commit()
+        if stale_referrers:
+            await sync_referrals(session, [customer.id], stale_referrers, written_ids=[customer.id])
+        # Name, company and bank are shown on every loan row of the customer
+        if any(part is not None for part in (
+            customer_data.detail, customer_data.company, customer_data.job_info
+        )):
+            await refresh_loan_list_view(session, customer_ids=[customer.id])
+        await session.commit()
+        await invalidate_customers(customer_id)
 
-        return await get_customer_with_relations(session, customer_id)
+        updated = await get_customer_with_relations(session, customer_id)
+        # dict() keeps the already-validated nested models (no alias round trip)
+        return CustomerUpdateResponse(**dict(updated), changes=changes)
 
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Failed to update customer: {str(e)}"
         )
 
 
-async def search_customers(
-    session: Session,
-    filters: CustomerFilterSchema,
-    pagination: PaginationParams
-) -> PaginatedResponse[CustomerListItem]:
-    """
-    Search customers with filtering and pagination.
-
-    Args:
-        session: Database session
-        filters: Filter criteria
-        pagination: Pagination parameters
+def _name_search_keys():
+    """Accent-insensitive keys of the searchable name columns (GIN-indexed on PostgreSQL)."""
+    return [
+        func.search_key(CustomerDetail.first_name),
+        func.search_key(CustomerDetail.last_name),
+        func.search_key(CustomerDetail.nickname),
+    ]
 
-    Returns:
-        PaginatedResponse with customer list items
 
-    Note:
-        Supports filtering by: NID, name, email, portfolio, promoter, active status
-        Results are sorted by created_at DESC by default
+def _name_match(name: str, dialect_name: str):
     """
-    # Build base query
-    statement = select(Customer).join(CustomerDetail, isouter=True)
+    Fuzzy name condition: a substring or trigram-similar match on any name column.
 
-    # Apply filters
+    PostgreSQL uses the ``%`` operator so the trigram indexes serve the query;
+    elsewhere the registered Python ``similarity`` function is compared to
+    pg_trgm's default threshold.
+    """
+    term = search_key(name)
+    conditions = []
+    for key in _name_search_keys():
+        conditions.append(key.contains(term))
+        if dialect_name == "postgresql":
+            conditions.append(key.op("%")(term))
+        else:
+            conditions.append(func.similarity(key, term) >= SIMILARITY_THRESHOLD)
+    return or_(*conditions)
+
+
+def _name_rank(name: str, dialect_name: str):
+    """Best similarity between the search term and any name column."""
+    term = search_key(name)
+    scores = [func.coalesce(func.similarity(key, term), 0) for key in _name_search_keys()]
+    # SQLite spells GREATEST as the multi-argument max()
+    greatest = func.greatest if dialect_name == "postgresql" else func.max
+    return greatest(*scores)
+
+
+def _apply_customer_filters(statement, filters: CustomerFilterSchema, dialect_name: str):
+    """Apply CustomerFilterSchema criteria to a statement joined to CustomerDetail."""
     if filters.nid:
         statement = statement.where(Customer.nid.contains(filters.nid))
 
     if filters.name:
-        statement = statement.where(
-            or_(
-                CustomerDetail.first_name.contains(filters.name),
-                CustomerDetail.last_name.contains(filters.name)
-            )
-        )
+        statement = statement.where(_name_match(filters.name, dialect_name))
 
     if filters.email:
         statement = statement.where(
@@ -690,51 +847,233 @@ async def search_customers(
     if filters.is_active is not None:
         statement = statement.where(Customer.is_active == filters.is_active)
 
-    # Get total count
-    count_statement = select(func.count()).select_from(statement.subquery())
-    total = session.exec(count_statement).one()
+    return statement
 
-    # Apply pagination and sorting (ID DESC guarantees newest created record is first)
+
+async def search_customers(
+    session: AsyncSession,
+    filters: CustomerFilterSchema,
+    pagination: PaginationParams
+) -> PaginatedResponse[CustomerListItem]:
+    """
+    Search customers with filtering and pagination.
+
+    Args:
+        session: Database session
+        filters: Filter criteria
+        pagination: Pagination parameters
+
+    Returns:
+        PaginatedResponse with customer list items
+
+    Note:
+        Supports filtering by: NID, name, email, portfolio, promoter, active status
+        Results are sorted by created_at DESC by default. Name search is
+        accent-insensitive and fuzzy (first name, last name, nickname); its
+        pages are ranked by similarity and paged by offset only, so they
+        carry no next_cursor (an id cursor cannot resume a ranked order).
+    """
+    # Project only the list columns so each page is a single statement. On
+    # offset pages the window count rides along with the rows instead of a
+    # separate COUNT query; a keyset seek would skew it, so cursors count apart.
+    try:
+        after_id = decode_cursor(pagination.cursor) if pagination.cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    dialect_name = session.bind.dialect.name
+    count_key = count_cache_key("customers", filters.model_dump())
+    cached_total = get_cached_count(count_key)
+
+    columns = [
+        Customer.id,
+        Customer.nid,
+        Customer.is_active,
+        Customer.is_assigned,
+        Customer.portfolio_id,
+        Customer.promoter_id,
+        Customer.created_at,
+        CustomerDetail.first_name,
+        CustomerDetail.last_name,
+        CustomerDetail.email,
+    ]
+    window_total = (
+        pagination.include_total
+        and pagination.count == "exact"
+        and cached_total is None
+        and after_id is None
+    )
+    if window_total:
+        columns.append(func.count().over().label("total"))
+
+    statement = _apply_customer_filters(
+        select(*columns).join(CustomerDetail, isouter=True), filters, dialect_name
+    )
+
+    # ID DESC guarantees newest created record is first and gives a stable keyset.
+    # Offset pages of a name search put the closest matches first.
+    ranked = bool(filters.name) and after_id is None
+    if ranked:
+        statement = statement.order_by(_name_rank(filters.name, dialect_name).desc())
     statement = statement.order_by(Customer.id.desc())
-    statement = statement.offset((pagination.page - 1) * pagination.per_page)
-    statement = statement.limit(pagination.per_page)
-
-    # Execute query
-    customers = session.exec(statement).all()
-
-    # Convert to list items
-    items = []
-    for customer in customers:
-        full_name = ""
-        email = None
-        if customer.detail:
-            full_name = f"{customer.detail.first_name} {customer.detail.last_name}"
-            email = customer.detail.email
-
-        items.append(
-            CustomerListItem(
-                id=customer.id,
-                nid=customer.nid,
-                full_name=full_name,
-                email=email,
-                is_active=customer.is_active,
-                is_assigned=customer.is_assigned,
-                portfolio_id=customer.portfolio_id,
-                promoter_id=customer.promoter_id,
-                created_at=customer.created_at,
-            )
+    if after_id is not None:
+        statement = statement.where(Customer.id < after_id)
+    else:
+        statement = statement.offset((pagination.page - 1) * pagination.per_page)
+    # One extra row tells whether there is a next page
+    statement = statement.limit(pagination.per_page + 1)
+
+    rows = (await session.exec(statement)).all()
+    has_more = len(rows) > pagination.per_page
+    rows = rows[:pagination.per_page]
+
+    total = None
+    total_is_estimate = False
+    if window_total and rows:
+        total = rows[0].total
+        cache_count(count_key, total)
+    elif pagination.include_total:
+        # Cached or estimated totals, cursor pages, or an offset past the
+        # end with no row to carry the count
+        total, total_is_estimate = await count_rows(
+            session,
+            _apply_customer_filters(
+                select(Customer.id).join(CustomerDetail, isouter=True), filters, dialect_name
+            ),
+            key=count_key,
+            table_name=Customer.__tablename__,
+            filtered=bool(filters.model_dump(exclude_none=True)),
+            mode=pagination.count,
         )
 
+    items = [
+        CustomerListItem(
+            id=row.id,
+            nid=row.nid,
+            full_name=(
+                f"{row.first_name} {row.last_name}" if row.first_name is not None else ""
+            ),
+            email=row.email,
+            is_active=row.is_active,
+            is_assigned=row.is_assigned,
+            portfolio_id=row.portfolio_id,
+            promoter_id=row.promoter_id,
+            created_at=row.created_at,
+        )
+        for row in rows
+    ]
+
     return PaginatedResponse.create(
         items=items,
         total=total,
         page=pagination.page,
         per_page=pagination.per_page,
+        next_cursor=encode_cursor(rows[-1].id) if has_more and not ranked else None,
+        total_is_estimate=total_is_estimate,
+    )
+
+
+EXPORT_COLUMNS = (
+    Customer.id,
+    Customer.nid,
+    CustomerDetail.first_name,
+    CustomerDetail.last_name,
+    CustomerDetail.email,
+    Customer.is_active,
+    Customer.is_assigned,
+    Customer.portfolio_id,
+    Customer.promoter_id,
+    Customer.created_at,
+)
+# Rows fetched per server-side cursor round trip, and encoded per chunk
+EXPORT_BATCH_SIZE = 1000
+_EXPORT_KEYS = tuple(column.key for column in EXPORT_COLUMNS)
+_export_json_encoder = json.JSONEncoder(default=datetime.isoformat, ensure_ascii=False)
+
+
+def _export_csv_chunk(rows: Sequence, header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(_EXPORT_KEYS)
+    writer.writerows(
+        ("" if value is None else value.isoformat() if isinstance(value, datetime) else value
+         for value in row)
+        for row in rows
     )
+    return buffer.getvalue().encode()
+
+
+def _export_ndjson_chunk(rows: Sequence) -> bytes:
+    encode = _export_json_encoder.encode
+    return "".join(encode(dict(zip(_EXPORT_KEYS, row))) + "\n" for row in rows).encode()
+
+
+async def stream_customer_export(
+    session: AsyncSession,
+    filters: CustomerFilterSchema,
+    export_format: Literal["csv", "ndjson"],
+) -> AsyncIterator[bytes]:
+    """
+    Stream every customer matching ``filters`` as CSV or NDJSON, oldest first.
+
+    Rows come through a server-side cursor EXPORT_BATCH_SIZE at a time and
+    each batch is encoded and yielded before the next is fetched, so memory
+    stays flat whatever the number of customers.
+
+    Args:
+        session: Database session (must stay open while the body is sent)
+        filters: Same filters as the customer list
+        export_format: "csv" (with a header row) or "ndjson"
+
+    Yields:
+        Encoded chunks of the export body
+    """
+    statement = _apply_customer_filters(
+        select(*EXPORT_COLUMNS).join(CustomerDetail, isouter=True),
+        filters,
+        session.bind.dialect.name,
+    ).order_by(Customer.id)
+
+    if export_format == "csv":
+        yield _export_csv_chunk([], header=True)
+    result = await session.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    async for rows in result.partitions():
+        if export_format == "csv":
+            yield _export_csv_chunk(rows)
+        else:
+            yield _export_ndjson_chunk(rows)
+
+
+async def _ensure_assignment_targets(
+    session: AsyncSession,
+    portfolio_id: int | None,
+    promoter_id: int | None,
+) -> None:
+    """Raise 404 if the portfolio or promoter to assign does not exist."""
+    if portfolio_id is not None:
+        portfolio = (await session.exec(
+            select(Portfolio.id).where(Portfolio.id == portfolio_id)
+        )).first()
+        if portfolio is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Portfolio with ID {portfolio_id} not found"
+            )
+
+    if promoter_id is not None:
+        promoter = (await session.exec(
+            select(Promoter.id).where(Promoter.id == promoter_id)
+        )).first()
+        if promoter is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Promoter with ID {promoter_id} not found"
+            )
 
 
 async def assign_customer_to_portfolio(
-    session: Session,
+    session: AsyncSession,
     customer_id: int,
     portfolio_id: int | None = None,
     promoter_id: int | None = None
@@ -759,26 +1098,7 @@ async def assign_customer_to_portfolio(
         Sets is_assigned=True and assigned_at timestamp.
         Validates that portfolio/promoter exist before assignment.
     """
-    # Validate Portfolio exists
-    if portfolio_id is not None:
-        portfolio_statement = select(Portfolio).where(
-            Portfolio.id == portfolio_id)
-        portfolio = session.exec(portfolio_statement).first()
-        if not portfolio:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Portfolio with ID {portfolio_id} not found"
-            )
-
-    # Validate Promoter exists
-    if promoter_id is not None:
-        promoter_statement = select(Promoter).where(Promoter.id == promoter_id)
-        promoter = session.exec(promoter_statement).first()
-        if not promoter:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Promoter with ID {promoter_id} not found"
-            )
+    await _ensure_assignment_targets(session, portfolio_id, promoter_id)
 
     customer = await get_customer_model_with_relations(session, customer_id)
 
@@ -786,8 +1106,6 @@ async def assign_customer_to_portfolio(
         return None
 
     try:
-        from datetime import datetime, timezone
-
         if portfolio_id is not None:
             customer.portfolio_id = portfolio_id
 
@@ -799,13 +1117,74 @@ async def assign_customer_to_portfolio(
             customer.is_assigned = True
             customer.assigned_at = datetime.now(timezone.utc)
 
-        session.commit()
+        await session.commit()
+        await invalidate_customers(customer_id)
 
-        return await get_customer_with_relations(session, customer_id)
+        # Only scalar columns changed; the loaded relations are still current
+        return await _build_customer_read(session, customer)
 
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"Failed to assign customer: {str(e)}"
         )
+
+
+async def bulk_assign_customers(
+    session: AsyncSession,
+    data: CustomerBulkAssignSchema,
+) -> CustomerBulkAssignResponse:
+    """
+    Assign many customers to a portfolio and/or promoter in one UPDATE.
+
+    Customers are selected by ID list or by the customer list filters and
+    are never loaded; only the IDs of the updated rows come back, to bump
+    their cache versions.
+
+    Args:
+        session: Database session
+        data: Selection plus the portfolio/promoter to assign
+
+    Returns:
+        Number of customers updated (and of listed IDs that do not exist)
+
+    Raises:
+        HTTPException: 404 if portfolio or promoter not found
+        HTTPException: 400 for other errors
+    """
+    await _ensure_assignment_targets(session, data.portfolio_id, data.promoter_id)
+
+    values = {"is_assigned": True, "assigned_at": datetime.now(timezone.utc)}
+    if data.portfolio_id is not None:
+        values["portfolio_id"] = data.portfolio_id
+    if data.promoter_id is not None:
+        values["promoter_id"] = data.promoter_id
+
+    if data.customer_ids is not None:
+        selection = Customer.id.in_(set(data.customer_ids))
+    else:
+        selection = Customer.id.in_(_apply_customer_filters(
+            select(Customer.id).join(CustomerDetail, isouter=True),
+            data.filters, session.bind.dialect.name,
+        ))
+
+    try:
+        updated_ids = (await session.exec(
+            update(Customer)
+            .where(selection)
+            .values(**values)
+            .returning(Customer.id)
+            .execution_options(synchronize_session=False)
+        )).scalars().all()
+        await session.commit()
+    except Exception as e:
+        await session.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Failed to assign customers: {str(e)}"
+        )
+
+    await invalidate_customers(*updated_ids)
+    not_found = len(set(data.customer_ids)) - len(updated_ids) if data.customer_ids is not None else 0
+    return CustomerBulkAssignResponse(updated_count=len(updated_ids), not_found_count=not_found)
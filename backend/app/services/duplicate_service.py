@@ -0,0 +1,454 @@
+"""
+Duplicate service - Find customers that are probably the same person.
+
+The public form, the SoliPres CSV import and manual entry each create
+customers, and the same person often ends up twice under a mistyped NID.
+The job never compares every customer with every other one:
+
+1. Blocking: every customer gets a few keys (normalized phone numbers,
+   lowercased email, Soundex of first + last name). Only customers sharing
+   a key are compared, and blocks larger than BLOCK_MAX_SIZE (a company
+   switchboard, "María Rodríguez") are skipped as too unspecific.
+2. Scoring: each candidate pair is scored from shared phones, equal emails,
+   trigram similarity of the full names and NIDs one typo apart. Pairs
+   scoring at least MIN_SCORE are written to customer_duplicate_candidates
+   for review.
+
+Each scan stores the keys of the customers it examined in
+customer_blocking_keys. Incremental runs select only the customers changed
+since the last finished scan (customer, detail or phone rows written after
+it started), refresh their keys, and load just the blocks holding those
+keys from the indexed table, so their cost follows the changed rows rather
+than the customer count. Reviewed pairs (confirmed or dismissed) are never rewritten; the
+review API below lists pending pairs and records decisions.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import combinations
+from typing import Iterable, Iterator
+
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, delete, func, insert, or_, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.customer import Customer, CustomerDetail
+from app.models.customer_duplicate import (
+    CustomerBlockingKey,
+    CustomerDuplicateCandidate,
+    CustomerDuplicateScan,
+    DuplicateStatus,
+)
+from app.models.phone import Phone
+from app.schemas.customer import CustomerDuplicateRead, PaginatedResponse
+from app.utils.text_search import search_key, similarity, soundex
+
+logger = logging.getLogger(__name__)
+
+BLOCK_MAX_SIZE = 50
+MIN_SCORE = 0.5
+WEIGHTS = {"phone": 0.35, "email": 0.35, "name": 0.3, "nid": 0.2}
+# Name similarity counts only from here up (pg_trgm's default threshold)
+NAME_SIMILARITY_FLOOR = 0.3
+FETCH_BATCH = 1000
+
+
+def normalize_phone(number: str | None) -> str | None:
+    """Last 10 digits of a phone number ("+1 (809) 555-0000" -> "8095550000")."""
+    digits = "".join(c for c in number or "" if c.isdigit())
+    return digits[-10:] if len(digits) >= 7 else None
+
+
+def normalize_email(email: str | None) -> str | None:
+    email = (email or "").strip().lower()
+    return email or None
+
+
+def is_nid_typo(left: str, right: str) -> bool:
+    """True if two NIDs differ by one digit or by two swapped adjacent digits."""
+    if len(left) != len(right) or left == right:
+        return False
+    diffs = [i for i, (a, b) in enumerate(zip(left, right)) if a != b]
+    if len(diffs) == 1:
+        return True
+    return (
+        len(diffs) == 2
+        and diffs[1] == diffs[0] + 1
+        and left[diffs[0]] == right[diffs[1]]
+        and left[diffs[1]] == right[diffs[0]]
+    )
+
+
+def blocking_keys(
+    first_name: str | None,
+    last_name: str | None,
+    email: str | None,
+    phones: Iterable[str],
+) -> set[str]:
+    keys = {f"phone:{phone}" for phone in phones}
+    if email := normalize_email(email):
+        keys.add(f"email:{email}")
+    first, last = soundex(first_name), soundex(last_name)
+    if first and last:
+        keys.add(f"name:{first}{last}")
+    return keys
+
+
+@dataclass
+class CustomerSignature:
+    """What a customer is compared on."""
+
+    id: int
+    nid: str
+    name: str
+    email: str | None
+    phones: set[str] = field(default_factory=set)
+
+
+def score_pair(left: CustomerSignature, right: CustomerSignature) -> tuple[float, list[str]]:
+    """Score in 0..1 and the signals that matched."""
+    matched = []
+    score = 0.0
+    if left.phones & right.phones:
+        matched.append("phone")
+        score += WEIGHTS["phone"]
+    if left.email and left.email == right.email:
+        matched.append("email")
+        score += WEIGHTS["email"]
+    name_similarity = similarity(left.name, right.name) if left.name and right.name else 0.0
+    if name_similarity >= NAME_SIMILARITY_FLOOR:
+        matched.append("name")
+        score += WEIGHTS["name"] * name_similarity
+    if is_nid_typo(left.nid, right.nid):
+        matched.append("nid")
+        score += WEIGHTS["nid"]
+    return round(min(score, 1.0), 4), matched
+
+
+def _full_name(first_name: str | None, last_name: str | None) -> str:
+    return search_key(" ".join(part for part in (first_name, last_name) if part)) or ""
+
+
+def _chunks(values: list) -> Iterator[list]:
+    for start in range(0, len(values), FETCH_BATCH):
+        yield values[start:start + FETCH_BATCH]
+
+
+def _customer_rows(session: Session, ids: list[int] | None = None):
+    statement = select(
+        Customer.id,
+        Customer.nid,
+        Customer.updated_at,
+        CustomerDetail.first_name,
+        CustomerDetail.last_name,
+        CustomerDetail.email,
+        CustomerDetail.updated_at.label("detail_updated_at"),
+    ).join(CustomerDetail, isouter=True)
+    if ids is not None:
+        statement = statement.where(Customer.id.in_(ids))
+    return session.exec(statement.execution_options(yield_per=FETCH_BATCH))
+
+
+def _phone_rows(session: Session, ids: list[int] | None = None):
+    statement = select(Phone.phoneable_id, Phone.number, Phone.updated_at).where(
+        Phone.phoneable_type == "Customer"
+    )
+    if ids is not None:
+        statement = statement.where(Phone.phoneable_id.in_(ids))
+    return session.exec(statement.execution_options(yield_per=FETCH_BATCH))
+
+
+def _changed_customer_ids(session: Session, since: datetime) -> set[int]:
+    """Customers whose row, detail or phones were written at or after ``since``."""
+    changed = set(session.exec(
+        select(Customer.id)
+        .join(CustomerDetail, isouter=True)
+        .where(or_(Customer.updated_at >= since, CustomerDetail.updated_at >= since))
+    ).all())
+    changed.update(session.exec(
+        select(Phone.phoneable_id).where(
+            Phone.phoneable_type == "Customer", Phone.updated_at >= since
+        )
+    ).all())
+    return changed
+
+
+def _compute_keys(session: Session, ids: list[int] | None = None) -> dict[int, set[str]]:
+    """Blocking keys of the given customers (all of them when None)."""
+    phones: dict[int, set[str]] = {}
+    for customer_id, number, _ in _phone_rows(session, ids):
+        if phone := normalize_phone(number):
+            phones.setdefault(customer_id, set()).add(phone)
+    return {
+        row.id: blocking_keys(row.first_name, row.last_name, row.email, phones.pop(row.id, ()))
+        for row in _customer_rows(session, ids)
+    }
+
+
+def _store_keys(session: Session, keys: dict[int, set[str]], replace_all: bool = False) -> None:
+    """Replace the stored blocking keys of ``keys``' customers (of everyone with ``replace_all``)."""
+    if replace_all:
+        session.exec(delete(CustomerBlockingKey))
+    else:
+        for chunk in _chunks(sorted(keys)):
+            session.exec(delete(CustomerBlockingKey).where(CustomerBlockingKey.customer_id.in_(chunk)))
+    rows = [
+        {"customer_id": customer_id, "key": key}
+        for customer_id, customer_keys in keys.items()
+        for key in customer_keys
+    ]
+    for chunk in _chunks(rows):
+        session.exec(insert(CustomerBlockingKey), params=chunk)
+
+
+def _candidate_pairs(session: Session, since: datetime | None) -> tuple[set[tuple[int, int]], set[int]]:
+    """Pairs sharing a blocking key (involving a changed customer), and the changed IDs."""
+    blocks: dict[str, set[int]] = {}
+    if since is None:
+        keys = _compute_keys(session)
+        changed = set(keys)
+        _store_keys(session, keys, replace_all=True)
+        for customer_id, customer_keys in keys.items():
+            for key in customer_keys:
+                blocks.setdefault(key, set()).add(customer_id)
+    else:
+        changed = _changed_customer_ids(session, since)
+        keys = {}
+        for chunk in _chunks(sorted(changed)):
+            keys.update(_compute_keys(session, chunk))
+        _store_keys(session, keys)
+        # Whole blocks of the changed customers' keys, block mates included
+        for chunk in _chunks(sorted(set().union(*keys.values()))):
+            for customer_id, key in session.exec(
+                select(CustomerBlockingKey.customer_id, CustomerBlockingKey.key)
+                .where(CustomerBlockingKey.key.in_(chunk))
+            ):
+                blocks.setdefault(key, set()).add(customer_id)
+
+    pairs: set[tuple[int, int]] = set()
+    for key, ids in blocks.items():
+        if len(ids) < 2:
+            continue
+        if len(ids) > BLOCK_MAX_SIZE:
+            logger.info(f"Duplicate scan skipped block {key!r} ({len(ids)} customers)")
+            continue
+        for left, right in combinations(sorted(ids), 2):
+            if since is None or left in changed or right in changed:
+                pairs.add((left, right))
+    return pairs, changed
+
+
+def _load_signatures(session: Session, ids: set[int]) -> dict[int, CustomerSignature]:
+    signatures: dict[int, CustomerSignature] = {}
+    for chunk in _chunks(sorted(ids)):
+        for row in _customer_rows(session, chunk):
+            signatures[row.id] = CustomerSignature(
+                id=row.id,
+                nid=row.nid,
+                name=_full_name(row.first_name, row.last_name),
+                email=normalize_email(row.email),
+            )
+        for customer_id, number, _ in _phone_rows(session, chunk):
+            if (phone := normalize_phone(number)) and customer_id in signatures:
+                signatures[customer_id].phones.add(phone)
+    return signatures
+
+
+def _existing_candidates(
+    session: Session, ids: set[int] | None
+) -> dict[tuple[int, int], CustomerDuplicateCandidate]:
+    """Stored candidates involving ``ids`` (all of them when None)."""
+    statement = select(CustomerDuplicateCandidate)
+    if ids is None:
+        batches = [session.exec(statement).all()]
+    else:
+        batches = (
+            session.exec(statement.where(or_(
+                CustomerDuplicateCandidate.customer_id.in_(chunk),
+                CustomerDuplicateCandidate.duplicate_customer_id.in_(chunk),
+            ))).all()
+            for chunk in _chunks(sorted(ids))
+        )
+    return {
+        (candidate.customer_id, candidate.duplicate_customer_id): candidate
+        for batch in batches
+        for candidate in batch
+    }
+
+
+def find_duplicate_customers(session: Session, full: bool = False) -> CustomerDuplicateScan:
+    """
+    Run the duplicate detection job and record it as a scan.
+
+    Args:
+        session: Database session (sync; the job runs from a script)
+        full: Compare every block instead of only changed customers. The
+            first run, and the first one after customer_blocking_keys was
+            created, is always full.
+
+    Returns:
+        The finished CustomerDuplicateScan with its counters
+    """
+    last_scan = session.exec(
+        select(CustomerDuplicateScan)
+        .where(CustomerDuplicateScan.finished_at.is_not(None))
+        .order_by(CustomerDuplicateScan.started_at.desc())
+        .limit(1)
+    ).first()
+    keys_stored = session.exec(select(CustomerBlockingKey.customer_id).limit(1)).first() is not None
+    since = None if full or last_scan is None or not keys_stored else last_scan.started_at
+    scan = CustomerDuplicateScan(is_full=since is None)
+
+    pairs, changed = _candidate_pairs(session, since)
+    signatures = _load_signatures(session, {customer_id for pair in pairs for customer_id in pair})
+    scored = {}
+    for left, right in pairs:
+        score, matched_on = score_pair(signatures[left], signatures[right])
+        if score >= MIN_SCORE:
+            scored[(left, right)] = (score, matched_on)
+
+    existing = _existing_candidates(session, None if since is None else changed | set(signatures))
+    now = datetime.utcnow()
+    new_rows, updated_rows, stale_ids = [], [], []
+    for pair, (score, matched_on) in scored.items():
+        candidate = existing.get(pair)
+        if candidate is None:
+            new_rows.append({
+                "customer_id": pair[0],
+                "duplicate_customer_id": pair[1],
+                "score": score,
+                "matched_on": matched_on,
+                "status": DuplicateStatus.PENDING,
+                "created_at": now,
+                "updated_at": now,
+            })
+        elif candidate.status == DuplicateStatus.PENDING:
+            updated_rows.append({
+                "id": candidate.id, "score": score, "matched_on": matched_on, "updated_at": now
+            })
+    # Pending pairs of re-examined customers that no longer score are stale
+    for pair, candidate in existing.items():
+        if (
+            candidate.status == DuplicateStatus.PENDING
+            and pair not in scored
+            and (since is None or pair[0] in changed or pair[1] in changed)
+        ):
+            stale_ids.append(candidate.id)
+
+    if new_rows:
+        session.exec(insert(CustomerDuplicateCandidate), params=new_rows)
+    if updated_rows:
+        session.exec(update(CustomerDuplicateCandidate), params=updated_rows)
+    for chunk in _chunks(stale_ids):
+        session.exec(delete(CustomerDuplicateCandidate).where(
+            CustomerDuplicateCandidate.id.in_(chunk)
+        ))
+
+    scan.customers_changed = len(changed)
+    scan.pairs_compared = len(pairs)
+    scan.candidates_written = len(new_rows) + len(updated_rows)
+    scan.finished_at = datetime.utcnow()
+    session.add(scan)
+    session.commit()
+    session.refresh(scan)
+    return scan
+
+
+def _candidate_read_statement():
+    """Candidates with both customers' NID and name, for the review API."""
+    left, right = aliased(Customer), aliased(Customer)
+    left_detail, right_detail = aliased(CustomerDetail), aliased(CustomerDetail)
+    return (
+        select(
+            CustomerDuplicateCandidate,
+            left.nid, right.nid,
+            left_detail.first_name, left_detail.last_name,
+            right_detail.first_name, right_detail.last_name,
+        )
+        .join(left, left.id == CustomerDuplicateCandidate.customer_id)
+        .join(right, right.id == CustomerDuplicateCandidate.duplicate_customer_id)
+        .outerjoin(left_detail, left_detail.customer_id == left.id)
+        .outerjoin(right_detail, right_detail.customer_id == right.id)
+    )
+
+
+def _candidate_read(row) -> CustomerDuplicateRead:
+    candidate, left_nid, right_nid, left_first, left_last, right_first, right_last = row
+    return CustomerDuplicateRead(
+        **candidate.model_dump(exclude={"updated_at"}),
+        customer_nid=left_nid,
+        duplicate_customer_nid=right_nid,
+        customer_name=f"{left_first} {left_last}" if left_first is not None else "",
+        duplicate_customer_name=f"{right_first} {right_last}" if right_first is not None else "",
+    )
+
+
+async def list_duplicate_candidates(
+    session: AsyncSession,
+    status: DuplicateStatus,
+    page: int,
+    per_page: int,
+) -> PaginatedResponse[CustomerDuplicateRead]:
+    """
+    Page through duplicate candidates, most likely duplicates first.
+
+    Args:
+        session: Database session
+        status: Review status to list
+        page: Page number (1-based)
+        per_page: Items per page
+
+    Returns:
+        PaginatedResponse with the candidate pairs
+    """
+    total = (await session.exec(
+        select(func.count()).where(CustomerDuplicateCandidate.status == status)
+    )).one()
+    rows = (await session.exec(
+        _candidate_read_statement()
+        .where(CustomerDuplicateCandidate.status == status)
+        .order_by(CustomerDuplicateCandidate.score.desc(), CustomerDuplicateCandidate.id)
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+    )).all()
+    return PaginatedResponse.create(
+        items=[_candidate_read(row) for row in rows],
+        total=total,
+        page=page,
+        per_page=per_page,
+    )
+
+
+async def review_duplicate_candidate(
+    session: AsyncSession,
+    candidate_id: int,
+    status: DuplicateStatus,
+    reviewer_id: int,
+) -> CustomerDuplicateRead | None:
+    """
+    Record a reviewer's decision; later scans leave the pair alone.
+
+    Args:
+        session: Database session
+        candidate_id: Candidate pair ID
+        status: CONFIRMED or DISMISSED
+        reviewer_id: ID of the reviewing user
+
+    Returns:
+        The updated candidate, or None if it does not exist
+    """
+    candidate = await session.get(CustomerDuplicateCandidate, candidate_id)
+    if candidate is None:
+        return None
+
+    now = datetime.utcnow()
+    candidate.status = status
+    candidate.reviewed_by = reviewer_id
+    candidate.reviewed_at = now
+    candidate.updated_at = now
+    await session.commit()
+
+    row = (await session.exec(
+        _candidate_read_statement().where(CustomerDuplicateCandidate.id == candidate_id)
+    )).first()
+    return _candidate_read(row)
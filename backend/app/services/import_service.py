@@ -4,11 +4,13 @@ Import Service - Business logic for importing legacy SoliPres CSV files into Lam
 import csv
 import io
 import re
+import time
 from datetime import datetime, date
 from typing import Any, Dict, List, Optional, Tuple
 
 from sqlmodel import Session, select
 
+from app.core.metrics import IMPORT_DURATION, IMPORT_ROWS
 from app.models.customer import (
     Customer,
     CustomerDetail,
@@ -20,6 +22,8 @@ from app.models.customer import (
 from app.models.loan_application import LoanApplication, LoanApplicationDetail, LoanApplicationNote
 from app.models.address import Address, Addressable
 from app.models.phone import Phone
+from app.services.loan_list_view import refresh_loan_list_view_sync
+from app.services.nid_index import nid_index
 
 
 def sanitize_nid(raw_nid: Optional[str]) -> str:
@@ -102,6 +106,10 @@ class SoliPresCSVImporter:
 
     def __init__(self, session: Session):
         self.session = session
+        # Existing customers this import changed (their cached aggregates are stale)
+        self.updated_customer_ids: set[int] = set()
+        # Customers this import created
+        self.created_customer_ids: set[int] = set()
 
     def import_csv_content(self, csv_content: str) -> Dict[str, Any]:
         """
@@ -109,6 +117,8 @@ class SoliPresCSVImporter:
 
         Returns a summary report dictionary.
         """
+        start = time.perf_counter()
+
         # Remove BOM if present
         if csv_content.startswith("\ufeff"):
             csv_content = csv_content[1:]
@@ -120,6 +130,8 @@ class SoliPresCSVImporter:
         customers_updated = 0
         applications_created = 0
         errors: List[Dict[str, Any]] = []
+        # Customers whose loan list rows need rewriting (new loans, new names)
+        listed_customer_ids: set[int] = set()
 
         for row_index, row in enumerate(reader, start=2): # 1-indexed header is row 1
             try:
@@ -158,10 +170,14 @@ class SoliPresCSVImporter:
                         )
                         self.session.add(customer)
                         self.session.flush()
+                        nid_index.add(cleaned_nid)
                         customers_created += 1
+                        self.created_customer_ids.add(customer.id)
                         is_new_customer = True
                     else:
                         customers_updated += 1
+                        self.updated_customer_ids.add(customer.id)
+                    listed_customer_ids.add(customer.id)
 
                     # Split name into first and last name
                     full_name = (row.get("Nombre_y_Apellido") or row.get("nombre_y_apellido") or "").strip()
@@ -614,8 +630,13 @@ class SoliPresCSVImporter:
                     "error": str(e)
                 })
 
+        refresh_loan_list_view_sync(self.session, customer_ids=listed_customer_ids)
         self.session.commit()
 
+        IMPORT_ROWS.inc(processed_rows, result="processed")
+        IMPORT_ROWS.inc(len(errors), result="error")
+        IMPORT_DURATION.observe(time.perf_counter() - start)
+
         return {
             "processed_rows": processed_rows,
             "customers_created": customers_created,
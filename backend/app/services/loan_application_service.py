@@ -9,10 +9,12 @@ Status State Machine:
                                                ↘ rejected
     any_state → archived
 """
+from collections import defaultdict
 from datetime import datetime
 
 from fastapi import HTTPException, status
-from sqlmodel import Session, select, func
+from sqlmodel import insert, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.loan_application import (
     LoanApplication,
@@ -21,9 +23,12 @@ from app.models.loan_application import (
     LoanStatus,
 )
 from app.models.credit_risk import CreditRisk
-from app.models.customer import Customer, Company, CustomerJobInfo
-from app.models.user import User
+from app.models.loan_list_view import LoanListView
+from app.models.customer import Customer
 from app.schemas.loan_application import (
+    LoanApplicationBulkStatusResponse,
+    LoanApplicationBulkStatusResult,
+    LoanApplicationBulkStatusUpdate,
     LoanApplicationCreate,
     LoanApplicationUpdate,
     LoanApplicationStatusUpdate,
@@ -34,7 +39,15 @@ from app.schemas.loan_application import (
     LoanApplicationDetailRead,
     LoanApplicationNoteRead,
 )
-from app.schemas.customer import PaginationParams, PaginatedResponse
+from app.schemas.customer import (
+    PaginationParams,
+    PaginatedResponse,
+    decode_cursor,
+    encode_cursor,
+)
+from app.services.count_service import count_cache_key, count_rows
+from app.services.loan_list_view import refresh_loan_list_view
+from app.services.referral_service import refresh_referrer_stats
 
 
 # ============================================================================
@@ -57,6 +70,22 @@ ALLOWED_TRANSITIONS: dict[LoanStatus, set[LoanStatus]] = {
 }
 
 
+def _transition_error(current: str, target: LoanStatus) -> str | None:
+    """Why a status transition is not allowed, or None if it is."""
+    try:
+        current_enum = LoanStatus(current)
+    except ValueError:
+        return f"Current status '{current}' is not a valid loan status."
+
+    allowed = ALLOWED_TRANSITIONS.get(current_enum, set())
+    if target not in allowed:
+        return (
+            f"Cannot transition from '{current}' to '{target.value}'. "
+            f"Allowed transitions: {[s.value for s in allowed] or 'none (terminal state)'}."
+        )
+    return None
+
+
 def _validate_status_transition(
     current: str, target: LoanStatus
 ) -> None:
@@ -65,57 +94,53 @@ def _validate_status_transition(
 
     Raises HTTP 422 if the transition is not permitted.
     """
-    try:
-        current_enum = LoanStatus(current)
-    except ValueError:
+    error = _transition_error(current, target)
+    if error:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=f"Current status '{current}' is not a valid loan status.",
+            detail=error,
         )
 
-    allowed = ALLOWED_TRANSITIONS.get(current_enum, set())
-    if target not in allowed:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=(
-                f"Cannot transition from '{current}' to '{target.value}'. "
-                f"Allowed transitions: {[s.value for s in allowed] or 'none (terminal state)'}."
-            ),
-        )
-
-
-def _apply_status_flags(loan: LoanApplication, new_status: LoanStatus) -> None:
-    """Sync boolean flags and timestamps when status changes."""
-    now = datetime.utcnow()
-    loan.status = new_status.value
-    loan.changed_status_at = now
-    loan.is_new = False
 
+def _status_flag_values(new_status: LoanStatus, now: datetime) -> dict:
+    """Column values a transition to new_status sets (status, flags, timestamps)."""
+    values = {"status": new_status.value, "changed_status_at": now, "is_new": False}
     if new_status == LoanStatus.APPROVED:
-        loan.is_approved = True
-        loan.is_answered = True
-        loan.approved_at = now
+        values.update(is_approved=True, is_answered=True, approved_at=now)
     elif new_status == LoanStatus.REJECTED:
-        loan.is_rejected = True
-        loan.is_answered = True
-        loan.rejected_at = now
+        values.update(is_rejected=True, is_answered=True, rejected_at=now)
     elif new_status == LoanStatus.ARCHIVED:
-        loan.is_archived = True
-        loan.archived_at = now
+        values.update(is_archived=True, archived_at=now)
+    return values
+
+
+def _apply_status_flags(loan: LoanApplication, new_status: LoanStatus) -> None:
+    """Sync boolean flags and timestamps when status changes."""
+    for column, value in _status_flag_values(new_status, datetime.utcnow()).items():
+        setattr(loan, column, value)
 
 
 # ============================================================================
 # Helper: Build Response Schema
 # ============================================================================
 
-def _build_loan_read(loan: LoanApplication) -> LoanApplicationReadSchema:
-    """Build a full LoanApplicationReadSchema from a LoanApplication ORM object."""
+def _build_loan_read(
+    loan: LoanApplication,
+    detail: LoanApplicationDetail | None,
+    notes: list[LoanApplicationNote],
+) -> LoanApplicationReadSchema:
+    """
+    Build a full LoanApplicationReadSchema from a LoanApplication ORM object.
+
+    Detail and notes are passed in explicitly: relationship attributes cannot
+    be lazy-loaded on an async session.
+    """
     detail_read: LoanApplicationDetailRead | None = None
-    if loan.details:
-        detail_read = LoanApplicationDetailRead.model_validate(loan.details)
+    if detail:
+        detail_read = LoanApplicationDetailRead.model_validate(detail)
 
     notes_read: list[LoanApplicationNoteRead] = [
-        LoanApplicationNoteRead.model_validate(n) for n in (loan.notes or [])
+        LoanApplicationNoteRead.model_validate(n) for n in notes
     ]
 
     return LoanApplicationReadSchema(
@@ -146,7 +171,7 @@ def _build_loan_read(loan: LoanApplication) -> LoanApplicationReadSchema:
 # ============================================================================
 
 async def create_loan_application(
-    session: Session,
+    session: AsyncSession,
     data: LoanApplicationCreate,
     user_id: int | None = None,
 ) -> LoanApplicationReadSchema:
@@ -156,7 +181,7 @@ async def create_loan_application(
     Validates that the customer exists before creating.
     """
     # Validate customer exists
-    customer = session.get(Customer, data.customer_id)
+    customer = await session.get(Customer, data.customer_id)
     if not customer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -170,7 +195,7 @@ async def create_loan_application(
         status=LoanStatus.RECEIVED.value,
     )
     session.add(loan)
-    session.flush()  # Get loan.id
+    await session.flush()  # Get loan.id
 
     # Create nested detail
     detail = LoanApplicationDetail(
@@ -184,176 +209,132 @@ async def create_loan_application(
         customer_comment=data.detail.customer_comment,
     )
     session.add(detail)
-    session.commit()
-    session.refresh(loan)
-    session.refresh(detail)
+    # Loans count towards the referral rollups of the customer's referrers
+    await refresh_referrer_stats(session, [loan.customer_id])
+    await refresh_loan_list_view(session, [loan.id])
+    await session.commit()
+    await session.refresh(loan)
+    await session.refresh(detail)
 
-    # Attach detail and empty notes for response building
-    loan.details = detail
-    loan.notes = []
-
-    return _build_loan_read(loan)
+    return _build_loan_read(loan, detail, [])
 
 
 async def get_loan_application_with_relations(
-    session: Session, loan_id: int
+    session: AsyncSession, loan_id: int
 ) -> LoanApplicationReadSchema | None:
     """Fetch a loan application by ID with all related data."""
-    loan = session.get(LoanApplication, loan_id)
+    loan = await session.get(LoanApplication, loan_id)
     if not loan:
         return None
 
     # Eagerly load relations via explicit queries
-    detail = session.exec(
+    detail = (await session.exec(
         select(LoanApplicationDetail).where(
             LoanApplicationDetail.loan_application_id == loan_id
         )
-    ).first()
+    )).first()
 
-    notes = session.exec(
+    notes = (await session.exec(
         select(LoanApplicationNote).where(
             LoanApplicationNote.loan_application_id == loan_id
         )
-    ).all()
+    )).all()
+
+    return _build_loan_read(loan, detail, list(notes))
 
-    loan.details = detail
-    loan.notes = list(notes)
 
-    return _build_loan_read(loan)
+def _apply_loan_filters(statement, filters: LoanApplicationFilterSchema):
+    """Apply LoanApplicationFilterSchema criteria to a statement over loan_list_view."""
+    if filters.customer_id is not None:
+        statement = statement.where(LoanListView.customer_id == filters.customer_id)
+    if filters.status is not None:
+        statement = statement.where(LoanListView.status == filters.status.value)
+    if filters.is_active is not None:
+        statement = statement.where(LoanListView.is_active == filters.is_active)
+    if filters.is_approved is not None:
+        statement = statement.where(LoanListView.is_approved == filters.is_approved)
+    if filters.is_rejected is not None:
+        statement = statement.where(LoanListView.is_rejected == filters.is_rejected)
+    return statement
+
+
+def _list_item(row: LoanListView) -> LoanApplicationListItem:
+    return LoanApplicationListItem(
+        id=row.loan_application_id,
+        **row.model_dump(exclude={"loan_application_id"}),
+    )
 
 
 async def list_loan_applications(
-    session: Session,
+    session: AsyncSession,
     filters: LoanApplicationFilterSchema,
     pagination: PaginationParams,
 ) -> PaginatedResponse[LoanApplicationListItem]:
-    """List loan applications with filtering and pagination."""
-    query = select(LoanApplication)
+    """
+    List loan applications with filtering and pagination.
 
-    # Apply filters
-    if filters.customer_id is not None:
-        query = query.where(LoanApplication.customer_id == filters.customer_id)
-    if filters.status is not None:
-        query = query.where(LoanApplication.status == filters.status.value)
-    if filters.is_active is not None:
-        query = query.where(LoanApplication.is_active == filters.is_active)
-    if filters.is_approved is not None:
-        query = query.where(LoanApplication.is_approved == filters.is_approved)
-    if filters.is_rejected is not None:
-        query = query.where(LoanApplication.is_rejected == filters.is_rejected)
-
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total = session.exec(count_query).one()
-
-    # Apply pagination
-    offset = (pagination.page - 1) * pagination.per_page
-    loans = session.exec(
-        query.order_by(LoanApplication.id.desc())
-        .offset(offset)
-        .limit(pagination.per_page)
-    ).all()
-
-    # Build list items (include amount from detail, customer, company, bank, advisor and latest note)
-    items: list[LoanApplicationListItem] = []
-    for loan in loans:
-        detail = session.exec(
-            select(LoanApplicationDetail).where(
-                LoanApplicationDetail.loan_application_id == loan.id
-            )
-        ).first()
-
-        customer = session.get(Customer, loan.customer_id) if loan.customer_id else None
-        customer_name = None
-        company_name = None
-        bank_name = None
-
-        if customer:
-            if customer.detail:
-                first = customer.detail.first_name or ""
-                last = customer.detail.last_name or ""
-                customer_name = f"{first} {last}".strip() or None
-
-            # Company name
-            comp = session.exec(
-                select(Company).where(Company.customer_id == customer.id)
-            ).first()
-            if comp and comp.name:
-                company_name = comp.name
-
-            # Bank name from job_info
-            job = session.exec(
-                select(CustomerJobInfo).where(CustomerJobInfo.customer_id == customer.id)
-            ).first()
-            if job and job.payment_bank:
-                bank_name = job.payment_bank
-
-        # Advisor name
-        advisor_name = None
-        if loan.user_id:
-            user = session.get(User, loan.user_id)
-            if user:
-                advisor_name = user.name
-
-        # Latest note
-        latest_note = None
-        note_obj = session.exec(
-            select(LoanApplicationNote)
-            .where(LoanApplicationNote.loan_application_id == loan.id)
-            .order_by(LoanApplicationNote.created_at.desc())
-        ).first()
-        if note_obj:
-            latest_note = note_obj.note
-
-        item = LoanApplicationListItem(
-            id=loan.id,
-            customer_id=loan.customer_id,
-            user_id=loan.user_id,
-            status=loan.status,
-            is_active=loan.is_active,
-            is_approved=loan.is_approved,
-            is_rejected=loan.is_rejected,
-            is_archived=loan.is_archived,
-            is_new=loan.is_new,
-            amount=detail.amount if detail else None,
-            term=detail.term if detail else None,
-            purpose=detail.purpose if detail else None,
-            customer_name=customer_name,
-            customer_nid=customer.nid if customer else None,
-            company_name=company_name,
-            bank_name=bank_name,
-            advisor_name=advisor_name,
-            latest_note=latest_note,
-            created_at=loan.created_at,
-            updated_at=loan.updated_at,
+    Pages are read from the loan_list_view read model (one row per loan,
+    maintained on write, see app.services.loan_list_view).
+    """
+    try:
+        after_id = decode_cursor(pagination.cursor) if pagination.cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    query = _apply_loan_filters(select(LoanListView), filters)
+
+    # Count total (exact and cached briefly, or a planner estimate)
+    total = None
+    total_is_estimate = False
+    if pagination.include_total:
+        total, total_is_estimate = await count_rows(
+            session,
+            query,
+            key=count_cache_key("loan_applications", filters.model_dump()),
+            table_name=LoanListView.__tablename__,
+            filtered=bool(filters.model_dump(exclude_none=True)),
+            mode=pagination.count,
         )
-        items.append(item)
+
+    # Apply pagination: keyset seek when a cursor is given, OFFSET otherwise.
+    # One extra row tells whether there is a next page.
+    query = query.order_by(LoanListView.loan_application_id.desc())
+    if after_id is not None:
+        query = query.where(LoanListView.loan_application_id < after_id)
+    else:
+        query = query.offset((pagination.page - 1) * pagination.per_page)
+    rows = (await session.exec(query.limit(pagination.per_page + 1))).all()
+    has_more = len(rows) > pagination.per_page
+    items = [_list_item(row) for row in rows[:pagination.per_page]]
 
     return PaginatedResponse.create(
         items=items,
         total=total,
         page=pagination.page,
         per_page=pagination.per_page,
+        next_cursor=encode_cursor(items[-1].id) if has_more else None,
+        total_is_estimate=total_is_estimate,
     )
 
 
 async def update_loan_application(
-    session: Session,
+    session: AsyncSession,
     loan_id: int,
     data: LoanApplicationUpdate,
 ) -> LoanApplicationReadSchema | None:
     """Partial update of a loan application's detail."""
-    loan = session.get(LoanApplication, loan_id)
+    loan = await session.get(LoanApplication, loan_id)
     if not loan:
         return None
 
     if data.detail is not None:
         # Update existing detail or create if missing
-        detail = session.exec(
+        detail = (await session.exec(
             select(LoanApplicationDetail).where(
                 LoanApplicationDetail.loan_application_id == loan_id
             )
-        ).first()
+        )).first()
 
         if detail:
             detail.amount = data.detail.amount
@@ -379,15 +360,17 @@ async def update_loan_application(
 
         loan.is_edited = True
         loan.updated_at = datetime.utcnow()
+        await refresh_referrer_stats(session, [loan.customer_id])
+        await refresh_loan_list_view(session, [loan.id])
 
-    session.commit()
-    session.refresh(loan)
+    await session.commit()
+    await session.refresh(loan)
 
     return await get_loan_application_with_relations(session, loan_id)
 
 
 async def transition_loan_status(
-    session: Session,
+    session: AsyncSession,
     loan_id: int,
     data: LoanApplicationStatusUpdate,
     user_id: int | None = None,
@@ -398,7 +381,7 @@ async def transition_loan_status(
     Validates the transition against the state machine before applying.
     Optionally adds a note on status change.
     """
-    loan = session.get(LoanApplication, loan_id)
+    loan = await session.get(LoanApplication, loan_id)
     if not loan:
         return None
 
@@ -418,14 +401,99 @@ async def transition_loan_status(
         )
         session.add(note)
 
-    session.commit()
-    session.refresh(loan)
+    await refresh_referrer_stats(session, [loan.customer_id])
+    await refresh_loan_list_view(session, [loan.id])
+    await session.commit()
+    await session.refresh(loan)
 
     return await get_loan_application_with_relations(session, loan_id)
 
 
+async def bulk_transition_loan_status(
+    session: AsyncSession,
+    data: LoanApplicationBulkStatusUpdate,
+    user_id: int | None = None,
+) -> LoanApplicationBulkStatusResponse:
+    """
+    Transition many loan applications at once (e.g. archiving stale ones).
+
+    Every transition is checked against the state machine in memory; the
+    valid ones are applied with one UPDATE per (current, target) status
+    pair, guarded by the status just read, so a loan moved by a concurrent
+    request is reported instead of overwritten. Notes are inserted with a
+    single executemany. Invalid or unknown loans do not block the others.
+    """
+    requested = {item.loan_id: item for item in data.transitions}
+    current = {
+        row.id: row
+        for row in (await session.exec(
+            select(LoanApplication.id, LoanApplication.status, LoanApplication.customer_id)
+            .where(LoanApplication.id.in_(requested))
+        )).all()
+    }
+
+    results: dict[int, LoanApplicationBulkStatusResult] = {}
+    by_transition: dict[tuple[str, LoanStatus], list[int]] = defaultdict(list)
+    for loan_id, item in requested.items():
+        loan = current.get(loan_id)
+        if loan is None:
+            results[loan_id] = LoanApplicationBulkStatusResult(
+                loan_id=loan_id, result="not_found")
+        elif error := _transition_error(loan.status, item.status):
+            results[loan_id] = LoanApplicationBulkStatusResult(
+                loan_id=loan_id, result="invalid_transition",
+                previous_status=loan.status, detail=error)
+        else:
+            by_transition[loan.status, item.status].append(loan_id)
+
+    now = datetime.utcnow()
+    updated_ids: list[int] = []
+    for (previous, target), loan_ids in by_transition.items():
+        moved = set((await session.exec(
+            update(LoanApplication)
+            .where(LoanApplication.id.in_(loan_ids), LoanApplication.status == previous)
+            .values(**_status_flag_values(target, now))
+            .returning(LoanApplication.id)
+            .execution_options(synchronize_session=False)
+        )).scalars().all())
+        for loan_id in loan_ids:
+            if loan_id in moved:
+                results[loan_id] = LoanApplicationBulkStatusResult(
+                    loan_id=loan_id, result="updated",
+                    previous_status=previous, status=target.value)
+                updated_ids.append(loan_id)
+            else:
+                results[loan_id] = LoanApplicationBulkStatusResult(
+                    loan_id=loan_id, result="invalid_transition", previous_status=previous,
+                    detail="Status was changed by another request; reload and retry.")
+
+    notes = [
+        {
+            "loan_application_id": loan_id,
+            "note": requested[loan_id].note,
+            "user_id": user_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for loan_id in updated_ids
+        if requested[loan_id].note
+    ]
+    if notes:
+        await session.exec(insert(LoanApplicationNote), params=notes)
+
+    if updated_ids:
+        await refresh_referrer_stats(session, {current[loan_id].customer_id for loan_id in updated_ids})
+        await refresh_loan_list_view(session, updated_ids)
+    await session.commit()
+
+    return LoanApplicationBulkStatusResponse(
+        updated_count=len(updated_ids),
+        results=[results[loan_id] for loan_id in requested],
+    )
+
+
 async def associate_credit_risk(
-    session: Session,
+    session: AsyncSession,
     loan_id: int,
     credit_risk_id: int,
 ) -> LoanApplicationReadSchema | None:
@@ -435,11 +503,11 @@ async def associate_credit_risk(
     Validates that both the loan and the credit risk exist.
     Stores the association as a note for audit trail.
     """
-    loan = session.get(LoanApplication, loan_id)
+    loan = await session.get(LoanApplication, loan_id)
     if not loan:
         return None
 
-    credit_risk = session.get(CreditRisk, credit_risk_id)
+    credit_risk = await session.get(CreditRisk, credit_risk_id)
     if not credit_risk:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -452,19 +520,20 @@ async def associate_credit_risk(
         note=f"[CREDIT_RISK] Associated credit risk: '{credit_risk.name}' (ID: {credit_risk_id})",
     )
     session.add(note)
-    session.commit()
+    await refresh_loan_list_view(session, [loan.id])
+    await session.commit()
 
     return await get_loan_application_with_relations(session, loan_id)
 
 
 async def add_loan_note(
-    session: Session,
+    session: AsyncSession,
     loan_id: int,
     data: LoanApplicationNoteCreate,
     user_id: int | None = None,
 ) -> LoanApplicationReadSchema | None:
     """Add a note to a loan application."""
-    loan = session.get(LoanApplication, loan_id)
+    loan = await session.get(LoanApplication, loan_id)
     if not loan:
         return None
 
@@ -474,25 +543,28 @@ async def add_loan_note(
         user_id=user_id,
     )
     session.add(note)
-    session.commit()
+    await refresh_loan_list_view(session, [loan.id])
+    await session.commit()
 
     return await get_loan_application_with_relations(session, loan_id)
 
 
 async def soft_delete_loan_application(
-    session: Session, loan_id: int
+    session: AsyncSession, loan_id: int
 ) -> bool:
     """
     Soft delete a loan application by setting is_active=False.
 
     Returns True if deleted, False if not found.
     """
-    loan = session.get(LoanApplication, loan_id)
+    loan = await session.get(LoanApplication, loan_id)
     if not loan:
         return False
 
     loan.is_active = False
     loan.updated_at = datetime.utcnow()
     session.add(loan)
-    session.commit()
+    await refresh_referrer_stats(session, [loan.customer_id])
+    await refresh_loan_list_view(session, [loan.id])
+    await session.commit()
     return True
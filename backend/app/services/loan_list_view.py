@@ -0,0 +1,180 @@
+"""
+Loan list view - Denormalized read model behind GET /loan-applications.
+
+The loans table shows data from seven tables (loan, loan detail, customer,
+customer detail, company, job info, advisor) plus the latest note. Instead
+of joining them on every page, loan_list_view keeps one precomputed row per
+loan, rewritten by every write path that changes what the row shows, in the
+same transaction:
+
+- loan writes (create, update, status, notes, delete) refresh the loan
+- customer writes (profile update, public submission, CSV import) refresh
+  every loan of the customer
+
+Refreshes are ``INSERT ... SELECT`` upserts of the projection below, so the
+data never travels through Python. Loans are only soft-deleted, so rows are
+never removed.
+
+rebuild_loan_list_view() repopulates the table and find_stale_loan_list_rows()
+lists loans whose row differs from the projection; both are run by
+scripts/rebuild_loan_list_view.py. Both sync (scripts, importer, submission)
+and async sessions are supported.
+"""
+from typing import Iterable
+
+from sqlalchemy import except_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, delete, func, insert, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.customer import Company, Customer, CustomerDetail, CustomerJobInfo
+from app.models.loan_application import LoanApplication, LoanApplicationDetail, LoanApplicationNote
+from app.models.loan_list_view import LoanListView
+from app.models.user import User
+
+# IDs per refresh statement (keeps IN lists within driver parameter limits)
+REFRESH_CHUNK = 1000
+
+VIEW_COLUMNS = [column.name for column in LoanListView.__table__.columns]
+# Dialects with INSERT ... ON CONFLICT: concurrent refreshes of one loan
+# overwrite each other instead of failing on the primary key
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _first_row_id(model, key_column, key):
+    """Lowest ID among the rows of a one-per-parent table (legacy data can hold several)."""
+    alias = aliased(model)
+    return (
+        select(func.min(alias.id))
+        .where(getattr(alias, key_column) == key)
+        .scalar_subquery()
+    )
+
+
+def _projection():
+    """SELECT producing loan_list_view rows (in VIEW_COLUMNS order) from the source tables."""
+    latest_note = (
+        select(LoanApplicationNote.note)
+        .where(LoanApplicationNote.loan_application_id == LoanApplication.id)
+        .order_by(LoanApplicationNote.created_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    full_name = func.trim(
+        func.coalesce(CustomerDetail.first_name, "") + " " + func.coalesce(CustomerDetail.last_name, "")
+    )
+    return (
+        select(
+            LoanApplication.id,
+            LoanApplication.customer_id,
+            LoanApplication.user_id,
+            LoanApplication.status,
+            LoanApplication.is_active,
+            LoanApplication.is_approved,
+            LoanApplication.is_rejected,
+            LoanApplication.is_archived,
+            LoanApplication.is_new,
+            LoanApplicationDetail.amount,
+            LoanApplicationDetail.term,
+            LoanApplicationDetail.purpose,
+            func.nullif(full_name, ""),
+            Customer.nid,
+            func.nullif(Company.name, ""),
+            func.nullif(CustomerJobInfo.payment_bank, ""),
+            User.name,
+            latest_note,
+            LoanApplication.created_at,
+            LoanApplication.updated_at,
+        )
+        .select_from(LoanApplication)
+        .outerjoin(
+            LoanApplicationDetail,
+            LoanApplicationDetail.id == _first_row_id(
+                LoanApplicationDetail, "loan_application_id", LoanApplication.id),
+        )
+        .outerjoin(Customer, Customer.id == LoanApplication.customer_id)
+        .outerjoin(
+            CustomerDetail,
+            CustomerDetail.id == _first_row_id(CustomerDetail, "customer_id", Customer.id),
+        )
+        .outerjoin(Company, Company.id == _first_row_id(Company, "customer_id", Customer.id))
+        .outerjoin(
+            CustomerJobInfo,
+            CustomerJobInfo.id == _first_row_id(CustomerJobInfo, "customer_id", Customer.id),
+        )
+        .outerjoin(User, User.id == LoanApplication.user_id)
+    )
+
+
+def _upsert(dialect_name: str, rows):
+    upsert = _UPSERT_INSERTS.get(dialect_name)
+    if upsert is None:
+        return insert(LoanListView).from_select(VIEW_COLUMNS, rows)
+    statement = upsert(LoanListView).from_select(VIEW_COLUMNS, rows)
+    return statement.on_conflict_do_update(
+        index_elements=["loan_application_id"],
+        set_={column: statement.excluded[column] for column in VIEW_COLUMNS[1:]},
+    )
+
+
+def _refresh_statements(dialect_name: str, loan_ids: Iterable[int], customer_ids: Iterable[int]):
+    for column, ids in (
+        (LoanApplication.id, sorted(set(loan_ids))),
+        (LoanApplication.customer_id, sorted(set(customer_ids))),
+    ):
+        for start in range(0, len(ids), REFRESH_CHUNK):
+            chunk = ids[start:start + REFRESH_CHUNK]
+            yield _upsert(dialect_name, _projection().where(column.in_(chunk)))
+
+
+async def refresh_loan_list_view(
+    session: AsyncSession,
+    loan_ids: Iterable[int] = (),
+    customer_ids: Iterable[int] = (),
+) -> None:
+    """
+    Rewrite the rows of the given loans and of every loan of the given customers.
+
+    Does not commit; call it in the transaction that made the change.
+    """
+    for statement in _refresh_statements(session.bind.dialect.name, loan_ids, customer_ids):
+        await session.exec(statement)
+
+
+def refresh_loan_list_view_sync(
+    session: Session,
+    loan_ids: Iterable[int] = (),
+    customer_ids: Iterable[int] = (),
+) -> None:
+    """refresh_loan_list_view() for sync sessions (importer, public submission)."""
+    for statement in _refresh_statements(session.bind.dialect.name, loan_ids, customer_ids):
+        session.exec(statement)
+
+
+def rebuild_loan_list_view(session: Session) -> int:
+    """
+    Repopulate loan_list_view from scratch and commit.
+
+    Returns:
+        Number of rows written
+    """
+    session.exec(delete(LoanListView))
+    session.exec(insert(LoanListView).from_select(VIEW_COLUMNS, _projection()))
+    session.commit()
+    return session.exec(select(func.count()).select_from(LoanListView)).one()
+
+
+def find_stale_loan_list_rows(session: Session) -> list[int]:
+    """
+    IDs of loans whose loan_list_view row is missing, outdated or orphaned.
+
+    Compares the table with the projection in SQL, one EXCEPT each way.
+    """
+    stored = select(*(LoanListView.__table__.c[column] for column in VIEW_COLUMNS))
+    expected = _projection()
+    stale: set[int] = set()
+    for differing in (except_(expected, stored), except_(stored, expected)):
+        rows = differing.subquery()
+        stale.update(session.exec(select(rows.c[0])).all())
+    return sorted(stale)
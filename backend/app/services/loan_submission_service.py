@@ -17,6 +17,8 @@ from app.models.loan_application import LoanApplication, LoanApplicationDetail,
 from app.models.legal_consent import LegalConsent
 from app.models.customer_shadow_risk import CustomerShadowRisk, ShadowRiskLevel
 from app.models.core_task_queue import CoreTaskQueue, TaskType, TaskStatus
+from app.services.loan_list_view import refresh_loan_list_view_sync
+from app.services.nid_index import nid_index
 
 
 class LoanSubmissionService:
@@ -81,6 +83,7 @@ class LoanSubmissionService:
             )
             self.session.add(customer)
             self.session.flush()
+            nid_index.add(nid)
 
             # Customer Detail
             # Note: the public wizard captures housing *possession* (owned/rented/etc.),
@@ -335,6 +338,7 @@ class LoanSubmissionService:
         )
         self.session.add(core_task)
 
+        refresh_loan_list_view_sync(self.session, customer_ids=[customer.id])
         self.session.commit()
         self.session.refresh(customer)
         self.session.refresh(loan_app)
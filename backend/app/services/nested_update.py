@@ -0,0 +1,193 @@
+"""
+Nested update service - Diff submitted child rows against stored ones.
+
+Customer forms resubmit every phone, address and reference on save. Instead
+of deleting all stored rows and inserting the submission again, each
+submitted child is matched to a stored row:
+
+1. identical values   -> left alone
+2. same natural key   -> UPDATE in place (e.g. a phone's type changed)
+3. any leftover row   -> UPDATE in place, so primary keys are reused
+4. nothing left       -> INSERT, and stored rows left over are DELETEd
+
+Each kind of change is one set-based statement (executemany for UPDATE and
+INSERT, ``IN`` for DELETE), so the cost no longer grows in round trips per
+child.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Hashable, Sequence
+
+from sqlmodel import delete, insert, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.address import Address, Addressable
+from app.models.customer import CustomerReference
+from app.models.phone import Phone
+from app.schemas.customer import ChildChanges
+
+PHONE_FIELDS = ("number", "type", "country_area", "extension")
+ADDRESS_FIELDS = (
+    "street", "street2", "city", "state", "type", "postal_code", "country", "references"
+)
+REFERENCE_FIELDS = (
+    "name", "nid", "email", "relationship", "reference_since",
+    "occupation", "is_who_referred", "type", "address",
+)
+
+
+@dataclass
+class ChildDiff:
+    """Stored rows and submitted values, sorted by what has to happen to them."""
+
+    unchanged: list[Any] = field(default_factory=list)
+    updated: list[tuple[Any, dict[str, Any]]] = field(default_factory=list)
+    deleted: list[Any] = field(default_factory=list)
+    inserted: list[dict[str, Any]] = field(default_factory=list)
+
+
+def diff_children(
+    existing: Sequence[Any],
+    submitted: Sequence[dict[str, Any]],
+    fields: Sequence[str],
+    key: Callable[[dict[str, Any]], Hashable],
+) -> ChildDiff:
+    """Match submitted values to stored rows (see module docstring)."""
+    diff = ChildDiff()
+    remaining = list(existing)
+    pending = []
+
+    def values_of(row) -> dict[str, Any]:
+        return {name: getattr(row, name) for name in fields}
+
+    for values in submitted:
+        match = next((row for row in remaining if values_of(row) == values), None)
+        if match is None:
+            pending.append(values)
+        else:
+            remaining.remove(match)
+            diff.unchanged.append(match)
+
+    unmatched = []
+    for values in pending:
+        match = next((row for row in remaining if key(values_of(row)) == key(values)), None)
+        if match is None:
+            unmatched.append(values)
+        else:
+            remaining.remove(match)
+            diff.updated.append((match, values))
+
+    for values in unmatched:
+        if remaining:
+            diff.updated.append((remaining.pop(0), values))
+        else:
+            diff.inserted.append(values)
+
+    diff.deleted = remaining
+    return diff
+
+
+def _changes(diff: ChildDiff, inserted_ids: list[int]) -> ChildChanges:
+    return ChildChanges(
+        inserted=inserted_ids,
+        updated=[row.id for row, _ in diff.updated],
+        deleted=[row.id for row in diff.deleted],
+        unchanged=[row.id for row in diff.unchanged],
+    )
+
+
+async def _apply_updates(session: AsyncSession, model, diff: ChildDiff) -> None:
+    if diff.updated:
+        now = datetime.utcnow()
+        await session.exec(
+            update(model),
+            params=[{"id": row.id, "updated_at": now, **values} for row, values in diff.updated],
+        )
+
+
+async def sync_phones(
+    session: AsyncSession,
+    phoneable_type: str,
+    phoneable_id: int,
+    existing: Sequence[Phone],
+    submitted: Sequence[dict[str, Any]],
+) -> ChildChanges:
+    """Bring an owner's polymorphic phones in line with ``submitted``."""
+    diff = diff_children(existing, submitted, PHONE_FIELDS, key=lambda v: v["number"])
+    await _apply_updates(session, Phone, diff)
+    if diff.deleted:
+        await session.exec(delete(Phone).where(Phone.id.in_([row.id for row in diff.deleted])))
+    inserted_ids = []
+    if diff.inserted:
+        inserted_ids = list((await session.exec(
+            insert(Phone).returning(Phone.id, sort_by_parameter_order=True),
+            params=[
+                {**values, "phoneable_type": phoneable_type, "phoneable_id": phoneable_id}
+                for values in diff.inserted
+            ],
+        )).scalars())
+    return _changes(diff, inserted_ids)
+
+
+async def sync_addresses(
+    session: AsyncSession,
+    addressable_type: str,
+    addressable_id: int,
+    existing: Sequence[Address],
+    submitted: Sequence[dict[str, Any]],
+) -> ChildChanges:
+    """Bring an owner's addresses, and their pivot rows, in line with ``submitted``."""
+    diff = diff_children(
+        existing, submitted, ADDRESS_FIELDS, key=lambda v: (v["street"], v["city"])
+    )
+    await _apply_updates(session, Address, diff)
+    if diff.deleted:
+        deleted_ids = [row.id for row in diff.deleted]
+        # Pivots first, or the address delete violates their foreign key
+        await session.exec(delete(Addressable).where(
+            Addressable.addressable_type == addressable_type,
+            Addressable.addressable_id == addressable_id,
+            Addressable.address_id.in_(deleted_ids),
+        ))
+        await session.exec(delete(Address).where(Address.id.in_(deleted_ids)))
+    inserted_ids = []
+    if diff.inserted:
+        inserted_ids = list((await session.exec(
+            insert(Address).returning(Address.id, sort_by_parameter_order=True),
+            params=list(diff.inserted),
+        )).scalars())
+        await session.exec(insert(Addressable), params=[
+            {
+                "address_id": address_id,
+                "addressable_type": addressable_type,
+                "addressable_id": addressable_id,
+            }
+            for address_id in inserted_ids
+        ])
+    return _changes(diff, inserted_ids)
+
+
+async def sync_references(
+    session: AsyncSession,
+    customer_id: int,
+    existing: Sequence[CustomerReference],
+    submitted: Sequence[dict[str, Any]],
+) -> ChildChanges:
+    """Bring a customer's personal references in line with ``submitted``."""
+    diff = diff_children(
+        existing, submitted, REFERENCE_FIELDS, key=lambda v: v["nid"] or v["name"]
+    )
+    await _apply_updates(session, CustomerReference, diff)
+    if diff.deleted:
+        await session.exec(delete(CustomerReference).where(
+            CustomerReference.id.in_([row.id for row in diff.deleted])
+        ))
+    inserted_ids = []
+    if diff.inserted:
+        inserted_ids = list((await session.exec(
+            insert(CustomerReference).returning(
+                CustomerReference.id, sort_by_parameter_order=True
+            ),
+            params=[{**values, "customer_id": customer_id} for values in diff.inserted],
+        )).scalars())
+    return _changes(diff, inserted_ids)
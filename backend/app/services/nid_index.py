@@ -0,0 +1,130 @@
+"""
+NID index - In-process membership set of registered customer NIDs.
+
+The public ``/solicitar`` wizard validates the NID on every debounced
+keystroke, and most of those NIDs belong to nobody. The index answers
+"definitely not registered" without touching the database:
+
+- every stored NID (11 digits) is kept as an int in a sorted ``array('q')``
+  (8 bytes per customer) and looked up with ``bisect``
+- NIDs created through this process are added right away
+- every ``NID_INDEX_CATCH_UP_SECONDS`` the index adds the customers stored
+  since its last look (``id >`` the highest ID seen, a primary key range
+  scan), so customers created by other workers or scripts are known within
+  seconds; until then they get a "not registered" answer
+- every ``NID_INDEX_REFRESH_SECONDS`` the snapshot is rebuilt, which also
+  drops deleted customers and picks up rows committed out of ID order
+
+Reloads are single-flight: one request refreshes while concurrent ones keep
+answering from the current snapshot, and sorting runs off the event loop.
+
+Adding a NID that ends up rolled back is harmless (the caller falls back to
+the database), so writers may add before committing. A stale miss only costs
+the prefill: the public submission still looks the customer up by NID.
+"""
+import asyncio
+import time
+from array import array
+from bisect import bisect_left
+
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.models.customer import Customer
+
+
+def _as_int(nid: str | None) -> int | None:
+    if nid and len(nid) == 11 and nid.isdigit():
+        return int(nid)
+    return None
+
+
+def _sorted_values(nids: list[str | None]) -> array:
+    return array("q", sorted(filter(None, map(_as_int, nids))))
+
+
+class NIDIndex:
+    """Sorted snapshot of stored NIDs plus the ones added since it was taken."""
+
+    def __init__(self, refresh_seconds: float, catch_up_seconds: float = 0):
+        self.refresh_seconds = refresh_seconds
+        self.catch_up_seconds = catch_up_seconds
+        self._sorted = array("q")
+        self._added: set[int] = set()
+        self._loaded_at: float | None = None
+        self._caught_up_at: float | None = None
+        self._max_id = 0
+        self._lock = asyncio.Lock()
+
+    def is_fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.refresh_seconds
+        )
+
+    def _is_caught_up(self) -> bool:
+        return (
+            self._caught_up_at is not None
+            and time.monotonic() - self._caught_up_at < self.catch_up_seconds
+        )
+
+    async def load(self, session: AsyncSession) -> None:
+        """Replace the snapshot with every NID currently stored."""
+        started_at = time.monotonic()
+        max_id = (await session.exec(select(func.max(Customer.id)))).one() or 0
+        nids = (await session.exec(select(Customer.nid).where(Customer.id <= max_id))).all()
+        values = await asyncio.to_thread(_sorted_values, nids)
+        # Keep additions the snapshot may have missed (committed after the scan)
+        added = {value for value in self._added if not self._in_sorted(values, value)}
+        self._sorted, self._added = values, added
+        self._max_id, self._loaded_at, self._caught_up_at = max_id, started_at, started_at
+
+    async def catch_up(self, session: AsyncSession) -> None:
+        """Add the NIDs of customers stored since the last load or catch-up."""
+        started_at = time.monotonic()
+        rows = (await session.exec(
+            select(Customer.id, Customer.nid).where(Customer.id > self._max_id)
+        )).all()
+        for customer_id, nid in rows:
+            self._max_id = max(self._max_id, customer_id)
+            self.add(nid)
+        self._caught_up_at = started_at
+
+    async def ensure_fresh(self, session: AsyncSession) -> None:
+        if self.is_fresh() and self._is_caught_up():
+            return
+        if self._lock.locked() and self._loaded_at is not None:
+            return  # another request is refreshing; answer from the current snapshot
+        async with self._lock:
+            if not self.is_fresh():
+                await self.load(session)
+            elif not self._is_caught_up():
+                await self.catch_up(session)
+
+    def add(self, *nids: str) -> None:
+        self._added.update(filter(None, map(_as_int, nids)))
+
+    def __contains__(self, nid: str) -> bool:
+        value = _as_int(nid)
+        if value is None:
+            return False
+        return value in self._added or self._in_sorted(self._sorted, value)
+
+    @staticmethod
+    def _in_sorted(values: array, value: int) -> bool:
+        position = bisect_left(values, value)
+        return position < len(values) and values[position] == value
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._added)
+
+    def clear(self) -> None:
+        self._sorted, self._added, self._max_id = array("q"), set(), 0
+        self._loaded_at = self._caught_up_at = None
+
+
+nid_index = NIDIndex(
+    refresh_seconds=settings.NID_INDEX_REFRESH_SECONDS,
+    catch_up_seconds=settings.NID_INDEX_CATCH_UP_SECONDS,
+)
@@ -0,0 +1,329 @@
+"""
+Referral service - Customer referral graph and per-referrer rollups.
+
+``Customer.referred_by`` holds the referrer's NID as typed on the form or in
+the CSV. It is resolved once to ``Customer.referrer_id`` (indexed), so the
+graph is walked with recursive CTEs on integer keys instead of in Python:
+
+- link_referrals() resolves the referrals not linked yet. Writes scope it
+  to the customers they touched: their own referral, and the customers
+  waiting for them as referrer (found through the partial index
+  ix_customers_unresolved_referral), so referrers created later are picked
+  up and referrals that never resolve do not slow every write down.
+- customer_referral_stats caches, per referrer, how many customers it
+  brought in directly and further down the tree, and their loans.
+  sync_referrals() / refresh_referrer_stats() recompute only the rows of the
+  ancestors of customers that changed, in the caller's transaction.
+
+Referral chains are followed at most MAX_DEPTH levels, and each customer is
+counted once per referrer at its shallowest depth, so a cycle (A referred B,
+B referred A) cannot loop.
+"""
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import DateTime, Integer, literal, literal_column
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import aliased
+from sqlmodel import case, delete, func, insert, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.customer import Customer, CustomerDetail
+from app.models.customer_referral_stats import CustomerReferralStats
+from app.models.loan_application import LoanApplication, LoanApplicationDetail
+from app.schemas.customer import (
+    CustomerReferralNode,
+    CustomerReferralStatsRead,
+    PaginatedResponse,
+)
+
+MAX_DEPTH = 20
+
+STATS_COLUMNS = [
+    "customer_id", "direct_count", "indirect_count", "applications_count",
+    "approved_count", "approved_amount", "refreshed_at",
+]
+# Dialects with INSERT ... ON CONFLICT: concurrent refreshes of one referrer
+# overwrite each other instead of failing on the primary key
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _descendants(roots, max_depth: int = MAX_DEPTH):
+    """
+    (root_id, customer_id, depth) for everyone below each root, shallowest depth only.
+
+    ``roots`` is a list of customer IDs or a subquery selecting them.
+    """
+    tree = (
+        select(
+            Customer.referrer_id.label("root_id"),
+            Customer.id.label("customer_id"),
+            literal_column("1", Integer).label("depth"),
+        )
+        .where(Customer.referrer_id.in_(roots))
+        .cte("referral_tree", recursive=True)
+    )
+    child = aliased(Customer)
+    tree = tree.union_all(
+        select(tree.c.root_id, child.id, tree.c.depth + 1)
+        .where(child.referrer_id == tree.c.customer_id, tree.c.depth < max_depth)
+    )
+    return (
+        select(tree.c.root_id, tree.c.customer_id, func.min(tree.c.depth).label("depth"))
+        .where(tree.c.customer_id != tree.c.root_id)
+        .group_by(tree.c.root_id, tree.c.customer_id)
+        .subquery("referral_members")
+    )
+
+
+async def referral_ancestors(session: AsyncSession, customer_ids: Iterable[int]) -> set[int]:
+    """IDs of everyone up the referral chains of the given customers."""
+    customer_ids = list(set(customer_ids))
+    if not customer_ids:
+        return set()
+
+    chain = (
+        select(Customer.referrer_id.label("customer_id"), literal_column("1", Integer).label("depth"))
+        .where(Customer.id.in_(customer_ids), Customer.referrer_id.is_not(None))
+        .cte("referral_chain", recursive=True)
+    )
+    parent = aliased(Customer)
+    chain = chain.union_all(
+        select(parent.referrer_id, chain.c.depth + 1)
+        .where(
+            parent.id == chain.c.customer_id,
+            parent.referrer_id.is_not(None),
+            chain.c.depth < MAX_DEPTH,
+        )
+    )
+    return set((await session.exec(select(chain.c.customer_id).distinct())).all())
+
+
+async def link_referrals(
+    session: AsyncSession, customer_ids: Iterable[int] | None = None
+) -> list[int]:
+    """
+    Resolve ``referred_by`` NIDs to ``referrer_id`` where the referrer now exists.
+
+    Args:
+        session: Database session
+        customer_ids: Customers just written; only their own referrals and
+            those naming them as referrer are resolved. None resolves every
+            pending referral (scripts/rebuild_referral_stats.py).
+
+    Returns:
+        IDs of the customers linked by this call
+    """
+    referrer = aliased(Customer)
+    statement = (
+        select(Customer.id, referrer.id)
+        .join(referrer, referrer.nid == Customer.referred_by)
+        .where(
+            Customer.referrer_id.is_(None),
+            Customer.referred_by.is_not(None),
+            referrer.id != Customer.id,
+        )
+    )
+    if customer_ids is not None:
+        customer_ids = list(set(customer_ids))
+        if not customer_ids:
+            return []
+        written_nids = select(Customer.nid).where(Customer.id.in_(customer_ids))
+        statement = statement.where(
+            Customer.id.in_(customer_ids) | Customer.referred_by.in_(written_nids)
+        )
+    pairs = (await session.exec(statement)).all()
+    if pairs:
+        await session.exec(update(Customer), params=[
+            {"id": customer_id, "referrer_id": referrer_id}
+            for customer_id, referrer_id in pairs
+        ])
+    return [customer_id for customer_id, _ in pairs]
+
+
+async def detach_referrals(session: AsyncSession, customer_id: int) -> set[int]:
+    """
+    Unlink a customer whose NID or ``referred_by`` is about to change.
+
+    Clears its own link and the links of customers it referred, so the next
+    link_referrals() resolves them against the new values.
+
+    Returns:
+        IDs of the referrers whose rollups must be refreshed afterwards
+    """
+    stale = await referral_ancestors(session, [customer_id])
+    stale.add(customer_id)
+    await session.exec(
+        update(Customer)
+        .where((Customer.id == customer_id) | (Customer.referrer_id == customer_id))
+        .values(referrer_id=None)
+    )
+    return stale
+
+
+async def refresh_referral_stats(
+    session: AsyncSession,
+    referrer_ids: Iterable[int] | None = None,
+) -> None:
+    """
+    Recompute customer_referral_stats rows (all referrers when ``referrer_ids`` is None).
+
+    Referrers left without referrals lose their row; reads report zeros.
+    """
+    if referrer_ids is None:
+        roots = select(Customer.referrer_id).where(Customer.referrer_id.is_not(None)).distinct()
+        await session.exec(delete(CustomerReferralStats))
+    else:
+        roots = list(set(referrer_ids))
+        if not roots:
+            return
+        await session.exec(
+            delete(CustomerReferralStats).where(CustomerReferralStats.customer_id.in_(roots))
+        )
+
+    members = _descendants(roots)
+    approved = LoanApplication.is_approved
+    rollup = (
+        select(
+            members.c.root_id,
+            func.count(case((members.c.depth == 1, members.c.customer_id)).distinct()),
+            func.count(case((members.c.depth > 1, members.c.customer_id)).distinct()),
+            func.count(LoanApplication.id.distinct()),
+            func.count(case((approved, LoanApplication.id)).distinct()),
+            func.coalesce(func.sum(case((approved, LoanApplicationDetail.amount), else_=0)), 0),
+            literal(datetime.utcnow(), DateTime),
+        )
+        .select_from(members)
+        .outerjoin(
+            LoanApplication,
+            (LoanApplication.customer_id == members.c.customer_id) & LoanApplication.is_active,
+        )
+        .outerjoin(LoanApplicationDetail, LoanApplicationDetail.loan_application_id == LoanApplication.id)
+        .group_by(members.c.root_id)
+    )
+    upsert = _UPSERT_INSERTS.get(session.bind.dialect.name)
+    if upsert is None:
+        statement = insert(CustomerReferralStats).from_select(STATS_COLUMNS, rollup)
+    else:
+        statement = upsert(CustomerReferralStats).from_select(STATS_COLUMNS, rollup)
+        statement = statement.on_conflict_do_update(
+            index_elements=["customer_id"],
+            set_={column: statement.excluded[column] for column in STATS_COLUMNS[1:]},
+        )
+    await session.exec(statement)
+
+
+async def refresh_referrer_stats(
+    session: AsyncSession,
+    customer_ids: Iterable[int],
+    referrer_ids: Iterable[int] = (),
+) -> None:
+    """Refresh the rollups of everyone above the given customers (e.g. after a loan changed)."""
+    roots = await referral_ancestors(session, customer_ids)
+    await refresh_referral_stats(session, roots.union(referrer_ids))
+
+
+async def sync_referrals(
+    session: AsyncSession,
+    customer_ids: Iterable[int] = (),
+    referrer_ids: Iterable[int] = (),
+    written_ids: Iterable[int] | None = None,
+) -> list[int]:
+    """
+    Link the referrals around ``written_ids``, then refresh the rollups they and ``customer_ids`` affect.
+
+    Does not commit; call it in the transaction that wrote the customers.
+
+    Args:
+        session: Database session
+        customer_ids: Customers whose referrers must be refreshed anyway
+        referrer_ids: Referrers to refresh directly (see detach_referrals)
+        written_ids: Customers just created or updated; None links every
+            pending referral
+
+    Returns:
+        IDs of the customers linked by this call
+    """
+    linked = await link_referrals(session, written_ids)
+    await refresh_referrer_stats(session, [*linked, *customer_ids], referrer_ids)
+    return linked
+
+
+async def list_referral_tree(
+    session: AsyncSession,
+    customer_id: int,
+    page: int,
+    per_page: int,
+    max_depth: int = MAX_DEPTH,
+) -> PaginatedResponse[CustomerReferralNode] | None:
+    """
+    Page through everyone a customer referred, directly or indirectly.
+
+    Args:
+        session: Database session
+        customer_id: Referrer customer ID
+        page: Page number (1-based)
+        per_page: Items per page
+        max_depth: Deepest level to include (1 = direct referrals only)
+
+    Returns:
+        PaginatedResponse with the referred customers, shallowest first,
+        or None if the customer does not exist
+    """
+    if await session.get(Customer, customer_id) is None:
+        return None
+
+    members = _descendants([customer_id], max_depth)
+    total = (await session.exec(select(func.count()).select_from(members))).one()
+    rows = (await session.exec(
+        select(
+            Customer.id,
+            Customer.nid,
+            Customer.referrer_id,
+            Customer.created_at,
+            members.c.depth,
+            CustomerDetail.first_name,
+            CustomerDetail.last_name,
+        )
+        .join(members, members.c.customer_id == Customer.id)
+        .outerjoin(CustomerDetail, CustomerDetail.customer_id == Customer.id)
+        .order_by(members.c.depth, Customer.id)
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+    )).all()
+    items = [
+        CustomerReferralNode(
+            id=row.id,
+            nid=row.nid,
+            name=" ".join(filter(None, (row.first_name, row.last_name))),
+            referrer_id=row.referrer_id,
+            depth=row.depth,
+            created_at=row.created_at,
+        )
+        for row in rows
+    ]
+    return PaginatedResponse.create(items=items, total=total, page=page, per_page=per_page)
+
+
+async def get_referral_stats(
+    session: AsyncSession, customer_id: int
+) -> CustomerReferralStatsRead | None:
+    """Cached referral rollup of a customer (zeros if it referred nobody, None if not found)."""
+    if await session.get(Customer, customer_id) is None:
+        return None
+    stats = await session.get(CustomerReferralStats, customer_id)
+    if stats is None:
+        return CustomerReferralStatsRead(customer_id=customer_id)
+    return CustomerReferralStatsRead(
+        customer_id=customer_id,
+        direct_count=stats.direct_count,
+        indirect_count=stats.indirect_count,
+        total_count=stats.direct_count + stats.indirect_count,
+        applications_count=stats.applications_count,
+        approved_count=stats.approved_count,
+        approval_rate=(
+            stats.approved_count / stats.applications_count if stats.applications_count else None
+        ),
+        approved_amount=stats.approved_amount,
+        refreshed_at=stats.refreshed_at,
+    )
@@ -6,8 +6,6 @@ from pathlib import Path
 from typing import Optional
 
 import aiofiles
-import boto3
-from botocore.config import Config
 from app.core.config import settings
 
 
@@ -62,16 +60,30 @@ class R2StorageService(AbstractStorageService):
     """Cloudflare R2 storage implementation (S3 compatible)."""
 
     def __init__(self):
-        self.s3 = boto3.client(
-            "s3",
-            endpoint_url=f"https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com",
-            aws_access_key_id=settings.R2_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
-            config=Config(signature_version="s3v4"),
-            region_name="auto",
-        )
+        self._s3 = None
         self.bucket = settings.R2_BUCKET_NAME
 
+    @property
+    def s3(self):
+        """S3 client, created on first use.
+
+        boto3 takes ~100 ms to import, so it is only loaded by workers that
+        actually talk to R2.
+        """
+        if self._s3 is None:
+            import boto3
+            from botocore.config import Config
+
+            self._s3 = boto3.client(
+                "s3",
+                endpoint_url=f"https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com",
+                aws_access_key_id=settings.R2_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
+                config=Config(signature_version="s3v4"),
+                region_name="auto",
+            )
+        return self._s3
+
     async def upload(self, file_content: bytes, key: str, content_type: str) -> str:
         self.s3.put_object(
             Bucket=self.bucket,
@@ -0,0 +1,75 @@
+"""
+Accent-insensitive trigram matching for name search.
+
+PostgreSQL serves name search with ``pg_trgm`` and ``unaccent`` (see
+migration 0003). These are pure-Python equivalents of the two SQL functions
+the search uses, ``search_key`` and ``similarity``, registered on SQLite
+connections so the same queries run against the test database.
+"""
+import unicodedata
+
+# pg_trgm's default pg_trgm.similarity_threshold
+SIMILARITY_THRESHOLD = 0.3
+
+
+def search_key(value: str | None) -> str | None:
+    """Lowercase and strip accents ("Ramírez" -> "ramirez"), like the SQL function."""
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def trigrams(value: str) -> set[str]:
+    """Trigrams the way pg_trgm extracts them: per word, padded "  " + word + " "."""
+    result = set()
+    for word in "".join(c if c.isalnum() else " " for c in value.lower()).split():
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def similarity(left: str | None, right: str | None) -> float | None:
+    """Share of trigrams two strings have in common (0..1), like pg_trgm's similarity()."""
+    if left is None or right is None:
+        return None
+    left_trigrams, right_trigrams = trigrams(left), trigrams(right)
+    union = left_trigrams | right_trigrams
+    if not union:
+        return 0.0
+    return len(left_trigrams & right_trigrams) / len(union)
+
+
+_SOUNDEX_CODES = {
+    letter: str(code)
+    for code, letters in enumerate(("aeiouy", "bfpv", "cgjkqsxz", "dt", "l", "mn", "r"))
+    for letter in letters
+}
+
+
+def soundex(value: str | None) -> str | None:
+    """
+    American Soundex of the first word, accent-insensitive ("Rodríguez" -> "R362").
+
+    Coarse on purpose: it is a blocking key for duplicate detection, so
+    spelling variants ("Rodríguez", "Rodrigues") land in the same block.
+    """
+    word = next(iter("".join(c if c.isalpha() else " " for c in search_key(value) or "").split()), None)
+    if word is None:
+        return None
+    codes = []
+    previous = _SOUNDEX_CODES.get(word[0])
+    for letter in word[1:]:
+        if letter in "hw":
+            continue  # h and w do not separate letters with the same code
+        code = _SOUNDEX_CODES.get(letter)
+        if code and code != "0" and code != previous:
+            codes.append(code)
+        previous = code
+    return (word[0].upper() + "".join(codes) + "000")[:4]
+
+
+def register_sqlite_functions(dbapi_connection) -> None:
+    """Make ``search_key`` and ``similarity`` callable from SQLite SQL."""
+    dbapi_connection.create_function("search_key", 1, search_key, deterministic=True)
+    dbapi_connection.create_function("similarity", 2, similarity, deterministic=True)
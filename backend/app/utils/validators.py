@@ -2,6 +2,7 @@
 Validation utilities for Dominican Republic data standards.
 """
 import re
+from typing import Iterable
 
 
 def validate_dominican_nid(nid: str) -> bool:
@@ -19,29 +20,70 @@ def validate_dominican_nid(nid: str) -> bool:
     """
     if not nid:
         return False
-    
-    cleaned = re.sub(r"\D", "", nid)
-    if len(cleaned) != 11:
-        return False
-    
+
+    cleaned = _clean_nid(nid)
+    return len(cleaned) == 11 and _has_valid_check_digit(cleaned)
+
+
+# Luhn weights 1,2,1,2,... applied through byte translation tables, so a
+# checksum is two slices, one translate and two sums, all in C.
+# Digits at weight 1 contribute themselves, digits at weight 2 the digit sum
+# of their double; the tables map ASCII digits to those contributions.
+_SINGLE = bytes.maketrans(b"0123456789", bytes(range(10)))
+_DOUBLED = bytes.maketrans(b"0123456789", bytes((2 * d) // 10 + (2 * d) % 10 for d in range(10)))
+_NON_DIGIT = re.compile(r"\D")
+
+
+def _clean_nid(nid: str) -> str:
+    if nid.isascii() and nid.isdigit():
+        return nid
+    return _NON_DIGIT.sub("", nid)
+
+
+def _ascii_digits(cleaned: str) -> str:
+    """\\d also matches other scripts' digits; int() reads them all."""
+    return cleaned if cleaned.isascii() else "".join(str(int(ch)) for ch in cleaned)
+
+
+def _has_valid_check_digit(cleaned: str) -> bool:
+    """Checksum of an 11-character digit string."""
     # Reject uniform repeated digits (00000000000, 11111111111, etc.)
-    if re.match(r"^(\d)\1{10}$", cleaned):
+    if cleaned == cleaned[0] * 11:
         return False
-    
-    multipliers = [1, 2, 1, 2, 1, 2, 1, 2, 1, 2]
-    total = 0
-    
-    for i in range(10):
-        digit = int(cleaned[i])
-        prod = digit * multipliers[i]
-        if prod >= 10:
-            prod = (prod // 10) + (prod % 10)
-        total += prod
-    
-    check_digit = (10 - (total % 10)) % 10
-    actual_check_digit = int(cleaned[10])
-    
-    return check_digit == actual_check_digit
+
+    digits = _ascii_digits(cleaned).encode("ascii")
+    total = sum(digits[0:10:2].translate(_SINGLE)) + sum(digits[1:10:2].translate(_DOUBLED))
+    return (10 - total % 10) % 10 == digits[10] - 48
+
+
+def validate_dominican_nids(nids: Iterable[str | None]) -> list[str | None]:
+    """
+    Validate many Cédulas at once (CSV imports, back-office reconciliations).
+
+    Same rules as validate_dominican_nid; already clean values skip the
+    regex, and the checksum never loops over digits in Python.
+
+    Args:
+        nids: National IDs to validate (with or without dashes)
+
+    Returns:
+        For each input, the cleaned 11-digit NID if valid, None otherwise
+
+    Examples:
+        >>> validate_dominican_nids(["001-0000002-5", "00100000022", None])
+        ['00100000025', None, None]
+    """
+    results: list[str | None] = []
+    for nid in nids:
+        if not nid:
+            results.append(None)
+            continue
+        cleaned = _clean_nid(nid)
+        results.append(
+            _ascii_digits(cleaned)
+            if len(cleaned) == 11 and _has_valid_check_digit(cleaned) else None
+        )
+    return results
 
 
 def validate_dominican_phone(phone: str) -> bool:
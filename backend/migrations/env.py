@@ -0,0 +1,74 @@
+"""
+Alembic environment.
+
+Migrations run in one of two ways:
+
+* From the CLI (``alembic upgrade head``): a sync engine is built from
+  ``DATABASE_URL``.
+* From the app at startup (``app.core.database.init_db``): the caller passes
+  an open connection through ``config.attributes["connection"]``.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+from sqlmodel import SQLModel
+
+import app.models  # noqa: F401 - Register models in metadata
+from app.core.config import settings
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = SQLModel.metadata
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    # The trigram name-search indexes (0003) are PostgreSQL expression indexes
+    # written by hand, not declared on the models; keep autogenerate off them.
+    if type_ == "index" and reflected and compare_to is None and name.endswith("_trgm"):
+        return False
+    return True
+
+
+def _configure(**kwargs) -> None:
+    context.configure(
+        target_metadata=target_metadata,
+        include_object=include_object,
+        compare_type=True,
+        render_as_batch=True,  # SQLite needs batch mode for ALTERs
+        # One transaction per revision, so a revision can leave it for an
+        # autocommit block (CREATE INDEX CONCURRENTLY)
+        transaction_per_migration=True,
+        **kwargs,
+    )
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout instead of running it (``alembic upgrade --sql``)."""
+    _configure(url=settings.DATABASE_URL, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = create_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
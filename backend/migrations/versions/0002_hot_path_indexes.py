@@ -0,0 +1,88 @@
+"""hot path indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 20:14:59.174316
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _drop_invalid_index(name: str) -> None:
+    """
+    Drop an INVALID index left behind by a failed concurrent build, so the
+    IF NOT EXISTS below rebuilds it instead of skipping it.
+    """
+    invalid = op.get_bind().execute(
+        sa.text(
+            'SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid '
+            'WHERE pg_class.relname = :name AND NOT pg_index.indisvalid'
+        ),
+        {'name': name},
+    ).first()
+    if invalid:
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def _create_index(table: str, name: str, columns: list[str], **kw) -> None:
+    """
+    Index a live table: CREATE INDEX CONCURRENTLY on PostgreSQL (no write
+    lock while it builds, so outside a transaction), batch mode elsewhere.
+
+    A rerun after an interrupted build replaces the INVALID leftover and
+    keeps the indexes that did finish.
+    """
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            _drop_invalid_index(name)
+            op.create_index(
+                name, table, columns, postgresql_concurrently=True, if_not_exists=True, **kw
+            )
+    else:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(name, columns, **kw)
+
+
+def upgrade() -> None:
+    _create_index('addressables', 'ix_addressables_addressable', ['addressable_type', 'addressable_id'], unique=False)
+    _create_index('customer_documents', 'ix_customer_documents_latest', ['customer_id', 'document_type'], unique=False, postgresql_where=sa.text('is_latest'), sqlite_where=sa.text('is_latest'))
+    _create_index('customers', 'ix_customers_id_active', ['id'], unique=False, postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active'))
+    _create_index('loan_application_details', 'ix_loan_application_details_loan_application_id', ['loan_application_id'], unique=False)
+    _create_index('loan_application_notes', 'ix_loan_application_notes_loan_application_id_created_at', ['loan_application_id', 'created_at'], unique=False)
+    _create_index('loan_applications', 'ix_loan_applications_customer_id_active', ['customer_id'], unique=False, postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active'))
+    _create_index('phones', 'ix_phones_phoneable', ['phoneable_type', 'phoneable_id'], unique=False)
+
+
+def downgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    with op.batch_alter_table('phones', schema=None) as batch_op:
+        batch_op.drop_index('ix_phones_phoneable')
+
+    with op.batch_alter_table('loan_applications', schema=None) as batch_op:
+        batch_op.drop_index('ix_loan_applications_customer_id_active', postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active'))
+
+    with op.batch_alter_table('loan_application_notes', schema=None) as batch_op:
+        batch_op.drop_index('ix_loan_application_notes_loan_application_id_created_at')
+
+    with op.batch_alter_table('loan_application_details', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_loan_application_details_loan_application_id'))
+
+    with op.batch_alter_table('customers', schema=None) as batch_op:
+        batch_op.drop_index('ix_customers_id_active', postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active'))
+
+    with op.batch_alter_table('customer_documents', schema=None) as batch_op:
+        batch_op.drop_index('ix_customer_documents_latest', postgresql_where=sa.text('is_latest'), sqlite_where=sa.text('is_latest'))
+
+    with op.batch_alter_table('addressables', schema=None) as batch_op:
+        batch_op.drop_index('ix_addressables_addressable')
+
+    # ### end Alembic commands ###
@@ -0,0 +1,73 @@
+"""customer name trigram search
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 22:41:07.318204
+
+PostgreSQL only: enables pg_trgm and unaccent, adds the immutable
+``search_key(text)`` function (lowercase + unaccent) and GIN trigram indexes
+over ``search_key(...)`` of the customer name columns. SQLite gets Python
+versions of the functions at connect time (``app.utils.text_search``) and
+needs no schema change.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NAME_COLUMNS = ('first_name', 'last_name', 'nickname')
+
+
+def _drop_invalid_index(name: str) -> None:
+    """
+    Drop an INVALID index left behind by a failed concurrent build, so the
+    IF NOT EXISTS below rebuilds it instead of skipping it.
+    """
+    invalid = op.get_bind().execute(
+        sa.text(
+            'SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid '
+            'WHERE pg_class.relname = :name AND NOT pg_index.indisvalid'
+        ),
+        {'name': name},
+    ).first()
+    if invalid:
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    # unaccent() is only STABLE; pinning the dictionary makes an IMMUTABLE
+    # wrapper that expression indexes accept.
+    op.execute(
+        "CREATE OR REPLACE FUNCTION search_key(text) RETURNS text "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS "
+        "$$ SELECT lower(public.unaccent('public.unaccent'::regdictionary, $1)) $$"
+    )
+    # CONCURRENTLY keeps customer_details writable while the GIN indexes
+    # build; it cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for column in NAME_COLUMNS:
+            _drop_invalid_index(f'ix_customer_details_{column}_trgm')
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_customer_details_{column}_trgm '
+                f'ON customer_details USING gin (search_key({column}) gin_trgm_ops)'
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for column in NAME_COLUMNS:
+        op.execute(f'DROP INDEX IF EXISTS ix_customer_details_{column}_trgm')
+    op.execute('DROP FUNCTION IF EXISTS search_key(text)')
@@ -0,0 +1,107 @@
+"""
+Benchmark — streaming customer export (GET /customers/export).
+
+Seeds a throwaway SQLite database with N customers (1M by default) and
+drains ``stream_customer_export`` into a byte counter, reporting:
+
+  * rows/s and MB/s of encoded output
+  * peak Python heap allocated while streaming (tracemalloc), which should
+    stay flat as --rows grows; tracing slows the run, so read rows/s as a
+    lower bound
+
+Pass --database-url to stream from an existing, already populated database
+(e.g. a PostgreSQL staging copy) instead; nothing is written to it.
+
+Usage:
+    .venv/bin/python scripts/benchmark_customer_export.py [--rows N] [--format csv|ndjson]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.models  # noqa: E402,F401  (registers every table)
+from app.core.database import get_async_database_url  # noqa: E402
+from app.models.customer import Customer, CustomerDetail  # noqa: E402
+from app.schemas.customer import CustomerFilterSchema  # noqa: E402
+from app.services.customer_service import stream_customer_export  # noqa: E402
+
+SEED_BATCH = 50_000
+
+
+def seed(path: str, rows: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        for start in range(1, rows + 1, SEED_BATCH):
+            ids = range(start, min(start + SEED_BATCH, rows + 1))
+            session.exec(insert(Customer), params=[
+                {"id": i, "nid": f"{i:011d}", "is_active": True, "is_assigned": False,
+                 "created_at": now, "updated_at": now}
+                for i in ids
+            ])
+            session.exec(insert(CustomerDetail), params=[
+                {"customer_id": i, "first_name": f"Nombre{i}", "last_name": "Apellido",
+                 "email": f"cliente{i}@example.com", "created_at": now, "updated_at": now}
+                for i in ids
+            ])
+        session.commit()
+    engine.dispose()
+
+
+async def drain(database_url: str, export_format: str) -> tuple[int, int, float, int]:
+    engine = create_async_engine(database_url)
+    lines = size = 0
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    async with AsyncSession(engine) as session:
+        async for chunk in stream_customer_export(session, CustomerFilterSchema(), export_format):
+            size += len(chunk)
+            lines += chunk.count(b"\n")
+    elapsed = time.perf_counter() - started_at
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await engine.dispose()
+    rows = lines - 1 if export_format == "csv" else lines
+    return rows, size, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+    parser.add_argument("--database-url", help="Stream from this database instead of seeding one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.database_url:
+            database_url = get_async_database_url(args.database_url)
+        else:
+            path = os.path.join(tmp, "export.db")
+            started_at = time.perf_counter()
+            seed(path, args.rows)
+            print(f"Seeded {args.rows:,} customers in {time.perf_counter() - started_at:.1f}s")
+            database_url = f"sqlite+aiosqlite:///{path}"
+
+        rows, size, elapsed, peak = asyncio.run(drain(database_url, args.format))
+
+    print(f"Exported {rows:,} rows as {args.format}: {size / 1e6:,.1f} MB in {elapsed:.1f}s")
+    print(f"  {rows / elapsed:,.0f} rows/s, {size / 1e6 / elapsed:,.1f} MB/s")
+    print(f"  peak traced memory while streaming: {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark — BaseHTTPMiddleware vs pure-ASGI TenantMiddleware.
+
+Runs the same FastAPI app behind each middleware in-process (httpx
+ASGITransport, no network, no database) and reports per-request latency for:
+
+  * GET /health
+  * GET a paginated list (50 items per page)
+  * POST a 20 MB multipart upload
+
+The tenant lookup is served from the cache in both variants, so the numbers
+isolate the cost of the middleware plumbing itself.
+
+Usage:
+    .venv/bin/python scripts/benchmark_tenant_middleware.py [--iterations N]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI, UploadFile
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.middlewares.tenant_middleware import (  # noqa: E402
+    TenantMiddleware,
+    resolve_tenant_config,
+)
+from app.core.tenant_cache import tenant_config_cache  # noqa: E402
+
+TENANT_ID = "Benchmark Tenant"
+UPLOAD_SIZE = 20 * 1024 * 1024
+
+
+class LegacyTenantMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware-based implementation."""
+
+    async def dispatch(self, request: Request, call_next):
+        tenant_id = request.headers.get("X-Tenant-ID")
+        request.state.tenant_config = await resolve_tenant_config(tenant_id)
+        return await call_next(request)
+
+
+def build_app(middleware_class) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.get("/items")
+    async def items(page: int = 1, per_page: int = 50):
+        start = (page - 1) * per_page
+        return {
+            "items": [
+                {"id": i, "name": f"Item {i}", "amount": 100000.0, "status": "received"}
+                for i in range(start, start + per_page)
+            ],
+            "total": 10_000,
+            "page": page,
+            "per_page": per_page,
+        }
+
+    @app.post("/upload")
+    async def upload(file: UploadFile):
+        size = 0
+        while chunk := await file.read(1024 * 1024):
+            size += len(chunk)
+        return {"size": size}
+
+    app.add_middleware(middleware_class)
+    return app
+
+
+async def time_requests(client: httpx.AsyncClient, iterations: int, **request) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = await client.request(**request)
+        samples.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return samples
+
+
+async def run(iterations: int):
+    tenant_config_cache.set(TENANT_ID, {"tenant_name": TENANT_ID, "tenant_type": "FINANCIERA"})
+    payload = os.urandom(UPLOAD_SIZE)
+    headers = {"X-Tenant-ID": TENANT_ID}
+
+    scenarios = [
+        ("GET /health", dict(method="GET", url="/health"), iterations),
+        ("GET /items (page of 50)", dict(method="GET", url="/items", params={"page": 3}), iterations),
+        (
+            "POST /upload (20 MB)",
+            dict(method="POST", url="/upload", files={"file": ("blob.bin", payload)}),
+            max(iterations // 50, 5),
+        ),
+    ]
+    variants = [
+        ("BaseHTTPMiddleware", LegacyTenantMiddleware),
+        ("pure ASGI", TenantMiddleware),
+    ]
+
+    print(f"{'scenario':<26}{'middleware':<20}{'median ms':>12}{'p95 ms':>12}")
+    for label, request, count in scenarios:
+        for name, middleware_class in variants:
+            transport = httpx.ASGITransport(app=build_app(middleware_class))
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench", headers=headers
+            ) as client:
+                await time_requests(client, 3, **request)  # warm-up
+                samples = await time_requests(client, count, **request)
+            samples.sort()
+            median = statistics.median(samples) * 1000
+            p95 = samples[int(len(samples) * 0.95) - 1] * 1000
+            print(f"{label:<26}{name:<20}{median:>12.3f}{p95:>12.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
@@ -1,8 +1,8 @@
 
 from app.core.security import get_password_hash
 from app.models.user import User
-from app.core.database import engine
-from sqlmodel import SQLModel, Session, select
+from app.core.database import engine, run_migrations
+from sqlmodel import Session, select
 import sys
 import os
 
@@ -11,8 +11,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 def init_db():
-    print("Creating tables...")
-    SQLModel.metadata.create_all(engine)
+    print("Applying migrations...")
+    with engine.connect() as connection:
+        run_migrations(connection)
 
     with Session(engine) as session:
         # Check if user exists
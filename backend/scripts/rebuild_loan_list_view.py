@@ -0,0 +1,63 @@
+"""
+Script to rebuild or check the loan_list_view read model.
+
+Without options the table is repopulated from the source tables. With
+--check it only lists loans whose row is missing or outdated (exit status 1
+when there are any); add --repair to rewrite just those rows. Meant to run
+from cron as a consistency check, or by hand after a data fix done in SQL.
+
+Usage:
+    uv run python scripts/rebuild_loan_list_view.py [--check [--repair]]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import Session  # noqa: E402
+
+from app.core.database import engine  # noqa: E402
+from app.services.loan_list_view import (  # noqa: E402
+    find_stale_loan_list_rows,
+    rebuild_loan_list_view,
+    refresh_loan_list_view_sync,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild or check the loan list read model.")
+    parser.add_argument(
+        "--check", action="store_true", help="List stale rows instead of rebuilding"
+    )
+    parser.add_argument(
+        "--repair", action="store_true", help="With --check, rewrite the stale rows"
+    )
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+    with Session(engine) as session:
+        if not args.check:
+            rows = rebuild_loan_list_view(session)
+            print(f"✅ Rebuilt loan_list_view in {time.perf_counter() - started_at:.1f}s: {rows} rows")
+            return
+
+        stale = find_stale_loan_list_rows(session)
+        if not stale:
+            print(f"✅ loan_list_view is consistent ({time.perf_counter() - started_at:.1f}s)")
+            return
+
+        print(f"⚠️  {len(stale)} stale loan_list_view rows: {', '.join(map(str, stale[:50]))}"
+              f"{' ...' if len(stale) > 50 else ''}")
+        if args.repair:
+            refresh_loan_list_view_sync(session, loan_ids=stale)
+            session.commit()
+            print(f"✅ Rewrote {len(stale)} rows")
+        else:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
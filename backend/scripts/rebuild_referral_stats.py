@@ -0,0 +1,47 @@
+"""
+Script to rebuild the referral graph and every referrer's rollup.
+
+The API keeps customer_referral_stats up to date as customers and loans are
+written; run this once after migration 0005, and after bulk changes made
+outside the API (SQL fixes, restores).
+
+Usage:
+    uv run python scripts/rebuild_referral_stats.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import func, select  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from app.core.database import async_engine  # noqa: E402
+from app.models.customer_referral_stats import CustomerReferralStats  # noqa: E402
+from app.services.referral_service import link_referrals, refresh_referral_stats  # noqa: E402
+
+
+async def rebuild() -> tuple[int, int]:
+    async with AsyncSession(async_engine) as session:
+        linked = await link_referrals(session)
+        await refresh_referral_stats(session)
+        await session.commit()
+        referrers = (await session.exec(select(func.count()).select_from(CustomerReferralStats))).one()
+    await async_engine.dispose()
+    return len(linked), referrers
+
+
+def main() -> None:
+    started_at = time.perf_counter()
+    linked, referrers = asyncio.run(rebuild())
+    print(
+        f"✅ Linked {linked} referrals and rebuilt {referrers} referrer rollups "
+        f"in {time.perf_counter() - started_at:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
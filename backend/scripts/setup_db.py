@@ -8,8 +8,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.models import *
-from sqlmodel import Session, select, SQLModel
-from app.core.database import engine
+from sqlmodel import Session, select
+from app.core.database import engine, run_migrations
 from app.core.security import get_password_hash
 from app.models.user import User
 
@@ -17,8 +17,9 @@ from app.models.user import User
 
 
 def setup():
-    print("🛠️  Initializing database schema...")
-    SQLModel.metadata.create_all(engine)
+    print("🛠️  Applying database migrations...")
+    with engine.connect() as connection:
+        run_migrations(connection)
 
     with Session(engine) as session:
         # Check if default user exists
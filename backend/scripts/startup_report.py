@@ -0,0 +1,124 @@
+"""
+Startup report — how long a worker takes to import the app.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter
+(several times, keeping the fastest run), parses the timing lines from
+stderr and prints:
+
+  * total wall time of the import and the cumulative time of app.main
+  * the slowest modules by cumulative import time
+  * self time summed per top-level package (fastapi, sqlalchemy, app, ...)
+
+Use ``--json`` to get a machine-readable report that can be stored per
+release to track worker boot time over time.
+
+Usage:
+    .venv/bin/python scripts/startup_report.py [--runs 3] [--top 20] [--json]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)$")
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """Parse ``-X importtime`` output into self/cumulative microseconds per module."""
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, name = match.groups()
+        modules.append({
+            "module": name,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    return modules
+
+
+def measure_once() -> tuple[float, list[dict]]:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    return wall_ms, parse_importtime(result.stderr)
+
+
+def build_report(wall_ms: float, modules: list[dict], top: int) -> dict:
+    by_package: dict[str, int] = defaultdict(int)
+    for module in modules:
+        # Self times never overlap, so they add up to where the time really goes
+        by_package[module["module"].split(".")[0]] += module["self_us"]
+
+    app_main = next((m for m in modules if m["module"] == "app.main"), None)
+    slowest = sorted(modules, key=lambda m: m["cumulative_us"], reverse=True)[:top]
+
+    return {
+        "python": sys.version.split()[0],
+        "wall_ms": round(wall_ms, 1),
+        "app_main_cumulative_ms": round(app_main["cumulative_us"] / 1000, 1) if app_main else None,
+        "modules_imported": len(modules),
+        "slowest_modules": [
+            {
+                "module": m["module"],
+                "cumulative_ms": round(m["cumulative_us"] / 1000, 1),
+                "self_ms": round(m["self_us"] / 1000, 1),
+            }
+            for m in slowest
+        ],
+        "packages_ms": {
+            package: round(us / 1000, 1)
+            for package, us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"🐍  Python {report['python']} — {report['modules_imported']} modules imported")
+    print(f"⏱️   Wall time: {report['wall_ms']:.1f} ms "
+          f"(app.main cumulative: {report['app_main_cumulative_ms']} ms)")
+
+    print("\nSlowest modules (cumulative ms / self ms):")
+    for m in report["slowest_modules"]:
+        print(f"  {m['cumulative_ms']:>9.1f}  {m['self_ms']:>8.1f}  {m['module']}")
+
+    print("\nTop-level packages (self ms):")
+    for package, ms in list(report["packages_ms"].items())[:15]:
+        print(f"  {ms:>9.1f}  {package}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3, help="keep the fastest of N runs")
+    parser.add_argument("--top", type=int, default=20, help="number of slow modules to list")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    wall_ms, modules = min((measure_once() for _ in range(args.runs)), key=lambda run: run[0])
+    report = build_report(wall_ms, modules, args.top)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session, select
+from app.core import security
+from app.core.auth_cache import user_cache
+from app.core.cache import MISSING, LRUTTLCache
+from app.core.security import create_access_token, decode_token, token_cache
+from app.models.user import User
+
+
+def _count_user_queries(async_engine: AsyncEngine) -> list[str]:
+    statements = []
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    return statements
+
+
+def test_current_user_is_cached_between_requests(
+    client: TestClient, auth_headers: dict, async_engine: AsyncEngine
+):
+    statements = _count_user_queries(async_engine)
+
+    for _ in range(5):
+        response = client.get("/api/v1/auth/me", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["email"] == "test@example.com"
+
+    assert len(statements) == 1
+
+
+def test_revoking_approval_evicts_cached_user(
+    client: TestClient, auth_headers: dict, session: Session
+):
+    assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+
+    user = session.exec(select(User).where(User.email == "test@example.com")).one()
+    user.is_approved = False
+    session.add(user)
+    session.commit()
+
+    assert user_cache.get(str(user.id)) is MISSING
+    assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 403
+
+
+def test_repeated_token_skips_signature_check(monkeypatch):
+    token_cache.clear()
+    calls = []
+    original_decode = security.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return original_decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    token = create_access_token(subject=42)
+
+    assert decode_token(token)["sub"] == "42"
+    assert decode_token(token)["sub"] == "42"
+    assert len(calls) == 1
+    token_cache.clear()
+
+
+def test_invalid_token_is_not_cached():
+    token_cache.clear()
+
+    assert decode_token("not-a-jwt") is None
+    assert token_cache.get("not-a-jwt") is MISSING
+
+
+def test_lru_ttl_cache_evicts_oldest_and_expired():
+    now = [0.0]
+    cache = LRUTTLCache(maxsize=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+
+    cache.set("short", 4, ttl_seconds=2)
+    now[0] = 2.0
+    assert cache.get("short") is MISSING
+
+    cache.set("d", 5)
+    now[0] = 10.0
+    assert cache.get("a") is MISSING
+    assert cache.get("d") == 5
@@ -0,0 +1,163 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.cache_backend import (
+    CacheBackendError,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    create_cache_backend,
+)
+from app.models.customer import Customer, CustomerDetail
+from app.models.portfolio import Portfolio
+from app.services import customer_cache
+from app.services.customer_cache import invalidate_customers, read_through_customer
+
+
+def _seed_customer(session: Session) -> Customer:
+    customer = Customer(nid="00100000021", is_active=True, is_assigned=False)
+    session.add(customer)
+    session.flush()
+    session.add(CustomerDetail(customer_id=customer.id, first_name="Cache", last_name="Me"))
+    session.commit()
+    return customer
+
+
+def test_repeated_reads_are_served_from_cache(
+    client: TestClient, session: Session, auth_headers: dict, assert_max_queries
+):
+    customer = _seed_customer(session)
+    first = client.get(f"/api/v1/customers/{customer.id}", headers=auth_headers)
+
+    with assert_max_queries(0):
+        second = client.get(f"/api/v1/customers/{customer.id}", headers=auth_headers)
+
+    assert second.status_code == 200
+    assert second.json() == first.json()
+
+
+def test_update_bumps_cached_version(
+    client: TestClient, session: Session, auth_headers: dict
+):
+    customer = _seed_customer(session)
+    client.get(f"/api/v1/customers/{customer.id}", headers=auth_headers)
+
+    client.put(
+        f"/api/v1/customers/{customer.id}",
+        json={"detail": {"first_name": "Fresh"}},
+        headers=auth_headers,
+    )
+    response = client.get(f"/api/v1/customers/{customer.id}", headers=auth_headers)
+
+    assert response.json()["detail"]["first_name"] == "Fresh"
+
+
+def test_assign_bumps_cached_version(
+    client: TestClient, session: Session, auth_headers: dict
+):
+    customer = _seed_customer(session)
+    portfolio = Portfolio(name="Cartera Norte")
+    session.add(portfolio)
+    session.commit()
+    client.get(f"/api/v1/customers/{customer.id}", headers=auth_headers)
+
+    client.patch(
+        f"/api/v1/customers/{customer.id}/assign",
+        params={"portfolio_id": portfolio.id},
+        headers=auth_headers,
+    )
+    response = client.get(f"/api/v1/customers/{customer.id}", headers=auth_headers)
+
+    assert response.json()["portfolio_id"] == portfolio.id
+    assert response.json()["is_assigned"] is True
+
+
+async def test_memory_backend_drops_idle_counters():
+    now = [0.0]
+    backend = MemoryCacheBackend(maxsize=10, ttl_seconds=10, clock=lambda: now[0])
+    await backend.incr("busy")
+    await backend.incr("idle")
+    await backend.set("value", b"cached", 10)
+
+    now[0] = 15.0
+    assert await backend.get("busy") == b"1"  # reading keeps a counter alive
+    now[0] = 25.0
+    assert await backend.get("busy") == b"1"
+    # Idle for twice the value TTL: dropped, and values cached meanwhile expired
+    assert await backend.get("idle") is None
+    assert await backend.get("value") is None
+    assert list(backend._counters) == ["busy"]
+    assert await backend.incr("idle") == 1
+
+
+async def _serve_fake_redis(store: dict):
+    """A Redis-protocol stand-in understanding the commands the backend sends."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        while True:
+            header = await reader.readline()
+            if not header:
+                break
+            args = []
+            for _ in range(int(header[1:])):
+                length = int((await reader.readline())[1:])
+                args.append((await reader.readexactly(length + 2))[:-2])
+            command = args[0].upper()
+            if command == b"GET":
+                value = store.get(args[1])
+                writer.write(b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value))
+            elif command == b"SET":
+                store[args[1]] = args[2]
+                writer.write(b"+OK\r\n")
+            elif command == b"INCR":
+                store[args[1]] = b"%d" % (int(store.get(args[1], b"0")) + 1)
+                writer.write(b":%s\r\n" % store[args[1]])
+            elif command == b"EXPIRE":
+                store[b"ttl:" + args[1]] = args[2]
+                writer.write(b":%d\r\n" % (args[1] in store))
+            else:
+                writer.write(b"+OK\r\n")
+            await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def test_redis_backend_round_trip():
+    store = {}
+    server = await _serve_fake_redis(store)
+    port = server.sockets[0].getsockname()[1]
+    backend = create_cache_backend(f"redis://127.0.0.1:{port}/2", maxsize=1, ttl_seconds=1)
+
+    assert isinstance(backend, RedisCacheBackend)
+    assert await backend.get("missing") is None
+    await backend.set("k", b"value\r\nwith crlf", 60)
+    assert await backend.get("k") == b"value\r\nwith crlf"
+    assert await backend.incr("n") == 1
+    assert await backend.incr("n") == 2
+    assert await backend.get_counter("n") == 2
+    assert await backend.get_counter("unset") == 0
+    # Counters expire like the memory backend's: twice the value TTL after last use
+    assert store[b"ttl:n"] == b"2"
+
+    await backend.close()
+    server.close()
+    await server.wait_closed()
+
+
+async def test_cache_outage_falls_back_to_loader(monkeypatch):
+    backend = RedisCacheBackend("redis://127.0.0.1:1", ttl_seconds=60, timeout=0.5)
+    monkeypatch.setattr(customer_cache, "customer_cache_backend", backend)
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return None
+
+    assert await read_through_customer(7, load) is None
+    await invalidate_customers(7)  # logged, not raised
+    assert loads == [1]
+    with pytest.raises(CacheBackendError):
+        await backend.get("anything")
@@ -0,0 +1,61 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.customer import Customer, CustomerDetail
+from app.models.customer_duplicate import CustomerDuplicateCandidate, DuplicateStatus
+
+
+def _seed_pair(session: Session) -> CustomerDuplicateCandidate:
+    ids = []
+    for nid, first_name in (("00100000025", "Juan"), ("00100000026", "Juan Carlos")):
+        customer = Customer(nid=nid)
+        session.add(customer)
+        session.flush()
+        session.add(CustomerDetail(customer_id=customer.id, first_name=first_name, last_name="Pérez"))
+        ids.append(customer.id)
+    candidate = CustomerDuplicateCandidate(
+        customer_id=ids[0], duplicate_customer_id=ids[1], score=0.8, matched_on=["phone", "name"]
+    )
+    session.add(candidate)
+    session.commit()
+    return candidate
+
+
+def test_list_pending_duplicates(client: TestClient, session: Session, auth_headers: dict):
+    candidate = _seed_pair(session)
+
+    response = client.get("/api/v1/customers/duplicates", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    item = data["items"][0]
+    assert item["id"] == candidate.id
+    assert (item["customer_nid"], item["duplicate_customer_nid"]) == ("00100000025", "00100000026")
+    assert item["duplicate_customer_name"] == "Juan Carlos Pérez"
+    assert item["matched_on"] == ["phone", "name"]
+
+
+def test_review_duplicate_moves_it_out_of_pending(
+    client: TestClient, session: Session, auth_headers: dict
+):
+    candidate = _seed_pair(session)
+
+    response = client.patch(
+        f"/api/v1/customers/duplicates/{candidate.id}",
+        json={"status": "DISMISSED"},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["status"] == DuplicateStatus.DISMISSED
+    assert response.json()["reviewed_by"] is not None
+    pending = client.get("/api/v1/customers/duplicates", headers=auth_headers).json()
+    dismissed = client.get(
+        "/api/v1/customers/duplicates", params={"status": "DISMISSED"}, headers=auth_headers
+    ).json()
+    assert pending["total"] == 0
+    assert [item["id"] for item in dismissed["items"]] == [candidate.id]
+    assert client.patch(
+        "/api/v1/customers/duplicates/999", json={"status": "CONFIRMED"}, headers=auth_headers
+    ).status_code == 404
@@ -0,0 +1,98 @@
+from datetime import datetime
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.customer import Customer, CustomerDetail
+from app.models.customer_referral_stats import CustomerReferralStats
+from app.models.loan_application import LoanApplication
+from app.utils.validators import validate_dominican_nid
+
+
+def _valid_nid(base: int) -> str:
+    prefix = f"{base:010d}"
+    return next(prefix + str(d) for d in range(10) if validate_dominican_nid(prefix + str(d)))
+
+
+def _item(nid: str, referred_by: str, first_name: str, last_name: str) -> dict:
+    return {
+        "nid": nid,
+        "is_referred": True,
+        "referred_by": referred_by,
+        "detail": {"first_name": first_name, "last_name": last_name},
+        "phones": [{"number": "8095550000", "type": "mobile"}],
+        "addresses": [{"street": "Calle 1", "city": "Santo Domingo", "state": "DN"}],
+    }
+
+
+def test_created_customers_roll_up_to_their_referrer(
+    client: TestClient, session: Session, auth_headers: dict
+):
+    referrer = Customer(nid=_valid_nid(1000000001))
+    session.add(referrer)
+    session.flush()
+    session.add(CustomerDetail(customer_id=referrer.id, first_name="Ana", last_name="Referente"))
+    session.commit()
+    direct_nid, indirect_nid = _valid_nid(1000000002), _valid_nid(1000000003)
+
+    response = client.post("/api/v1/customers/bulk", headers=auth_headers, json={"customers": [
+        _item(direct_nid, referrer.nid, "Beto", "Directo"),
+        _item(indirect_nid, direct_nid, "Carla", "Indirecta"),
+    ]})
+    assert response.status_code == 200
+    assert len(response.json()["created"]) == 2
+
+    stats = client.get(f"/api/v1/customers/{referrer.id}/referral-stats", headers=auth_headers)
+    assert stats.status_code == 200
+    data = stats.json()
+    assert (data["direct_count"], data["indirect_count"], data["total_count"]) == (1, 1, 2)
+    assert data["approval_rate"] is None
+
+    tree = client.get(f"/api/v1/customers/{referrer.id}/referrals", headers=auth_headers)
+    assert tree.status_code == 200
+    items = tree.json()["items"]
+    assert [(item["nid"], item["depth"]) for item in items] == [(direct_nid, 1), (indirect_nid, 2)]
+    assert items[0]["name"] == "Beto Directo"
+
+    direct_only = client.get(
+        f"/api/v1/customers/{referrer.id}/referrals", params={"max_depth": 1}, headers=auth_headers
+    )
+    assert direct_only.json()["total"] == 1
+
+
+def test_referral_endpoints_unknown_customer(client: TestClient, auth_headers: dict):
+    for path in ("referrals", "referral-stats"):
+        response = client.get(f"/api/v1/customers/9999/{path}", headers=auth_headers)
+        assert response.status_code == 404
+
+
+def test_creditgraph_decisions_refresh_referrer_rollups(
+    client: TestClient, session: Session, auth_headers: dict, test_loan: LoanApplication
+):
+    referrer = Customer(nid=_valid_nid(1000000004))
+    session.add(referrer)
+    session.flush()
+    customer = session.get(Customer, test_loan.customer_id)
+    customer.referrer_id = referrer.id
+    # Stale rollup: the analysis must recompute it
+    session.add(CustomerReferralStats(
+        customer_id=referrer.id, direct_count=0, refreshed_at=datetime(2020, 1, 1)))
+    session.commit()
+
+    with patch(
+        "app.services.creditgraph_client.CreditGraphClient.analyze_loan_application"
+    ) as mock_analyze:
+        mock_analyze.return_value = {
+            "case_id": "cg-ref", "decision": "APPROVED", "irs_score": 85,
+            "confidence": 0.9, "risk_level": "LOW",
+        }
+        response = client.post(
+            f"/api/v1/creditgraph/loan-applications/{test_loan.id}/analyze",
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+    data = client.get(f"/api/v1/customers/{referrer.id}/referral-stats", headers=auth_headers).json()
+    assert (data["direct_count"], data["applications_count"]) == (1, 1)
+    assert data["refreshed_at"] > "2020-01-01T00:00:00"
@@ -0,0 +1,83 @@
+import math
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from app.core.metrics import (
+    CREDITGRAPH_ERRORS,
+    HTTP_REQUEST_DURATION,
+    IMPORT_ROWS,
+    Counter,
+    Histogram,
+)
+from app.services.creditgraph_client import CreditGraphClient
+
+
+def test_metrics_endpoint_serves_prometheus_text(client: TestClient):
+    client.get("/health")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "# TYPE lamas_http_request_duration_seconds histogram" in body
+    assert 'route="/health",status="200"' in body
+    assert "lamas_http_requests_in_flight" in body
+    assert "lamas_db_pool_checked_out" in body
+
+
+def test_request_latency_is_labelled_by_route_template(
+    client: TestClient, auth_headers: dict
+):
+    labels = dict(method="GET", route="/api/v1/loan-applications/{loan_id}", status="404")
+    before = HTTP_REQUEST_DURATION.count(**labels)
+
+    client.get("/api/v1/loan-applications/999", headers=auth_headers)
+    client.get("/api/v1/loan-applications/998", headers=auth_headers)
+
+    assert HTTP_REQUEST_DURATION.count(**labels) == before + 2
+
+
+def test_creditgraph_errors_are_counted():
+    before = CREDITGRAPH_ERRORS.value(error="ConnectError")
+    failing_client = MagicMock()
+    failing_client.__enter__.return_value.post.side_effect = httpx.ConnectError("down")
+
+    with patch("app.services.creditgraph_client.httpx.Client", return_value=failing_client):
+        with pytest.raises(httpx.ConnectError):
+            CreditGraphClient().analyze_loan_application(applicant={}, loan={}, documents=[])
+
+    assert CREDITGRAPH_ERRORS.value(error="ConnectError") == before + 1
+
+
+def test_import_rows_are_counted(session):
+    from app.services.import_service import SoliPresCSVImporter
+
+    before = IMPORT_ROWS.value(result="error")
+    SoliPresCSVImporter(session).import_csv_content("Cedula,Nombre_y_Apellido\n,Sin Cedula\n")
+
+    assert IMPORT_ROWS.value(result="error") == before + 1
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("example_seconds", "Example.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(5, route="/a")
+
+    rendered = histogram.render()
+
+    assert 'example_seconds_bucket{route="/a",le="0.1"} 1' in rendered
+    assert 'example_seconds_bucket{route="/a",le="1"} 2' in rendered
+    assert 'example_seconds_bucket{route="/a",le="+Inf"} 3' in rendered
+    assert 'example_seconds_count{route="/a"} 3' in rendered
+    assert math.isclose(float(rendered.split('example_seconds_sum{route="/a"} ')[1].split()[0]), 5.55)
+
+
+def test_counter_rejects_unknown_labels():
+    counter = Counter("example_total", "Example.", ("kind",))
+
+    with pytest.raises(ValueError):
+        counter.inc(other="x")
@@ -0,0 +1,58 @@
+import logging
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from app.api.middlewares.query_stats_middleware import QueryStatsMiddleware
+from app.models.loan_application import LoanApplication
+
+
+def test_health_reports_zero_queries(client: TestClient):
+    response = client.get("/health")
+
+    assert response.headers["X-DB-Queries"] == "0"
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+
+def test_endpoint_reports_query_count(
+    client: TestClient, auth_headers: dict, test_loan: LoanApplication
+):
+    response = client.get(f"/api/v1/loan-applications/{test_loan.id}", headers=auth_headers)
+
+    assert response.status_code == 200
+    count = int(response.headers["X-DB-Queries"])
+    assert count > 0
+    assert f'desc="{count} queries"' in response.headers["Server-Timing"]
+
+
+def test_assert_max_queries_on_loan_detail(
+    client: TestClient, auth_headers: dict, test_loan: LoanApplication, assert_max_queries
+):
+    client.get("/api/v1/auth/me", headers=auth_headers)  # warm the user cache
+
+    with assert_max_queries(10) as statements:
+        response = client.get(f"/api/v1/loan-applications/{test_loan.id}", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert len(statements) == int(response.headers["X-DB-Queries"])
+
+
+def test_warns_when_threshold_exceeded(async_engine: AsyncEngine, caplog):
+    async def chatty(request: Request):
+        async with async_engine.connect() as conn:
+            for _ in range(3):
+                await conn.execute(text("SELECT 1"))
+        return JSONResponse({})
+
+    probe_app = QueryStatsMiddleware(
+        Starlette(routes=[Route("/chatty", chatty)]), warn_threshold=2
+    )
+    with caplog.at_level(logging.WARNING), TestClient(probe_app) as probe_client:
+        response = probe_client.get("/chatty")
+
+    assert response.headers["X-DB-Queries"] == "3"
+    assert "GET /chatty ran 3 SQL queries" in caplog.text
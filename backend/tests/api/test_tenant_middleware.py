@@ -1,5 +1,18 @@
+import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from app.api.middlewares import tenant_middleware
+from app.api.middlewares.tenant_middleware import (
+    DEFAULT_TENANT_CONFIG,
+    TenantMiddleware,
+    resolve_tenant_config,
+)
+from app.core.cache import MISSING, LRUTTLCache
+from app.core.tenant_cache import tenant_config_cache
 from app.models.system_config import SystemConfig
 
 
@@ -25,3 +38,137 @@ def test_tenant_middleware_custom_header(client: TestClient, session: Session):
 
     response = client.get("/health", headers={"X-Tenant-ID": "Cooperativa Maimon"})
     assert response.status_code == 200
+
+
+@pytest.fixture
+def tenant_db(monkeypatch, async_engine):
+    """Point the middleware's tenant lookup at the test database."""
+    monkeypatch.setattr(tenant_middleware, "async_engine", async_engine)
+    tenant_config_cache.clear()
+    yield
+    tenant_config_cache.clear()
+
+
+def _seed_tenant(session: Session) -> SystemConfig:
+    sys_config = SystemConfig(
+        tenant_name="Cooperativa Maimon",
+        tenant_type="COOPERATIVA",
+        config={"enable_savings_module": True},
+    )
+    session.add(sys_config)
+    session.commit()
+    return sys_config
+
+
+async def test_resolve_tenant_config_caches_hits(tenant_db, session: Session, monkeypatch):
+    _seed_tenant(session)
+    calls = []
+    original = tenant_middleware.load_tenant_config
+
+    async def counting_load(tenant_id):
+        calls.append(tenant_id)
+        return await original(tenant_id)
+
+    monkeypatch.setattr(tenant_middleware, "load_tenant_config", counting_load)
+
+    first = await resolve_tenant_config("Cooperativa Maimon")
+    second = await resolve_tenant_config("Cooperativa Maimon")
+
+    assert first["tenant_type"] == "COOPERATIVA"
+    assert first["enable_savings_module"] is True
+    assert second == first
+    assert calls == ["Cooperativa Maimon"]
+
+
+async def test_resolve_tenant_config_returns_independent_copies(tenant_db, session: Session):
+    sys_config = _seed_tenant(session)
+    sys_config.config = {"allowed_customer_types": ["MEMBER"]}
+    session.add(sys_config)
+    session.commit()
+
+    for tenant_id in ("Cooperativa Maimon", None):
+        first = await resolve_tenant_config(tenant_id)
+        first["allowed_customer_types"].append("MUTATED")
+        second = await resolve_tenant_config(tenant_id)
+        assert "MUTATED" not in second["allowed_customer_types"]
+    assert "MUTATED" not in DEFAULT_TENANT_CONFIG["allowed_customer_types"]
+
+
+async def test_resolve_tenant_config_caches_unknown_tenant(tenant_db, monkeypatch):
+    calls = []
+
+    async def counting_load(tenant_id):
+        calls.append(tenant_id)
+        return None
+
+    monkeypatch.setattr(tenant_middleware, "load_tenant_config", counting_load)
+
+    for _ in range(3):
+        config = await resolve_tenant_config("Unknown Tenant")
+        assert config == DEFAULT_TENANT_CONFIG
+
+    assert calls == ["Unknown Tenant"]
+
+
+async def test_resolve_tenant_config_does_not_cache_errors(tenant_db, monkeypatch):
+    async def failing_load(tenant_id):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(tenant_middleware, "load_tenant_config", failing_load)
+
+    config = await resolve_tenant_config("Cooperativa Maimon")
+
+    assert config == DEFAULT_TENANT_CONFIG
+    assert tenant_config_cache.get("Cooperativa Maimon") is MISSING
+
+
+async def test_system_config_update_invalidates_cache(tenant_db, session: Session):
+    sys_config = _seed_tenant(session)
+    assert (await resolve_tenant_config("Cooperativa Maimon"))["enable_savings_module"] is True
+
+    sys_config.config = {"enable_savings_module": False}
+    session.add(sys_config)
+    session.commit()
+
+    assert tenant_config_cache.get("Cooperativa Maimon") is MISSING
+    assert (await resolve_tenant_config("Cooperativa Maimon"))["enable_savings_module"] is False
+
+
+def test_tenant_config_cache_ttl_expiry():
+    now = [0.0]
+    cache = LRUTTLCache(maxsize=8, ttl_seconds=10, clock=lambda: now[0])
+    cache.set("Cooperativa Maimon", {"tenant_type": "COOPERATIVA"})
+
+    now[0] = 9.9
+    assert cache.get("Cooperativa Maimon") == {"tenant_type": "COOPERATIVA"}
+
+    now[0] = 10.0
+    assert cache.get("Cooperativa Maimon") is MISSING
+
+
+async def test_unknown_tenant_headers_cannot_grow_the_cache(tenant_db, monkeypatch):
+    async def unknown_tenant(tenant_id):
+        return None
+
+    monkeypatch.setattr(tenant_middleware, "load_tenant_config", unknown_tenant)
+    for i in range(tenant_config_cache.maxsize + 50):
+        await resolve_tenant_config(f"tenant-{i}")
+
+    assert len(tenant_config_cache) == tenant_config_cache.maxsize
+
+
+def test_tenant_middleware_sets_request_state(tenant_db, session: Session):
+    _seed_tenant(session)
+
+    async def probe(request: Request):
+        return JSONResponse(request.state.tenant_config)
+
+    probe_app = TenantMiddleware(Starlette(routes=[Route("/probe", probe)]))
+    with TestClient(probe_app) as probe_client:
+        default = probe_client.get("/probe").json()
+        tenant = probe_client.get(
+            "/probe", headers={"X-Tenant-ID": "Cooperativa Maimon"}
+        ).json()
+
+    assert default == DEFAULT_TENANT_CONFIG
+    assert tenant["tenant_type"] == "COOPERATIVA"
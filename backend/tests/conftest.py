@@ -3,42 +3,141 @@ from app.models.customer import Customer, CustomerDetail
 from app.core.security import get_password_hash
 from app.models.user import User
 from app.models.loan_application import LoanApplication, LoanApplicationDetail, LoanStatus
+from app.services.loan_list_view import refresh_loan_list_view_sync
+import asyncio
+from contextlib import contextmanager
+
+import aiosqlite
 import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel.pool import StaticPool
 
 from app.core.config import settings
+from app.core.database import instrument_engine
 from app.main import app
 
 
-@pytest.fixture(name="session")
-def session_fixture():
-    """Create a test database session."""
+@pytest.fixture(name="engine")
+def engine_fixture():
+    """Create an in-memory SQLite engine with the full schema."""
     engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
     SQLModel.metadata.create_all(engine)
+    instrument_engine(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(name="async_engine")
+def async_engine_fixture(engine: Engine):
+    """
+    Create an async engine that shares the sync engine's SQLite connection.
+
+    Both engines see the same in-memory database, so data seeded through the
+    sync ``session`` fixture is visible to the async API and vice versa.
+    """
+    raw_connection = engine.raw_connection().driver_connection
+
+    async def connect():
+        return await aiosqlite.Connection(lambda: raw_connection, iter_chunk_size=64)
+
+    async_engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        async_creator=connect,
+        poolclass=StaticPool,
+        pool_reset_on_return=None,
+    )
+    instrument_engine(async_engine.sync_engine)
+    yield async_engine
+    asyncio.run(async_engine.dispose())
+
+
+@pytest.fixture(name="session")
+def session_fixture(engine: Engine, async_engine: AsyncEngine):
+    """
+    Create a test database session.
+
+    Depends on async_engine so the shared connection outlives the session.
+    """
     with Session(engine) as session:
         yield session
 
 
+@pytest.fixture(name="async_session")
+async def async_session_fixture(session: Session, async_engine: AsyncEngine):
+    """Create an async session for calling service functions directly."""
+    async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+        yield async_session
+
+
 @pytest.fixture
-def client(session: Session):
+def client(session: Session, async_engine: AsyncEngine):
     """Create a test client for the FastAPI app."""
     from fastapi.testclient import TestClient
-    from app.core.database import get_session
-
-    def get_session_override():
-        return session
-
-    app.dependency_overrides[get_session] = get_session_override
+    from app.core.auth_cache import user_cache
+    from app.core.database import get_async_session
+    from app.core.security import token_cache
+    from app.core.tenant_cache import tenant_config_cache
+    from app.services.count_service import count_cache
+    from app.services.customer_cache import customer_cache_backend
+    from app.services.customer_service import nid_prefill_cache
+    from app.services.nid_index import nid_index
+
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            yield async_session
+
+    # Every test starts from an empty database, so process caches must too
+    for cache in (
+        user_cache, token_cache, tenant_config_cache, count_cache, customer_cache_backend,
+        nid_index, nid_prefill_cache,
+    ):
+        cache.clear()
+
+    app.dependency_overrides[get_async_session] = get_async_session_override
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def assert_max_queries(async_engine: AsyncEngine):
+    """
+    Assert that a block runs at most ``n`` SQL statements through the API.
+
+    Usage::
+
+        with assert_max_queries(3):
+            client.get("/api/v1/loan-applications", headers=auth_headers)
+    """
+
+    @contextmanager
+    def _assert_max_queries(n: int):
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "after_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(async_engine.sync_engine, "after_cursor_execute", record)
+        assert len(statements) <= n, (
+            f"Expected at most {n} queries, got {len(statements)}:\n"
+            + "\n".join(statements)
+        )
+
+    return _assert_max_queries
+
+
 @pytest.fixture
 def auth_headers(client: TestClient, session: Session):
     """Create a test user and return auth headers."""
@@ -101,6 +200,7 @@ def test_loan(session: Session, test_customer: Customer) -> LoanApplication:
         purpose="home improvement",
     )
     session.add(detail)
+    refresh_loan_list_view_sync(session, [loan.id])
     session.commit()
     session.refresh(loan)
     return loan
@@ -0,0 +1,46 @@
+"""Tests for list totals: exact-count caching and planner estimates."""
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.customer import Customer
+from app.services.count_service import (
+    count_cache,
+    count_cache_key,
+    count_rows,
+    estimate_count,
+)
+
+
+def test_count_cache_key_ignores_unset_filters_and_order():
+    assert count_cache_key("customers", {"name": "ana", "nid": None, "is_active": True}) == (
+        count_cache_key("customers", {"is_active": True, "name": "ana"})
+    )
+    assert count_cache_key("customers", {"name": "ana"}) != count_cache_key(
+        "loan_applications", {"name": "ana"}
+    )
+
+
+async def test_exact_count_is_cached(async_session: AsyncSession):
+    count_cache.clear()
+    async_session.add(Customer(nid="00100000001"))
+    await async_session.commit()
+    key = count_cache_key("customers", {})
+
+    first = await count_rows(
+        async_session, select(Customer.id), key=key,
+        table_name="customers", filtered=False, mode="exact",
+    )
+    async_session.add(Customer(nid="00100000002"))
+    await async_session.commit()
+    second = await count_rows(
+        async_session, select(Customer.id), key=key,
+        table_name="customers", filtered=False, mode="exact",
+    )
+
+    assert first == (1, False)
+    assert second == (1, False)
+    count_cache.clear()
+
+
+async def test_estimate_is_unavailable_outside_postgres(async_session: AsyncSession):
+    assert await estimate_count(async_session, select(Customer.id), "customers", False) is None
@@ -0,0 +1,146 @@
+"""Tests for the duplicate customer detection job."""
+from datetime import datetime
+
+from sqlmodel import Session, select
+
+from app.models.customer import Customer, CustomerDetail
+from app.models.customer_duplicate import (
+    CustomerBlockingKey,
+    CustomerDuplicateCandidate,
+    DuplicateStatus,
+)
+from app.models.phone import Phone
+from app.services import duplicate_service
+from app.services.duplicate_service import (
+    find_duplicate_customers,
+    is_nid_typo,
+    normalize_phone,
+)
+
+
+def _customer(session: Session, nid: str, first: str, last: str,
+              phone: str | None = None, email: str | None = None) -> Customer:
+    customer = Customer(nid=nid)
+    session.add(customer)
+    session.flush()
+    session.add(CustomerDetail(customer_id=customer.id, first_name=first, last_name=last, email=email))
+    if phone:
+        session.add(Phone(phoneable_type="Customer", phoneable_id=customer.id, number=phone))
+    session.commit()
+    return customer
+
+
+def _pairs(session: Session) -> dict[tuple[int, int], CustomerDuplicateCandidate]:
+    return {
+        (c.customer_id, c.duplicate_customer_id): c
+        for c in session.exec(select(CustomerDuplicateCandidate)).all()
+    }
+
+
+def test_normalizers():
+    assert normalize_phone("+1 (809) 555-1234") == "8095551234"
+    assert normalize_phone("809-555-1234") == "8095551234"
+    assert normalize_phone("123") is None
+    assert is_nid_typo("00100000025", "00100000026")
+    assert is_nid_typo("00100000025", "00100000052")
+    assert not is_nid_typo("00100000025", "00100000025")
+    assert not is_nid_typo("00100000025", "00100000136")
+
+
+def test_full_scan_scores_blocked_pairs_only(session: Session):
+    juan = _customer(session, "00100000025", "Juan", "Pérez", phone="809-555-1234")
+    typo = _customer(session, "00100000026", "Juan", "Peres", phone="(809) 5551234")
+    _customer(session, "40200000001", "Juan", "Perez")  # same name only: below MIN_SCORE
+    _customer(session, "40200000002", "Pedro", "Martínez", phone="8295550000")
+
+    scan = find_duplicate_customers(session)
+
+    assert scan.is_full and scan.finished_at is not None
+    assert scan.pairs_compared == 3  # the three Juan Pérez share a name block
+    pairs = _pairs(session)
+    assert list(pairs) == [(juan.id, typo.id)]
+    candidate = pairs[(juan.id, typo.id)]
+    assert candidate.matched_on == ["phone", "name", "nid"]
+    assert candidate.status == DuplicateStatus.PENDING
+    assert 0.5 <= candidate.score <= 1.0
+
+
+def test_incremental_scan_only_pairs_changed_customers(session: Session):
+    ana = _customer(session, "00100000025", "Ana", "Gómez", email="Ana@Example.com")
+    luis = _customer(session, "00100000033", "Luis", "Díaz", phone="8095550001")
+    luisa = _customer(session, "00100000034", "Luisa", "Diaz", phone="8095550001")
+    find_duplicate_customers(session)
+    assert list(_pairs(session)) == [(luis.id, luisa.id)]
+
+    unchanged = find_duplicate_customers(session)
+    assert not unchanged.is_full
+    assert (unchanged.customers_changed, unchanged.pairs_compared) == (0, 0)
+
+    newcomer = _customer(session, "40200000003", "Ana María", "Gomez", email=" ana@example.com")
+    scan = find_duplicate_customers(session)
+
+    assert scan.customers_changed == 1
+    assert scan.pairs_compared == 1
+    pairs = _pairs(session)
+    assert set(pairs) == {(luis.id, luisa.id), (ana.id, newcomer.id)}
+    assert pairs[(ana.id, newcomer.id)].matched_on == ["email", "name"]
+
+
+def test_incremental_scan_reads_only_blocks_of_changed_customers(session: Session, monkeypatch):
+    luis = _customer(session, "00100000033", "Luis", "Díaz", phone="8095550001")
+    _customer(session, "40200000006", "Rosa", "Vidal", phone="8095559999")
+    find_duplicate_customers(session)
+
+    computed = []
+    original = duplicate_service._compute_keys
+
+    def recording(session, ids=None):
+        computed.append(ids)
+        return original(session, ids)
+
+    monkeypatch.setattr(duplicate_service, "_compute_keys", recording)
+    luisa = _customer(session, "00100000034", "Luisa", "Diaz", phone="809-555-0001")
+    scan = find_duplicate_customers(session)
+
+    assert computed == [[luisa.id]]
+    assert (scan.customers_changed, scan.pairs_compared) == (1, 1)
+    assert (luis.id, luisa.id) in _pairs(session)
+    stored = session.exec(
+        select(CustomerBlockingKey.key).where(CustomerBlockingKey.customer_id == luisa.id)
+    ).all()
+    assert "phone:8095550001" in stored
+
+
+def test_reviewed_pairs_survive_and_stale_pending_pairs_are_removed(session: Session):
+    juan = _customer(session, "00100000025", "Juan", "Pérez", phone="8095551234")
+    typo = _customer(session, "00100000026", "Juan", "Peres", phone="8095551234")
+    marta = _customer(session, "40200000004", "Marta", "Soto", phone="8095559999")
+    other = _customer(session, "40200000005", "Marta", "Sotto", phone="8095559999")
+    find_duplicate_customers(session)
+    pairs = _pairs(session)
+    pairs[(juan.id, typo.id)].status = DuplicateStatus.DISMISSED
+    session.commit()
+
+    # The second Marta turns out to be someone else entirely
+    detail = session.exec(select(CustomerDetail).where(CustomerDetail.customer_id == other.id)).one()
+    detail.first_name, detail.last_name = "Rosa", "Vidal"
+    detail.updated_at = datetime.utcnow()
+    phone = session.exec(select(Phone).where(Phone.phoneable_id == other.id)).one()
+    session.delete(phone)
+    session.commit()
+    find_duplicate_customers(session, full=True)
+
+    pairs = _pairs(session)
+    assert pairs[(juan.id, typo.id)].status == DuplicateStatus.DISMISSED
+    assert (marta.id, other.id) not in pairs
+
+
+def test_oversized_blocks_are_skipped(session: Session, monkeypatch):
+    monkeypatch.setattr(duplicate_service, "BLOCK_MAX_SIZE", 2)
+    for i, name in enumerate(["Ana", "Rosa", "Luis"]):
+        _customer(session, f"0010000005{i}", name, f"Apellido{i}", phone="8095550000")
+
+    scan = find_duplicate_customers(session)
+
+    assert scan.pairs_compared == 0
+    assert _pairs(session) == {}
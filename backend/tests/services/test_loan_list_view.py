@@ -0,0 +1,63 @@
+"""Tests for the loan_list_view read model: write-path refreshes and the consistency check."""
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models.customer import Customer
+from app.models.loan_application import LoanApplication, LoanApplicationNote
+from app.models.loan_list_view import LoanListView
+from app.services.loan_list_view import (
+    find_stale_loan_list_rows,
+    rebuild_loan_list_view,
+    refresh_loan_list_view_sync,
+)
+
+
+def _listed(client: TestClient, auth_headers: dict, loan_id: int) -> dict:
+    response = client.get("/api/v1/loan-applications/", headers=auth_headers)
+    assert response.status_code == 200
+    return next(item for item in response.json()["items"] if item["id"] == loan_id)
+
+
+def test_write_paths_keep_list_rows_current(
+    client: TestClient, auth_headers: dict, test_customer: Customer
+):
+    created = client.post("/api/v1/loan-applications/", headers=auth_headers, json={
+        "customer_id": test_customer.id,
+        "detail": {"amount": 75000.0, "term": 12, "rate": 12.5, "quota": 7000.0,
+                   "frequency": "monthly", "purpose": "vehicle"},
+    })
+    assert created.status_code == 201
+    loan_id = created.json()["id"]
+    assert _listed(client, auth_headers, loan_id)["amount"] == 75000.0
+
+    client.post(f"/api/v1/loan-applications/{loan_id}/notes",
+                headers=auth_headers, json={"note": "Documentos recibidos"})
+    client.patch(f"/api/v1/loan-applications/{loan_id}/status",
+                 headers=auth_headers, json={"status": "verified"})
+    updated = client.put(f"/api/v1/customers/{test_customer.id}",
+                         headers=auth_headers, json={"detail": {"first_name": "Juana"}})
+    assert updated.status_code == 200
+
+    row = _listed(client, auth_headers, loan_id)
+    assert row["status"] == "verified"
+    assert row["latest_note"] == "Documentos recibidos"
+    assert row["customer_name"] == "Juana Pérez"
+
+
+def test_stale_rows_are_found_and_repaired(session: Session, test_loan: LoanApplication):
+    assert find_stale_loan_list_rows(session) == []
+
+    # Changes made behind the service layer leave the row behind
+    session.add(LoanApplicationNote(loan_application_id=test_loan.id, note="Sin servicio"))
+    orphan = LoanApplication(customer_id=test_loan.customer_id)
+    session.add(orphan)
+    session.commit()
+    assert find_stale_loan_list_rows(session) == [test_loan.id, orphan.id]
+
+    refresh_loan_list_view_sync(session, [test_loan.id])
+    session.commit()
+    assert find_stale_loan_list_rows(session) == [orphan.id]
+
+    assert rebuild_loan_list_view(session) == 2
+    assert find_stale_loan_list_rows(session) == []
+    assert session.get(LoanListView, orphan.id).amount is None
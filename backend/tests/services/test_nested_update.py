@@ -0,0 +1,60 @@
+"""Tests for matching submitted child rows to stored ones."""
+from types import SimpleNamespace
+
+from app.services.nested_update import diff_children
+
+FIELDS = ("number", "type")
+
+
+def _row(id, number, type):
+    return SimpleNamespace(id=id, number=number, type=type)
+
+
+def _by_number(values):
+    return values["number"]
+
+
+def test_identical_rows_are_left_alone():
+    stored = [_row(1, "8095550001", "mobile"), _row(2, "8095550002", "home")]
+
+    diff = diff_children(
+        stored,
+        [{"number": "8095550002", "type": "home"}, {"number": "8095550001", "type": "mobile"}],
+        FIELDS,
+        _by_number,
+    )
+
+    assert [row.id for row in diff.unchanged] == [2, 1]
+    assert diff.updated == diff.deleted == diff.inserted == []
+
+
+def test_key_match_is_updated_before_positional_reuse():
+    stored = [_row(1, "8095550001", "mobile"), _row(2, "8095550002", "home")]
+
+    diff = diff_children(
+        stored,
+        [{"number": "8095550009", "type": "work"}, {"number": "8095550002", "type": "work"}],
+        FIELDS,
+        _by_number,
+    )
+
+    assert [(row.id, values["number"]) for row, values in diff.updated] == [
+        (2, "8095550002"),
+        (1, "8095550009"),
+    ]
+    assert diff.inserted == diff.deleted == []
+
+
+def test_extra_rows_are_inserted_or_deleted():
+    stored = [_row(1, "8095550001", "mobile"), _row(2, "8095550002", "home")]
+
+    shrunk = diff_children(stored, [{"number": "8095550001", "type": "mobile"}], FIELDS, _by_number)
+    grown = diff_children(
+        stored[:1],
+        [{"number": "8095550001", "type": "mobile"}, {"number": "8095550003", "type": "work"}],
+        FIELDS,
+        _by_number,
+    )
+
+    assert [row.id for row in shrunk.deleted] == [2]
+    assert grown.inserted == [{"number": "8095550003", "type": "work"}]
@@ -0,0 +1,82 @@
+"""Tests for the in-process NID membership index."""
+import asyncio
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.customer import Customer
+from app.services.nid_index import NIDIndex
+
+
+async def test_index_loads_stored_nids_and_tracks_additions(async_engine):
+    async with AsyncSession(async_engine) as session:
+        session.add_all([
+            Customer(nid="00100000021"),
+            Customer(nid="40200000011"),
+            Customer(nid="001-0000003"),  # legacy formatted value, never matched by lookups
+        ])
+        await session.commit()
+
+        index = NIDIndex(refresh_seconds=60)
+        assert not index.is_fresh()
+        await index.load(session)
+
+    assert index.is_fresh()
+    assert "00100000021" in index
+    assert "40200000011" in index
+    assert "00100000022" not in index
+    assert "001-0000003" not in index
+    assert len(index) == 2
+
+    index.add("22300000001", "bad")
+    assert "22300000001" in index
+    assert len(index) == 3
+
+    index.clear()
+    assert "00100000021" not in index
+    assert not index.is_fresh()
+
+
+async def test_stale_index_is_reloaded(async_engine):
+    index = NIDIndex(refresh_seconds=0)
+    async with AsyncSession(async_engine) as session:
+        await index.ensure_fresh(session)
+        assert "00100000021" not in index
+
+        session.add(Customer(nid="00100000021"))
+        await session.commit()
+        await index.ensure_fresh(session)
+
+    assert "00100000021" in index
+
+
+async def test_catch_up_adds_customers_stored_by_others(async_engine):
+    index = NIDIndex(refresh_seconds=60, catch_up_seconds=0)
+    async with AsyncSession(async_engine) as session:
+        await index.load(session)
+        session.add(Customer(nid="00100000031"))  # e.g. written by another worker
+        await session.commit()
+        assert "00100000031" not in index
+
+        await index.ensure_fresh(session)
+
+    assert "00100000031" in index
+    assert index.is_fresh()
+
+
+async def test_concurrent_reloads_are_single_flight(async_engine):
+    class CountingIndex(NIDIndex):
+        loads = 0
+
+        async def load(self, session):
+            self.loads += 1
+            await asyncio.sleep(0.05)
+            await super().load(session)
+
+    index = CountingIndex(refresh_seconds=60, catch_up_seconds=60)
+    async with AsyncSession(async_engine) as session:
+        await index.load(session)
+        index._loaded_at -= 120  # snapshot expired
+
+        await asyncio.gather(*(index.ensure_fresh(session) for _ in range(5)))
+
+    assert index.loads == 2  # the initial load plus one refresh
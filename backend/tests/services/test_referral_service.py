@@ -0,0 +1,140 @@
+"""Tests for the referral graph and its per-referrer rollups."""
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.customer import Customer, CustomerDetail
+from app.models.customer_referral_stats import CustomerReferralStats
+from app.models.loan_application import LoanApplication, LoanApplicationDetail
+from app.services.referral_service import (
+    get_referral_stats,
+    link_referrals,
+    list_referral_tree,
+    refresh_referral_stats,
+    refresh_referrer_stats,
+    sync_referrals,
+)
+
+
+async def _customer(session: AsyncSession, nid: str, referred_by: str | None = None) -> Customer:
+    customer = Customer(nid=nid, is_referred=referred_by is not None, referred_by=referred_by)
+    session.add(customer)
+    await session.flush()
+    session.add(CustomerDetail(customer_id=customer.id, first_name="Cliente", last_name=nid[-3:]))
+    await session.flush()
+    return customer
+
+
+async def _loan(session: AsyncSession, customer: Customer, amount: float, approved: bool) -> LoanApplication:
+    loan = LoanApplication(customer_id=customer.id, is_approved=approved)
+    session.add(loan)
+    await session.flush()
+    session.add(LoanApplicationDetail(loan_application_id=loan.id, amount=amount))
+    await session.flush()
+    return loan
+
+
+async def test_rollups_count_direct_and_indirect_referrals(async_session: AsyncSession):
+    ana = await _customer(async_session, "00100000001")
+    beto = await _customer(async_session, "00100000002", referred_by=ana.nid)
+    carla = await _customer(async_session, "00100000003", referred_by=beto.nid)
+    await _customer(async_session, "00100000004", referred_by=ana.nid)
+    await _customer(async_session, "00100000005", referred_by="99999999999")  # unknown referrer
+    await _loan(async_session, carla, 50_000, approved=True)
+    await _loan(async_session, carla, 10_000, approved=False)
+
+    linked = await link_referrals(async_session)
+    await refresh_referral_stats(async_session)
+    await async_session.commit()
+
+    assert len(linked) == 3
+    assert beto.id in linked and carla.id in linked
+    stats = await get_referral_stats(async_session, ana.id)
+    assert (stats.direct_count, stats.indirect_count, stats.total_count) == (2, 1, 3)
+    assert (stats.applications_count, stats.approved_count) == (2, 1)
+    assert stats.approval_rate == 0.5
+    assert stats.approved_amount == 50_000
+    assert (await get_referral_stats(async_session, beto.id)).direct_count == 1
+    # Nobody referred by Carla: no row, zeros
+    empty = await get_referral_stats(async_session, carla.id)
+    assert (empty.total_count, empty.approval_rate, empty.refreshed_at) == (0, None, None)
+
+
+async def test_sync_links_referrers_created_later(async_session: AsyncSession):
+    beto = await _customer(async_session, "00100000002", referred_by="00100000001")
+    assert await sync_referrals(async_session) == []
+
+    ana = await _customer(async_session, "00100000001")
+    carla = await _customer(async_session, "00100000003", referred_by=beto.nid)
+    assert sorted(await sync_referrals(async_session)) == [beto.id, carla.id]
+    await async_session.commit()
+
+    rows = (await async_session.exec(select(CustomerReferralStats))).all()
+    assert {row.customer_id: (row.direct_count, row.indirect_count) for row in rows} == {
+        ana.id: (1, 1),
+        beto.id: (1, 0),
+    }
+
+
+async def test_scoped_sync_only_links_around_written_customers(async_session: AsyncSession):
+    beto = await _customer(async_session, "00100000002", referred_by="00100000001")
+    # Pending referral unrelated to the writes below (its referrer appears behind the service)
+    dora = await _customer(async_session, "00100000004", referred_by="00100000005")
+    await _customer(async_session, "00100000005")
+
+    ana = await _customer(async_session, "00100000001")
+    carla = await _customer(async_session, "00100000003", referred_by=beto.nid)
+    assert sorted(await sync_referrals(async_session, written_ids=[ana.id, carla.id])) == [beto.id, carla.id]
+    await async_session.refresh(dora)
+    assert dora.referrer_id is None
+
+    assert await sync_referrals(async_session) == [dora.id]
+
+
+async def test_loan_changes_refresh_every_referrer_above(async_session: AsyncSession):
+    ana = await _customer(async_session, "00100000001")
+    beto = await _customer(async_session, "00100000002", referred_by=ana.nid)
+    carla = await _customer(async_session, "00100000003", referred_by=beto.nid)
+    await sync_referrals(async_session)
+
+    loan = await _loan(async_session, carla, 20_000, approved=False)
+    loan.is_approved = True
+    await refresh_referrer_stats(async_session, [carla.id])
+    await async_session.commit()
+
+    for referrer in (ana, beto):
+        stats = await get_referral_stats(async_session, referrer.id)
+        assert (stats.applications_count, stats.approved_amount) == (1, 20_000)
+
+
+async def test_cycles_are_counted_once(async_session: AsyncSession):
+    ana = await _customer(async_session, "00100000001", referred_by="00100000002")
+    beto = await _customer(async_session, "00100000002", referred_by=ana.nid)
+
+    await sync_referrals(async_session)
+    await async_session.commit()
+
+    for referrer, other in ((ana, beto), (beto, ana)):
+        stats = await get_referral_stats(async_session, referrer.id)
+        assert (stats.direct_count, stats.indirect_count) == (1, 0)
+        tree = await list_referral_tree(async_session, referrer.id, page=1, per_page=20)
+        assert [node.id for node in tree.items] == [other.id]
+
+
+async def test_referral_tree_pages_shallowest_first(async_session: AsyncSession):
+    ana = await _customer(async_session, "00100000001")
+    beto = await _customer(async_session, "00100000002", referred_by=ana.nid)
+    carla = await _customer(async_session, "00100000003", referred_by=beto.nid)
+    dora = await _customer(async_session, "00100000004", referred_by=ana.nid)
+    await sync_referrals(async_session)
+    await async_session.commit()
+
+    tree = await list_referral_tree(async_session, ana.id, page=1, per_page=2)
+    assert tree.total == 3
+    assert [(node.id, node.depth) for node in tree.items] == [(beto.id, 1), (dora.id, 1)]
+    assert tree.items[0].name == "Cliente 002"
+    last = await list_referral_tree(async_session, ana.id, page=2, per_page=2)
+    assert [(node.id, node.depth, node.referrer_id) for node in last.items] == [(carla.id, 2, beto.id)]
+
+    direct = await list_referral_tree(async_session, ana.id, page=1, per_page=20, max_depth=1)
+    assert direct.total == 2
+    assert await list_referral_tree(async_session, 9999, page=1, per_page=20) is None
@@ -187,3 +187,39 @@ def test_analyze_api_error_returns_502(
 
         assert response.status_code == 502
         assert "API error" in response.json()["detail"]
+
+
+def test_analysis_decision_reaches_loan_list(
+    client: TestClient,
+    auth_headers: dict,
+    test_loan: LoanApplication,
+    mock_creditgraph_response,
+):
+    """The decision's status shows up in GET /loan-applications and its status filter."""
+    with patch(
+        "app.services.creditgraph_client.CreditGraphClient.analyze_loan_application"
+    ) as mock_analyze:
+        mock_analyze.return_value = mock_creditgraph_response
+        response = client.post(
+            f"/api/v1/creditgraph/loan-applications/{test_loan.id}/analyze",
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+    listed = client.get("/api/v1/loan-applications/", headers=auth_headers).json()
+    row = next(item for item in listed["items"] if item["id"] == test_loan.id)
+    assert row["status"] == LoanStatus.AUTO_APPROVED.value
+
+    approved = client.get(
+        "/api/v1/loan-applications/",
+        headers=auth_headers,
+        params={"status": LoanStatus.AUTO_APPROVED.value},
+    ).json()
+    assert [item["id"] for item in approved["items"]] == [test_loan.id]
+
+    received = client.get(
+        "/api/v1/loan-applications/",
+        headers=auth_headers,
+        params={"status": LoanStatus.RECEIVED.value},
+    ).json()
+    assert test_loan.id not in [item["id"] for item in received["items"]]
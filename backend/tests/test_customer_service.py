@@ -5,6 +5,7 @@ Tests business logic, transaction handling, and data operations.
 """
 import pytest
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.customer import Customer, CustomerDetail
 from app.schemas.customer import (
@@ -26,9 +27,9 @@ from app.services.customer_service import (
 
 
 @pytest.mark.asyncio
-async def test_validate_nid_valid_and_unique(session: Session):
+async def test_validate_nid_valid_and_unique(session: Session, async_session: AsyncSession):
     """Test NID validation with valid and unique NID."""
-    result = await validate_nid(session, "12345678901")
+    result = await validate_nid(async_session, "12345678901")
 
     assert result.is_valid is True
     assert result.is_unique is True
@@ -36,9 +37,9 @@ async def test_validate_nid_valid_and_unique(session: Session):
 
 
 @pytest.mark.asyncio
-async def test_validate_nid_invalid_format(session: Session):
+async def test_validate_nid_invalid_format(session: Session, async_session: AsyncSession):
     """Test NID validation with invalid format."""
-    result = await validate_nid(session, "123")
+    result = await validate_nid(async_session, "123")
 
     assert result.is_valid is False
     assert result.is_unique is False
@@ -46,7 +47,7 @@ async def test_validate_nid_invalid_format(session: Session):
 
 
 @pytest.mark.asyncio
-async def test_validate_nid_not_unique(session: Session):
+async def test_validate_nid_not_unique(session: Session, async_session: AsyncSession):
     """Test NID validation when NID already exists."""
     # Create existing customer
     customer = Customer(
@@ -57,7 +58,7 @@ async def test_validate_nid_not_unique(session: Session):
     session.add(customer)
     session.commit()
 
-    result = await validate_nid(session, "99999999999")
+    result = await validate_nid(async_session, "99999999999")
 
     assert result.is_valid is True
     assert result.is_unique is False
@@ -65,7 +66,7 @@ async def test_validate_nid_not_unique(session: Session):
 
 
 @pytest.mark.asyncio
-async def test_create_customer_with_nested_data(session: Session):
+async def test_create_customer_with_nested_data(session: Session, async_session: AsyncSession):
     """Test service creates customer with all nested entities."""
     customer_data = CustomerCreateSchema(
         NID="11111111111",
@@ -91,7 +92,7 @@ async def test_create_customer_with_nested_data(session: Session):
         ]
     )
 
-    customer = await create_customer_with_nested_data(session, customer_data)
+    customer = await create_customer_with_nested_data(async_session, customer_data)
 
     assert customer.id is not None
     assert customer.nid == "11111111111"
@@ -106,7 +107,7 @@ async def test_create_customer_with_nested_data(session: Session):
 
 
 @pytest.mark.asyncio
-async def test_create_customer_simple(session: Session):
+async def test_create_customer_simple(session: Session, async_session: AsyncSession):
     """Test simple customer creation without addresses."""
     customer_data = CustomerSimpleCreateSchema(
         NID="22222222222",
@@ -123,7 +124,7 @@ async def test_create_customer_simple(session: Session):
         ]
     )
 
-    customer = await create_customer_simple(session, customer_data)
+    customer = await create_customer_simple(async_session, customer_data)
 
     assert customer.id is not None
     assert customer.nid == "22222222222"
@@ -132,7 +133,7 @@ async def test_create_customer_simple(session: Session):
 
 
 @pytest.mark.asyncio
-async def test_get_customer_with_relations(session: Session):
+async def test_get_customer_with_relations(session: Session, async_session: AsyncSession):
     """Test fetching customer with all relationships."""
     # Create test customer
     customer = Customer(
@@ -153,7 +154,7 @@ async def test_get_customer_with_relations(session: Session):
     session.commit()
 
     # Fetch customer
-    result = await get_customer_with_relations(session, customer.id)
+    result = await get_customer_with_relations(async_session, customer.id)
 
     assert result is not None
     assert result.id == customer.id
@@ -162,7 +163,7 @@ async def test_get_customer_with_relations(session: Session):
 
 
 @pytest.mark.asyncio
-async def test_search_customers_by_nid(session: Session):
+async def test_search_customers_by_nid(session: Session, async_session: AsyncSession):
     """Test customer search by NID."""
     # Create test customers
     customer1 = Customer(nid="44444444444", is_active=True, is_assigned=False)
@@ -194,19 +195,19 @@ async def test_search_customers_by_nid(session: Session):
     filters = CustomerFilterSchema(nid="44444")
     pagination = PaginationParams(page=1, per_page=10)
 
-    results = await search_customers(session, filters, pagination)
+    results = await search_customers(async_session, filters, pagination)
 
     assert results.total >= 1
     assert any(item.nid == "44444444444" for item in results.items)
 
 
 @pytest.mark.asyncio
-async def test_search_customers_pagination(session: Session):
+async def test_search_customers_pagination(session: Session, async_session: AsyncSession):
     """Test pagination in customer search."""
     filters = CustomerFilterSchema()
     pagination = PaginationParams(page=1, per_page=5)
 
-    results = await search_customers(session, filters, pagination)
+    results = await search_customers(async_session, filters, pagination)
 
     assert results.page == 1
     assert results.per_page == 5
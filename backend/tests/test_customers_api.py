@@ -7,7 +7,9 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session, select
 
-from app.models.customer import Customer, CustomerDetail
+from app.models.address import Address, Addressable
+from app.models.customer import Customer, CustomerDetail, CustomerReference, CustomersAccount
+from app.models.phone import Phone
 from app.models.user import User
 from app.models.portfolio import Portfolio, Promoter
 from app.core.security import get_password_hash
@@ -214,6 +216,39 @@ def test_get_customer_by_id(client: TestClient, session: Session, auth_headers:
     assert data["nid"] == "22222222222"
 
 
+def test_get_customer_loads_aggregate_in_three_queries(
+    client: TestClient, session: Session, auth_headers: dict, assert_max_queries
+):
+    """Customer row + relations, phones and addresses: one query each."""
+    customer = Customer(nid="22222222223", is_active=True, is_assigned=False)
+    session.add(customer)
+    session.flush()
+    session.add(CustomerDetail(customer_id=customer.id, first_name="Agg", last_name="Regate"))
+    for i in range(2):
+        session.add(CustomerReference(
+            customer_id=customer.id, name=f"Ref {i}", relationship="friend"))
+        session.add(CustomersAccount(customer_id=customer.id, number=f"000{i}"))
+        session.add(Phone(number=f"809555000{i}", type="mobile",
+                          phoneable_type="Customer", phoneable_id=customer.id))
+    address = Address(street="Calle 1", city="Santo Domingo", state="DN", country="DO")
+    session.add(address)
+    session.flush()
+    session.add(Addressable(address_id=address.id, addressable_type="Customer",
+                            addressable_id=customer.id))
+    session.commit()
+    client.get("/api/v1/auth/me", headers=auth_headers)  # warm the user cache
+
+    with assert_max_queries(3):
+        response = client.get(f"/api/v1/customers/{customer.id}", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    # The joined collections are de-duplicated despite the row product
+    assert len(data["references"]) == 2
+    assert len(data["phones"]) == 2
+    assert [a["street"] for a in data["addresses"]] == ["Calle 1"]
+
+
 def test_get_customer_not_found(client: TestClient, session: Session, auth_headers: dict):
     """Test 404 error when customer not found."""
     response = client.get("/api/v1/customers/99999", headers=auth_headers)
@@ -484,3 +519,496 @@ def test_update_customer_addresses(client: TestClient, session: Session, auth_he
     old_addr = session.exec(select(Address).where(
         Address.street == "Old Street")).first()
     assert old_addr is None
+
+
+def test_update_customer_diffs_nested_rows(
+    client: TestClient, session: Session, auth_headers: dict, assert_max_queries
+):
+    """Unchanged children keep their IDs; only the difference is written."""
+    customer = Customer(nid="77777777778")
+    session.add(customer)
+    session.flush()
+    session.add(CustomerDetail(customer_id=customer.id, first_name="Diff", last_name="Test"))
+    addresses = [
+        Address(street=f"Calle {i}", city="Santiago", state="Santiago", country="DO")
+        for i in range(3)
+    ]
+    session.add_all(addresses)
+    session.flush()
+    for address in addresses:
+        session.add(Addressable(
+            address_id=address.id, addressable_type="Customer", addressable_id=customer.id))
+    session.commit()
+    kept, edited, dropped = (address.id for address in addresses)
+    client.get("/api/v1/auth/me", headers=auth_headers)  # warm the user cache
+
+    payload = {"addresses": [
+        {"street": "Calle 0", "city": "Santiago", "province": "Santiago", "country": "DO"},
+        {"street": "Calle 1", "city": "Santiago", "province": "Santiago", "country": "DO",
+         "postal_code": "51000"},
+        {"street": "Calle 9", "city": "La Vega", "province": "La Vega", "country": "DO"},
+        {"street": "Calle 10", "city": "Moca", "province": "Espaillat", "country": "DO"},
+    ]}
+    with assert_max_queries(11):
+        response = client.put(
+            f"/api/v1/customers/{customer.id}", json=payload, headers=auth_headers)
+
+    assert response.status_code == 200
+    changes = response.json()["changes"]["addresses"]
+    assert changes["unchanged"] == [kept]
+    # "Calle 1" matches by street/city; the dropped row is reused for "Calle 9"
+    assert changes["updated"] == [edited, dropped]
+    assert changes["deleted"] == []
+    assert len(changes["inserted"]) == 1
+    ids = sorted(a["id"] for a in response.json()["addresses"])
+    assert ids == sorted([kept, edited, dropped, *changes["inserted"]])
+
+
+def _seed_customers(session: Session, count: int) -> None:
+    for i in range(count):
+        customer = Customer(nid=f"{90000000000 + i}", is_active=True, is_assigned=False)
+        session.add(customer)
+        session.flush()
+        session.add(
+            CustomerDetail(
+                customer_id=customer.id,
+                first_name="Lista",
+                last_name=f"Cliente{i}",
+                email=f"lista{i}@example.com",
+            )
+        )
+    session.commit()
+
+
+def test_list_customers_runs_one_query_per_page(
+    client: TestClient, session: Session, auth_headers: dict, assert_max_queries
+):
+    """The list page is a single projection query, not one lazy load per row."""
+    _seed_customers(session, 25)
+    client.get("/api/v1/auth/me", headers=auth_headers)  # warm the user cache
+
+    with assert_max_queries(1):
+        response = client.get(
+            "/api/v1/customers/?page=2&per_page=10", headers=auth_headers
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 25
+    assert data["pages"] == 3
+    assert len(data["items"]) == 10
+    assert data["items"][0]["full_name"] == "Lista Cliente14"
+    assert data["items"][0]["email"] == "lista14@example.com"
+
+
+def test_list_customers_past_last_page_keeps_total(
+    client: TestClient, session: Session, auth_headers: dict
+):
+    _seed_customers(session, 3)
+
+    response = client.get("/api/v1/customers/?page=5&per_page=10", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"] == []
+    assert data["total"] == 3
+
+
+def test_list_customers_cursor_pagination(
+    client: TestClient, session: Session, auth_headers: dict
+):
+    _seed_customers(session, 5)
+
+    first = client.get("/api/v1/customers/?per_page=3", headers=auth_headers).json()
+    assert first["total"] == 5
+    assert first["next_cursor"] is not None
+
+    second = client.get(
+        "/api/v1/customers/",
+        params={"per_page": 3, "cursor": first["next_cursor"]},
+        headers=auth_headers,
+    ).json()
+
+    assert second["total"] == 5
+    assert second["next_cursor"] is None
+    ids = [item["id"] for item in first["items"] + second["items"]]
+    assert len(set(ids)) == 5
+    assert ids == sorted(ids, reverse=True)
+
+
+def test_list_customers_reuses_cached_total_on_cursor_pages(
+    client: TestClient, session: Session, auth_headers: dict, assert_max_queries
+):
+    """The exact total from the first page is cached, so cursor pages skip COUNT."""
+    _seed_customers(session, 5)
+    client.get("/api/v1/auth/me", headers=auth_headers)  # warm the user cache
+
+    first = client.get("/api/v1/customers/?per_page=3", headers=auth_headers).json()
+    with assert_max_queries(1):
+        second = client.get(
+            "/api/v1/customers/",
+            params={"per_page": 3, "cursor": first["next_cursor"]},
+            headers=auth_headers,
+        ).json()
+
+    assert second["total"] == 5
+    assert second["total_is_estimate"] is False
+
+
+def test_list_customers_estimate_falls_back_to_exact_on_sqlite(
+    client: TestClient, session: Session, auth_headers: dict
+):
+    _seed_customers(session, 4)
+
+    response = client.get("/api/v1/customers/?count=estimate", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 4
+    assert data["total_is_estimate"] is False
+
+
+def _seed_named_customer(session: Session, nid: str, first_name: str, last_name: str, nickname=None):
+    customer = Customer(nid=nid, is_active=True, is_assigned=False)
+    session.add(customer)
+    session.flush()
+    session.add(
+        CustomerDetail(
+            customer_id=customer.id,
+            first_name=first_name,
+            last_name=last_name,
+            nickname=nickname,
+        )
+    )
+    session.commit()
+    return customer
+
+
+def test_name_search_ignores_accents_and_ranks_closest_first(
+    client: TestClient, session: Session, auth_headers: dict
+):
+    exact = _seed_named_customer(session, "00100000011", "José", "Ramírez")
+    typo = _seed_named_customer(session, "00100000012", "Ana", "Ramires")
+    _seed_named_customer(session, "00100000013", "Pedro", "Martinez")
+
+    response = client.get("/api/v1/customers/?name=ramirez", headers=auth_headers)
+
+    assert response.status_code == 200
+    ids = [item["id"] for item in response.json()["items"]]
+    assert ids == [exact.id, typo.id]
+
+
+def test_name_search_matches_nickname(
+    client: TestClient, session: Session, auth_headers: dict
+):
+    customer = _seed_named_customer(session, "00100000014", "Francisco", "Peña", nickname="Paco")
+
+    response = client.get("/api/v1/customers/?name=paco", headers=auth_headers)
+
+    assert [item["id"] for item in response.json()["items"]] == [customer.id]
+
+
+def test_name_search_pages_by_offset_without_cursor(
+    client: TestClient, session: Session, auth_headers: dict
+):
+    """Ranked pages cannot be resumed by an id cursor, so they do not offer one."""
+    exact = _seed_named_customer(session, "00100000015", "José", "Ramírez")
+    typo = _seed_named_customer(session, "00100000016", "Ana", "Ramires")
+
+    first = client.get("/api/v1/customers/?name=ramirez&per_page=1", headers=auth_headers).json()
+    second = client.get(
+        "/api/v1/customers/?name=ramirez&per_page=1&page=2", headers=auth_headers
+    ).json()
+
+    assert first["next_cursor"] is None
+    assert [item["id"] for item in first["items"] + second["items"]] == [exact.id, typo.id]
+
+
+def _valid_nid(base: int) -> str:
+    """An 11-digit NID with a correct check digit."""
+    from app.utils.validators import validate_dominican_nid
+
+    prefix = f"{base:010d}"
+    return next(prefix + str(d) for d in range(10) if validate_dominican_nid(prefix + str(d)))
+
+
+def _bulk_item(nid: str, i: int) -> dict:
+    return {
+        "nid": nid,
+        "detail": {"first_name": "Empleado", "last_name": f"Nomina{i}"},
+        "phones": [{"number": f"809{i:07d}", "type": "mobile"}],
+        "addresses": [{"street": f"Calle {i}", "city": "Santo Domingo", "state": "DN"}],
+        "job_info": {"role": "Operario", "salary": "25000"},
+        "references": [{"name": "Supervisor", "relationship": "coworker"}],
+    }
+
+
+def test_bulk_create_reports_partial_success(
+    client: TestClient, session: Session, auth_headers: dict
+):
+    existing_nid = _valid_nid(4020000001)
+    session.add(Customer(nid=existing_nid))
+    session.commit()
+    ok_nid, other_ok_nid = _valid_nid(4020000002), _valid_nid(4020000003)
+    bad_check_digit = ok_nid[:-1] + str((int(ok_nid[-1]) + 1) % 10)
+
+    items = [
+        _bulk_item(ok_nid, 0),
+        _bulk_item(existing_nid, 1),
+        _bulk_item(ok_nid, 2),
+        _bulk_item(bad_check_digit, 3),
+        {"nid": other_ok_nid, "detail": {"first_name": "Sin", "last_name": "Telefono"}},
+        _bulk_item(other_ok_nid, 5),
+    ]
+    response = client.post(
+        "/api/v1/customers/bulk", json={"customers": items}, headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [(c["index"], c["nid"]) for c in data["created"]] == [(0, ok_nid), (5, other_ok_nid)]
+    assert [e["index"] for e in data["errors"]] == [1, 2, 3, 4]
+    assert "already exists" in data["errors"][0]["errors"][0]
+    assert "duplicated in this batch (item 0)" in data["errors"][1]["errors"][0]
+    assert any(msg.startswith("phones:") for msg in data["errors"][3]["errors"])
+    assert (data["created_count"], data["failed_count"]) == (2, 4)
+
+    customer = client.get(
+        f"/api/v1/customers/{data['created'][1]['id']}", headers=auth_headers).json()
+    assert customer["detail"]["last_name"] == "Nomina5"
+    assert [p["number"] for p in customer["phones"]] == ["8090000005"]
+    assert [a["street"] for a in customer["addresses"]] == ["Calle 5"]
+    assert customer["job_info"]["role"] == "Operario"
+    assert [r["name"] for r in customer["references"]] == ["Supervisor"]
+
+
+def test_bulk_create_statement_count_does_not_grow_with_batch(
+    client: TestClient, auth_headers: dict, assert_max_queries
+):
+    client.get("/api/v1/auth/me", headers=auth_headers)  # warm the user cache
+    items = [_bulk_item(_valid_nid(4030000000 + i), i) for i in range(60)]
+
+    # NID lookup + one INSERT per table; SQLite can't batch the ordered
+    # address RETURNING, so those are one per row here (one on PostgreSQL)
+    with assert_max_queries(8 + len(items)) as statements:
+        response = client.post(
+            "/api/v1/customers/bulk", json={"customers": items}, headers=auth_headers)
+
+    assert response.json()["created_count"] == 60
+    assert sum(s.startswith("INSERT INTO customers ") for s in statements) == 1
+    assert sum(s.startswith("INSERT INTO phones ") for s in statements) == 1
+
+
+def test_public_validate_nid_answers_new_nids_from_index(
+    client: TestClient, assert_max_queries
+):
+    client.post(f"/api/v1/customers/validate-nid?nid={_valid_nid(4040000001)}")  # loads index
+
+    with assert_max_queries(0):
+        response = client.post(f"/api/v1/customers/validate-nid?nid={_valid_nid(4040000002)}")
+
+    data = response.json()
+    assert (data["is_valid"], data["is_unique"], data["existing_customer"]) == (True, True, None)
+
+
+def test_public_validate_nid_prefills_known_customer_in_one_query(
+    client: TestClient, session: Session, assert_max_queries
+):
+    nid = _valid_nid(4040000003)
+    customer = Customer(nid=nid)
+    session.add(customer)
+    session.flush()
+    session.add(CustomerDetail(customer_id=customer.id, first_name="Ana", last_name="Peña"))
+    session.add(Phone(phoneable_type="Customer", phoneable_id=customer.id, number="8095550000", type="home"))
+    session.add(Phone(phoneable_type="Customer", phoneable_id=customer.id, number="8295551111", type="mobile"))
+    session.commit()
+    client.post(f"/api/v1/customers/validate-nid?nid={_valid_nid(4040000004)}")  # loads index
+
+    with assert_max_queries(1):
+        first = client.post(f"/api/v1/customers/validate-nid?nid={nid}")
+    with assert_max_queries(0):
+        second = client.post(f"/api/v1/customers/validate-nid?nid={nid}")
+
+    data = first.json()
+    assert data["is_unique"] is False
+    assert data["existing_customer"]["first_name"] == "Ana"
+    assert data["existing_customer"]["mobile_phone"] == "8295551111"
+    assert data["existing_customer"]["company_name"] == ""
+    assert second.json() == data
+
+
+def test_customers_created_through_api_join_nid_index(
+    client: TestClient, auth_headers: dict
+):
+    nid = _valid_nid(4040000005)
+    client.post(f"/api/v1/customers/validate-nid?nid={nid}")  # loads index before the insert
+    client.post(
+        "/api/v1/customers/bulk", json={"customers": [_bulk_item(nid, 0)]}, headers=auth_headers)
+
+    response = client.post(f"/api/v1/customers/validate-nid?nid={nid}")
+
+    assert response.json()["is_unique"] is False
+    assert response.json()["existing_customer"]["last_name"] == "Nomina0"
+
+
+def test_validate_nid_batch_returns_validity_and_existing_ids(
+    client: TestClient, session: Session, auth_headers: dict, assert_max_queries
+):
+    registered_nid = _valid_nid(4050000001)
+    customer = Customer(nid=registered_nid)
+    session.add(customer)
+    session.commit()
+    new_nid = _valid_nid(4050000002)
+    dashed = f"{registered_nid[:3]}-{registered_nid[3:10]}-{registered_nid[10]}"
+    client.get("/api/v1/auth/me", headers=auth_headers)  # warm the user cache
+
+    with assert_max_queries(1):
+        response = client.post(
+            "/api/v1/customers/validate-nid/batch",
+            json={"nids": [dashed, new_nid, "00100000022", "123"]},
+            headers=auth_headers,
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["results"] == [
+        {"nid": dashed, "is_valid": True, "customer_id": customer.id},
+        {"nid": new_nid, "is_valid": True, "customer_id": None},
+        {"nid": "00100000022", "is_valid": False, "customer_id": None},
+        {"nid": "123", "is_valid": False, "customer_id": None},
+    ]
+    assert (data["valid_count"], data["existing_count"]) == (2, 1)
+
+
+def test_validate_nid_batch_requires_auth_and_caps_size(client: TestClient, auth_headers: dict):
+    assert client.post(
+        "/api/v1/customers/validate-nid/batch", json={"nids": ["00100000025"]}
+    ).status_code == 401
+    assert client.post(
+        "/api/v1/customers/validate-nid/batch",
+        json={"nids": ["00100000025"] * 10001},
+        headers=auth_headers,
+    ).status_code == 422
+
+
+def test_export_streams_filtered_customers_as_csv(
+    client: TestClient, session: Session, auth_headers: dict
+):
+    for i, (first_name, active) in enumerate([("Ana", True), ("Luis", False), ("Marta", True)]):
+        customer = Customer(nid=f"0010000010{i}", is_active=active)
+        session.add(customer)
+        session.flush()
+        session.add(CustomerDetail(customer_id=customer.id, first_name=first_name, last_name="Díaz"))
+    session.commit()
+
+    response = client.get(
+        "/api/v1/customers/export", params={"is_active": True}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="customers.csv"' in response.headers["content-disposition"]
+    lines = response.text.splitlines()
+    assert lines[0] == (
+        "id,nid,first_name,last_name,email,is_active,is_assigned,"
+        "portfolio_id,promoter_id,created_at"
+    )
+    assert [line.split(",")[1:4] for line in lines[1:]] == [
+        ["00100000100", "Ana", "Díaz"], ["00100000102", "Marta", "Díaz"]
+    ]
+
+
+def test_export_ndjson_spans_several_cursor_batches(
+    client: TestClient, session: Session, auth_headers: dict, monkeypatch
+):
+    import json
+
+    from app.services import customer_service
+
+    monkeypatch.setattr(customer_service, "EXPORT_BATCH_SIZE", 2)
+    session.add_all([Customer(nid=f"0010000020{i}") for i in range(5)])
+    session.commit()
+
+    response = client.get(
+        "/api/v1/customers/export", params={"format": "ndjson"}, headers=auth_headers)
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["nid"] for row in rows] == [f"0010000020{i}" for i in range(5)]
+    assert rows[0]["first_name"] is None
+    assert isinstance(rows[0]["created_at"], str)
+
+
+def _portfolio_and_promoter(session: Session) -> tuple[Portfolio, Promoter]:
+    portfolio = Portfolio(name="Cartera Nueva")
+    user = User(
+        name="Nuevo Promotor",
+        email="nuevo.promotor@example.com",
+        password=get_password_hash("testpass"),
+        is_approved=True,
+    )
+    session.add_all([portfolio, user])
+    session.flush()
+    promoter = Promoter(nid="55555555556", name="Nuevo Promotor", user_id=user.id)
+    session.add(promoter)
+    session.flush()
+    return portfolio, promoter
+
+
+def test_bulk_assign_by_filter_runs_one_update(
+    client: TestClient, session: Session, auth_headers: dict, assert_max_queries
+):
+    portfolio, promoter = _portfolio_and_promoter(session)
+    leaving = Portfolio(name="Cartera Saliente")
+    session.add(leaving)
+    session.flush()
+    moved = [Customer(nid=f"0010000030{i}", portfolio_id=leaving.id) for i in range(3)]
+    kept = Customer(nid="00100000310")
+    session.add_all([*moved, kept])
+    session.commit()
+
+    with assert_max_queries(4) as statements:
+        response = client.post("/api/v1/customers/assign/bulk", headers=auth_headers, json={
+            "filters": {"portfolio_id": leaving.id},
+            "portfolio_id": portfolio.id,
+            "promoter_id": promoter.id,
+        })
+
+    assert response.status_code == 200
+    assert response.json() == {"updated_count": 3, "not_found_count": 0}
+    assert sum(statement.lstrip().upper().startswith("UPDATE") for statement in statements) == 1
+    for customer in [*moved, kept]:
+        session.refresh(customer)
+    assert {(c.portfolio_id, c.promoter_id, c.is_assigned) for c in moved} == {
+        (portfolio.id, promoter.id, True)
+    }
+    assert all(c.assigned_at is not None for c in moved)
+    assert (kept.portfolio_id, kept.is_assigned) == (None, False)
+
+
+def test_bulk_assign_by_ids_reports_missing(client: TestClient, session: Session, auth_headers: dict):
+    portfolio, _ = _portfolio_and_promoter(session)
+    customer = Customer(nid="00100000320")
+    session.add(customer)
+    session.commit()
+
+    response = client.post("/api/v1/customers/assign/bulk", headers=auth_headers, json={
+        "customer_ids": [customer.id, customer.id, 9999],
+        "portfolio_id": portfolio.id,
+    })
+
+    assert response.status_code == 200
+    assert response.json() == {"updated_count": 1, "not_found_count": 1}
+    session.refresh(customer)
+    assert (customer.portfolio_id, customer.promoter_id) == (portfolio.id, None)
+
+
+def test_bulk_assign_rejects_ambiguous_or_unknown_targets(client: TestClient, auth_headers: dict):
+    url = "/api/v1/customers/assign/bulk"
+    for body in (
+        {"customer_ids": [1], "filters": {"promoter_id": 1}, "portfolio_id": 1},
+        {"filters": {}, "portfolio_id": 1},
+        {"customer_ids": [1]},
+    ):
+        assert client.post(url, headers=auth_headers, json=body).status_code == 422
+
+    response = client.post(url, headers=auth_headers, json={"customer_ids": [1], "portfolio_id": 9999})
+    assert response.status_code == 404
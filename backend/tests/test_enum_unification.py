@@ -12,6 +12,7 @@ import pytest
 from unittest.mock import MagicMock, patch
 from pydantic import ValidationError
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.schemas.customer import CustomerDetailCreate, CustomerJobInfoCreate
 from app.services.loan_submission_service import LoanSubmissionService
@@ -313,7 +314,9 @@ class TestSubmitLoanEnumIntegration:
 class TestCreditGraphPayload:
     """CreditGraph service must include housing_possession_type in the payload."""
 
-    def test_housing_possession_type_in_applicant_data(self, session: Session, test_loan):
+    async def test_housing_possession_type_in_applicant_data(
+        self, session: Session, async_session: AsyncSession, test_loan
+    ):
         """trigger_analysis must include housing_possession_type in applicant_data."""
         # Set housing_possession_type on the customer detail
         from app.models.customer import CustomerDetail
@@ -341,7 +344,7 @@ class TestCreditGraphPayload:
             MockClient.return_value.analyze_loan_application.side_effect = mock_analyze
             from app.services import creditgraph_service
             try:
-                creditgraph_service.trigger_analysis(session, test_loan.id)
+                await creditgraph_service.trigger_analysis(async_session, test_loan.id)
             except Exception:
                 pass  # We only care about the payload captured
 
@@ -4,15 +4,26 @@ API integration tests for loan application endpoints.
 Tests all CRUD operations, status workflow, credit risk association,
 notes, validation, and error handling.
 """
+from datetime import datetime, timedelta
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session
-
-from app.models.customer import Customer, CustomerDetail
-from app.models.loan_application import LoanApplication, LoanApplicationDetail, LoanStatus
+from sqlmodel import Session, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.customer import Company, Customer, CustomerDetail, CustomerJobInfo
+from app.models.loan_application import (
+    LoanApplication,
+    LoanApplicationDetail,
+    LoanApplicationNote,
+    LoanStatus,
+)
 from app.models.credit_risk import CreditRisk, CreditRiskCategory
 from app.models.user import User
 from app.core.security import get_password_hash
+from app.schemas.loan_application import LoanApplicationBulkStatusUpdate
+from app.services.loan_application_service import bulk_transition_loan_status
+from app.services.loan_list_view import rebuild_loan_list_view
 from tests.factories.loan_application_factory import (
     LoanApplicationFactory,
     LoanApplicationDetailFactory,
@@ -138,6 +149,89 @@ def test_list_loan_applications_pagination(
     assert data["total"] >= 1
 
 
+def test_list_loan_applications_cursor_pagination(
+    client: TestClient, session: Session, auth_headers: dict, test_customer
+):
+    """Walking next_cursor returns every loan once, newest first."""
+    for _ in range(5):
+        session.add(LoanApplication(customer_id=test_customer.id, status="received"))
+    session.commit()
+    rebuild_loan_list_view(session)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"per_page": 2, "include_total": "false"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/loan-applications/", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] is None
+        assert data["pages"] is None
+        seen.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 5
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_list_loan_applications_invalid_cursor(client: TestClient, auth_headers: dict):
+    response = client.get(
+        "/api/v1/loan-applications/?cursor=not-a-cursor", headers=auth_headers
+    )
+
+    assert response.status_code == 400
+
+
+def test_list_loan_applications_is_one_query_per_page(
+    client: TestClient, session: Session, auth_headers: dict, assert_max_queries
+):
+    """A full page costs the count plus one statement, however many loans it holds."""
+    advisor = session.exec(select(User)).first()
+    started_at = datetime(2026, 1, 1)
+    for i in range(5):
+        customer = Customer(nid=f"0010000040{i}")
+        session.add(customer)
+        session.flush()
+        session.add_all([
+            CustomerDetail(customer_id=customer.id, first_name="Cliente", last_name=f"Número {i}"),
+            Company(customer_id=customer.id, name=f"Empresa {i}"),
+            CustomerJobInfo(customer_id=customer.id, payment_bank="Banreservas"),
+        ])
+        loan = LoanApplication(customer_id=customer.id, user_id=advisor.id)
+        session.add(loan)
+        session.flush()
+        session.add_all([
+            LoanApplicationDetail(loan_application_id=loan.id, amount=1000.0 * (i + 1), term=12),
+            LoanApplicationNote(loan_application_id=loan.id, note=f"última {i}",
+                                created_at=started_at + timedelta(days=2)),
+            LoanApplicationNote(loan_application_id=loan.id, note="primera",
+                                created_at=started_at),
+        ])
+    session.add(LoanApplication(status="received"))  # no customer, detail or notes
+    session.commit()
+    rebuild_loan_list_view(session)
+    client.get("/api/v1/auth/me", headers=auth_headers)  # warm the user cache
+
+    with assert_max_queries(2):
+        response = client.get("/api/v1/loan-applications/?per_page=10", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 6
+    bare, newest = data["items"][0], data["items"][1]
+    assert (bare["customer_name"], bare["amount"], bare["latest_note"]) == (None, None, None)
+    assert newest["customer_name"] == "Cliente Número 4"
+    assert newest["customer_nid"] == "00100000404"
+    assert (newest["company_name"], newest["bank_name"]) == ("Empresa 4", "Banreservas")
+    assert newest["advisor_name"] == advisor.name
+    assert (newest["amount"], newest["term"]) == (5000.0, 12)
+    assert newest["latest_note"] == "última 4"
+
+
 def test_list_loan_applications_filter_by_status(
     client: TestClient, session: Session, auth_headers: dict, test_loan: LoanApplication
 ):
@@ -345,6 +439,96 @@ def test_status_transition_archived_is_terminal(
     assert "terminal state" in response.json()["detail"]
 
 
+def test_bulk_status_transition_reports_each_loan(
+    client: TestClient, session: Session, auth_headers: dict, test_customer: Customer
+):
+    """Valid transitions are applied together; invalid and unknown loans are reported."""
+    stale, fresh, done = (
+        LoanApplication(customer_id=test_customer.id, status=loan_status)
+        for loan_status in ("received", "received", "archived")
+    )
+    session.add_all([stale, fresh, done])
+    session.commit()
+    rebuild_loan_list_view(session)
+
+    response = client.post("/api/v1/loan-applications/status/bulk", headers=auth_headers, json={
+        "transitions": [
+            {"loan_id": stale.id, "status": "archived", "note": "Sin respuesta en 90 días"},
+            {"loan_id": fresh.id, "status": "verified"},
+            {"loan_id": done.id, "status": "verified"},
+            {"loan_id": 99999, "status": "archived"},
+        ]
+    })
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["updated_count"] == 2
+    results = data["results"]
+    assert [r["result"] for r in results] == [
+        "updated", "updated", "invalid_transition", "not_found"]
+    assert (results[0]["previous_status"], results[0]["status"]) == ("received", "archived")
+    assert "terminal state" in results[2]["detail"]
+
+    archived = client.get(f"/api/v1/loan-applications/{stale.id}", headers=auth_headers).json()
+    assert (archived["status"], archived["is_archived"], archived["is_new"]) == ("archived", True, False)
+    assert archived["archived_at"] is not None
+    assert [n["note"] for n in archived["notes"]] == ["Sin respuesta en 90 días"]
+    verified = client.get(f"/api/v1/loan-applications/{fresh.id}", headers=auth_headers).json()
+    assert (verified["status"], verified["notes"]) == ("verified", [])
+
+    listed = client.get(
+        "/api/v1/loan-applications/", params={"status": "archived"}, headers=auth_headers
+    ).json()
+    assert [item["id"] for item in listed["items"]] == [done.id, stale.id]
+
+
+def test_bulk_status_transition_rejects_repeated_loans(
+    client: TestClient, auth_headers: dict, test_loan: LoanApplication
+):
+    response = client.post("/api/v1/loan-applications/status/bulk", headers=auth_headers, json={
+        "transitions": [
+            {"loan_id": test_loan.id, "status": "verified"},
+            {"loan_id": test_loan.id, "status": "archived"},
+        ]
+    })
+
+    assert response.status_code == 422
+
+
+async def test_bulk_status_transition_keeps_concurrent_changes(
+    async_session: AsyncSession, test_loan: LoanApplication
+):
+    """A loan moved after it was read is reported, even if its new status could reach the target."""
+    original_exec = async_session.exec
+    calls = 0
+
+    async def exec_after_concurrent_change(statement, *args, **kwargs):
+        nonlocal calls
+        result = await original_exec(statement, *args, **kwargs)
+        calls += 1
+        if calls == 1:  # another request verifies the loan right after the read
+            await original_exec(
+                update(LoanApplication)
+                .where(LoanApplication.id == test_loan.id)
+                .values(status=LoanStatus.VERIFIED.value)
+            )
+        return result
+
+    async_session.exec = exec_after_concurrent_change
+    response = await bulk_transition_loan_status(
+        async_session,
+        LoanApplicationBulkStatusUpdate(
+            transitions=[{"loan_id": test_loan.id, "status": "archived"}]),
+    )
+
+    assert response.updated_count == 0
+    result = response.results[0]
+    assert (result.result, result.previous_status) == ("invalid_transition", "received")
+    assert "another request" in result.detail
+    loan = await async_session.get(LoanApplication, test_loan.id)
+    assert loan.status == LoanStatus.VERIFIED.value
+
+
 # ============================================================================
 # Step 3.3: Credit Risk Association Tests
 # ============================================================================
@@ -0,0 +1,85 @@
+"""Tests for the Alembic migration chain."""
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect
+from sqlmodel import SQLModel
+
+from app.core.database import ALEMBIC_INI, BASELINE_REVISION, run_migrations
+
+
+def _fresh_engine():
+    return create_engine("sqlite://")
+
+
+def test_migrations_match_models():
+    engine = _fresh_engine()
+    with engine.connect() as connection:
+        run_migrations(connection)
+
+        context = MigrationContext.configure(connection)
+        diff = compare_metadata(context, SQLModel.metadata)
+
+    assert diff == []
+
+
+def test_hot_path_indexes_exist():
+    engine = _fresh_engine()
+    with engine.connect() as connection:
+        run_migrations(connection)
+        inspector = inspect(connection)
+        indexes = {
+            table: {index["name"]: index["column_names"] for index in inspector.get_indexes(table)}
+            for table in (
+                "phones",
+                "addressables",
+                "loan_application_details",
+                "loan_application_notes",
+            )
+        }
+
+    assert indexes["phones"]["ix_phones_phoneable"] == ["phoneable_type", "phoneable_id"]
+    assert indexes["addressables"]["ix_addressables_addressable"] == [
+        "addressable_type",
+        "addressable_id",
+    ]
+    assert "ix_loan_application_details_loan_application_id" in indexes["loan_application_details"]
+    assert indexes["loan_application_notes"][
+        "ix_loan_application_notes_loan_application_id_created_at"
+    ] == ["loan_application_id", "created_at"]
+
+
+def test_legacy_database_is_stamped_at_baseline():
+    """A pre-migrations database (no alembic_version) only gets the newer revisions."""
+    engine = _fresh_engine()
+    with engine.connect() as connection:
+        config = Config(str(ALEMBIC_INI))
+        config.attributes["connection"] = connection
+        config.attributes["configure_logger"] = False
+        command.upgrade(config, BASELINE_REVISION)
+        connection.exec_driver_sql("DROP TABLE alembic_version")
+
+        run_migrations(connection)
+
+        version = connection.exec_driver_sql("SELECT version_num FROM alembic_version").scalar()
+        phone_indexes = [index["name"] for index in inspect(connection).get_indexes("phones")]
+
+    assert version == ScriptDirectory.from_config(Config(str(ALEMBIC_INI))).get_current_head()
+    assert "ix_phones_phoneable" in phone_indexes
+
+
+def test_migrations_are_committed_revision_by_revision(tmp_path):
+    """The upgrade commits on its own connection; other workers then find head and do nothing."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'lamas.db'}")
+    with engine.connect() as connection:
+        run_migrations(connection)
+        assert not connection.in_transaction()
+
+    head = ScriptDirectory.from_config(Config(str(ALEMBIC_INI))).get_current_head()
+    with engine.connect() as connection:
+        run_migrations(connection)
+        version = connection.exec_driver_sql("SELECT version_num FROM alembic_version").scalar()
+
+    assert version == head
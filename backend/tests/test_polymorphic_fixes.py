@@ -8,6 +8,7 @@ Tests the fixes for known limitations:
 import pytest
 from fastapi import HTTPException
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.customer import Customer, CustomerDetail
 from app.models.phone import Phone
@@ -27,7 +28,7 @@ from app.services.customer_service import (
 
 
 @pytest.mark.asyncio
-async def test_create_customer_with_phones_polymorphic(session: Session):
+async def test_create_customer_with_phones_polymorphic(session: Session, async_session: AsyncSession):
     """Test that phones are created with proper polymorphic fields."""
     customer_data = CustomerCreateSchema(
         NID="11111111111",
@@ -53,7 +54,7 @@ async def test_create_customer_with_phones_polymorphic(session: Session):
         ]
     )
 
-    customer = await create_customer_with_nested_data(session, customer_data)
+    customer = await create_customer_with_nested_data(async_session, customer_data)
 
     # Verify phones were created with polymorphic fields
     phones = session.query(Phone).filter(
@@ -68,7 +69,7 @@ async def test_create_customer_with_phones_polymorphic(session: Session):
 
 
 @pytest.mark.asyncio
-async def test_create_customer_with_addresses_polymorphic(session: Session):
+async def test_create_customer_with_addresses_polymorphic(session: Session, async_session: AsyncSession):
     """Test that addresses are created with proper polymorphic pivot table."""
     customer_data = CustomerCreateSchema(
         NID="22222222222",
@@ -101,7 +102,7 @@ async def test_create_customer_with_addresses_polymorphic(session: Session):
         ]
     )
 
-    customer = await create_customer_with_nested_data(session, customer_data)
+    customer = await create_customer_with_nested_data(async_session, customer_data)
 
     # Verify addressable pivot records were created
     addressables = session.query(Addressable).filter(
@@ -124,7 +125,7 @@ async def test_create_customer_with_addresses_polymorphic(session: Session):
 
 
 @pytest.mark.asyncio
-async def test_assign_customer_invalid_portfolio(session: Session):
+async def test_assign_customer_invalid_portfolio(session: Session, async_session: AsyncSession):
     """Test that assigning to non-existent portfolio raises 404."""
     # Create test customer
     customer = Customer(nid="33333333333", is_active=True, is_assigned=False)
@@ -142,14 +143,14 @@ async def test_assign_customer_invalid_portfolio(session: Session):
 
     # Attempt to assign to non-existent portfolio
     with pytest.raises(HTTPException) as exc_info:
-        await assign_customer_to_portfolio(session, customer.id, portfolio_id=99999)
+        await assign_customer_to_portfolio(async_session, customer.id, portfolio_id=99999)
 
     assert exc_info.value.status_code == 404
     assert "Portfolio with ID 99999 not found" in str(exc_info.value.detail)
 
 
 @pytest.mark.asyncio
-async def test_assign_customer_invalid_promoter(session: Session):
+async def test_assign_customer_invalid_promoter(session: Session, async_session: AsyncSession):
     """Test that assigning to non-existent promoter raises 404."""
     # Create test customer
     customer = Customer(nid="44444444444", is_active=True, is_assigned=False)
@@ -167,14 +168,14 @@ async def test_assign_customer_invalid_promoter(session: Session):
 
     # Attempt to assign to non-existent promoter
     with pytest.raises(HTTPException) as exc_info:
-        await assign_customer_to_portfolio(session, customer.id, promoter_id=99999)
+        await assign_customer_to_portfolio(async_session, customer.id, promoter_id=99999)
 
     assert exc_info.value.status_code == 404
     assert "Promoter with ID 99999 not found" in str(exc_info.value.detail)
 
 
 @pytest.mark.asyncio
-async def test_assign_customer_valid_portfolio_and_promoter(session: Session):
+async def test_assign_customer_valid_portfolio_and_promoter(session: Session, async_session: AsyncSession):
     """Test successful assignment with valid portfolio and promoter."""
     # Create user for portfolio/promoter
     user = User(
@@ -215,7 +216,7 @@ async def test_assign_customer_valid_portfolio_and_promoter(session: Session):
 
     # Assign customer
     updated_customer = await assign_customer_to_portfolio(
-        session,
+        async_session,
         customer.id,
         portfolio_id=portfolio.id,
         promoter_id=promoter.id
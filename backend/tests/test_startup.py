@@ -0,0 +1,88 @@
+"""Tests for worker startup: lazy imports, optional migrations and pool warm-up."""
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core import database
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def test_importing_app_does_not_load_cloud_or_migration_sdks():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, app.main; print(sorted({'boto3', 'botocore', 'alembic'} & set(sys.modules)))",
+        ],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+async def test_warm_up_pool_opens_connections(monkeypatch, tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'warmup.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=3,
+    )
+    monkeypatch.setattr(database, "async_engine", engine)
+
+    await database.warm_up_pool(10)
+
+    assert engine.pool.checkedin() == 3
+    assert engine.pool.checkedout() == 0
+    await engine.dispose()
+
+
+async def test_startup_skips_migrations_when_disabled(monkeypatch):
+    from app import main
+
+    calls = []
+
+    async def fake_init_db():
+        calls.append("init_db")
+
+    async def fake_warm_up_pool(connections):
+        calls.append("warm_up_pool")
+
+    monkeypatch.setattr(main, "init_db", fake_init_db)
+    monkeypatch.setattr(main, "warm_up_pool", fake_warm_up_pool)
+    monkeypatch.setattr(main.settings, "DB_MIGRATE_ON_STARTUP", False)
+
+    async with main.lifespan(main.app):
+        pass
+
+    assert calls == ["warm_up_pool"]
+
+
+async def test_startup_leaves_nid_index_to_first_request(monkeypatch):
+    from app import main
+
+    loads = []
+
+    async def fake_load(session):
+        loads.append(session)
+
+    async def fake_warm_up_pool(connections):
+        pass
+
+    monkeypatch.setattr(main, "warm_up_pool", fake_warm_up_pool)
+    monkeypatch.setattr(main.settings, "DB_MIGRATE_ON_STARTUP", False)
+    monkeypatch.setattr(main.nid_index, "load", fake_load)
+
+    async with main.lifespan(main.app):
+        pass
+    assert loads == []
+
+    monkeypatch.setattr(main.settings, "NID_INDEX_WARMUP_ON_STARTUP", True)
+    async with main.lifespan(main.app):
+        pass
+    assert len(loads) == 1
@@ -0,0 +1,35 @@
+"""Tests for the Python trigram/unaccent functions used by SQLite name search."""
+import pytest
+
+from app.utils.text_search import search_key, similarity, soundex, trigrams
+
+
+def test_search_key_strips_accents_and_case():
+    assert search_key("Ramírez Núñez") == "ramirez nunez"
+    assert search_key(None) is None
+
+
+def test_trigrams_match_pg_trgm():
+    # SELECT show_trgm('cat') -> {"  c"," ca","at ",cat}
+    assert trigrams("Cat") == {"  c", " ca", "cat", "at "}
+
+
+@pytest.mark.parametrize(
+    ("left", "right", "expected"),
+    [
+        ("word", "word", 1.0),
+        # SELECT similarity('word', 'two words') -> 0.363636
+        ("word", "two words", 4 / 11),
+        ("abc", "xyz", 0.0),
+    ],
+)
+def test_similarity_matches_pg_trgm(left, right, expected):
+    assert similarity(left, right) == pytest.approx(expected)
+
+
+def test_soundex_groups_spelling_variants():
+    assert soundex("Rodríguez") == soundex("Rodrigues") == "R362"
+    assert soundex("Ashcraft") == "A261"
+    assert soundex("Pfister") == "P236"
+    assert soundex("  ") is None
+    assert soundex(None) is None
@@ -0,0 +1,34 @@
+"""Tests for Dominican data validators."""
+import random
+import re
+
+from app.utils.validators import validate_dominican_nid, validate_dominican_nids
+
+
+def _reference_nid_check(nid: str) -> bool:
+    """The digit-by-digit JCE Modulo 10 algorithm, for comparison."""
+    cleaned = re.sub(r"\D", "", nid)
+    if len(cleaned) != 11 or re.match(r"^(\d)\1{10}$", cleaned):
+        return False
+    total = 0
+    for i, multiplier in enumerate([1, 2] * 5):
+        product = int(cleaned[i]) * multiplier
+        total += product // 10 + product % 10
+    return (10 - total % 10) % 10 == int(cleaned[10])
+
+
+def test_nid_checksum_matches_reference_algorithm():
+    rng = random.Random(172)
+    nids = [f"{rng.randrange(10**11):011d}" for _ in range(5000)]
+    nids += ["001-0000002-5", "00000000000", "123", "1234567890123"]
+
+    expected = [_reference_nid_check(nid) for nid in nids]
+
+    assert [validate_dominican_nid(nid) for nid in nids] == expected
+    assert [v is not None for v in validate_dominican_nids(nids)] == expected
+
+
+def test_batch_returns_cleaned_nids_in_order():
+    assert validate_dominican_nids(["001-0000002-5", "", None, "00100000022", "00100000025"]) == [
+        "00100000025", None, None, None, "00100000025"
+    ]